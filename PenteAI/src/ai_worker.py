@@ -0,0 +1,182 @@
+import multiprocessing
+import queue
+from types import SimpleNamespace
+
+from mcts_ai import MCTSAI
+from parallel_search import plain_config
+from pente_ai import PenteAI
+from performance_tracker import PerformanceTracker
+from ponder import Ponderer
+from profiling import SearchProfiler
+
+
+# Engines selectable through Config.AI_ENGINE and the menu.
+ENGINES = {"alphabeta": PenteAI, "mcts": MCTSAI}
+
+
+class AIWorker:
+    """
+    Runs a PenteAI (and its Ponderer) in a separate process so the pygame loop
+    never blocks on a search.
+
+    Requests go through one queue and results come back on another, each
+    tagged with a request id. request_move() returns at once; poll() returns
+    the finished result, if any, without waiting. cancel() stops the search in
+    progress through a shared value holding the id of the cancelled request,
+    and results of cancelled or superseded requests are dropped.
+    """
+
+    # Seconds close() waits for the worker to exit before terminating it.
+    SHUTDOWN_TIMEOUT = 2.0
+
+    def __init__(self, config, ai_color, depth, engine=None):
+        engine = engine or config.AI_ENGINE
+        if engine not in ENGINES:
+            raise ValueError(f"Unknown engine: {engine}")
+        context = multiprocessing.get_context("spawn")
+        self._requests = context.Queue()
+        self._responses = context.Queue()
+        self._cancelled = context.Value("q", 0)
+        self._next_id = 0
+        self.pending = None
+        settings = {"config": plain_config(config), "color": ai_color, "depth": depth, "engine": engine}
+        self._process = context.Process(
+            target=_worker_main,
+            args=(settings, self._requests, self._responses, self._cancelled),
+            name="pente-ai-worker",
+        )
+        self._process.start()
+
+    @property
+    def thinking(self):
+        return self.pending is not None
+
+    def request_move(self, game, time_limit_ms=None):
+        """Asks for a move on the game's current position; returns the request id."""
+        self.cancel()
+        self._next_id += 1
+        self.pending = self._next_id
+        self._requests.put(("move", self.pending, _position(game), time_limit_ms))
+        return self.pending
+
+    def ponder(self, game, time_limit_ms=None):
+        """Starts pondering on a position where the human is to move."""
+        self._requests.put(("ponder", None, _position(game), time_limit_ms))
+
+    def stop_pondering(self):
+        self._requests.put(("stop_ponder", None, None, None))
+
+    def cancel(self):
+        """Abandons the pending move request and any pondering."""
+        if self.pending is not None:
+            self._cancelled.value = self.pending
+            self.pending = None
+        self.stop_pondering()
+
+    def poll(self):
+        """Result dict of the pending request if it has finished, else None."""
+        while True:
+            try:
+                response = self._responses.get_nowait()
+            except queue.Empty:
+                return None
+            if response["id"] == self.pending and not response["cancelled"]:
+                self.pending = None
+                return response
+
+    def close(self):
+        self.cancel()
+        self._requests.put(None)
+        self._process.join(self.SHUTDOWN_TIMEOUT)
+        if self._process.is_alive():
+            self._process.terminate()
+            self._process.join()
+
+
+class _CancelFlag:
+    """PenteAI.stop_flag that is set once the given request has been cancelled."""
+
+    def __init__(self, cancelled, request_id):
+        self.cancelled = cancelled
+        self.request_id = request_id
+
+    @property
+    def value(self):
+        return self.cancelled.value == self.request_id
+
+
+def _position(game):
+    return [row[:] for row in game.board], dict(game.captures), game.turn
+
+
+def _worker_main(settings, requests, responses, cancelled):
+    config = SimpleNamespace(**settings["config"])
+    ai = ENGINES[settings["engine"]](config, settings["color"], depth=settings["depth"])
+    # Pondering needs a stoppable in-process search.
+    ponderer = None
+    if config.AI_PONDER and ai.workers == 1:
+        ponderer = Ponderer(ai, telemetry=config.AI_TELEMETRY)
+    profiler = SearchProfiler(config.AI_PROFILE_DIR) if config.AI_PROFILE_DIR else None
+
+    try:
+        while True:
+            request = requests.get()
+            if request is None:
+                break
+            kind, request_id, position, time_limit_ms = request
+            if kind == "stop_ponder":
+                if ponderer is not None:
+                    ponderer.stop()
+                continue
+            board, captures, turn = position
+            game = SimpleNamespace(board=board, captures=captures, turn=turn)
+            if kind == "ponder":
+                if ponderer is not None:
+                    ponderer.time_limit_ms = time_limit_ms
+                    ponderer.start(game)
+                continue
+            responses.put(_search(
+                ai, ponderer, game, request_id, time_limit_ms, cancelled,
+                config.AI_TELEMETRY, config.AI_TRACE_MEMORY, profiler,
+            ))
+    finally:
+        if ponderer is not None:
+            ponderer.stop()
+        ai.close()
+
+
+def _search(ai, ponderer, game, request_id, time_limit_ms, cancelled, telemetry=False, trace_memory=False,
+            profiler=None):
+    tracker = PerformanceTracker(telemetry=telemetry, trace_memory=trace_memory)
+    tracker.start_timer()
+    pondered = ponderer.take(game) if ponderer is not None else None
+    if pondered is not None:
+        move, search_tracker = pondered
+    else:
+        search_tracker = tracker
+        ai.stop_flag = _CancelFlag(cancelled, request_id)
+        try:
+            if profiler is not None:
+                move = profiler.run(None, ai.get_best_move, game, tracker, time_limit_ms=time_limit_ms)
+            else:
+                move = ai.get_best_move(game, tracker, time_limit_ms=time_limit_ms)
+        finally:
+            ai.stop_flag = None
+    time_taken, _, memory = tracker.stop_timer()
+    if trace_memory:
+        search_tracker.record_cache_sizes(ai.cache_sizes())
+    return {
+        "id": request_id,
+        "move": move,
+        "cancelled": cancelled.value == request_id,
+        "time_ms": time_taken,
+        "nodes": search_tracker.nodes_explored,
+        "memory_mb": memory,
+        "depth_reached": search_tracker.depth_reached,
+        "first_cut_pct": search_tracker.first_move_cutoff_pct,
+        "tt_stats": search_tracker.tt_stats,
+        "ponder_hit": pondered is not None,
+        "ponder_hit_rate": ponderer.hit_rate if ponderer is not None else 0.0,
+        "ponder_saved_ms": ponderer.saved_ms if ponderer is not None else 0.0,
+        "telemetry": search_tracker.to_record(),
+    }
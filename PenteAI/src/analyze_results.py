@@ -1,26 +1,41 @@
+import json
+import os
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
-import os
 
 
-plt.switch_backend('Agg')
+# Written by `python benchmark_suite.py run`.
+RESULTS_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks", "results.json")
 
-data = {
-    'Depth': [1, 2, 3, 4],
 
-    'Minimax_Time_ms': [15, 850, 48000, 2500000], 
-    'Minimax_Nodes':   [360, 129000, 46000000, 16000000000],
-    
-    'Minimax_Memory_MB': [2, 4, 15, 50], 
-    
-    
-    'AlphaBeta_Time_ms': [10, 120, 2100, 45000],  
-    'AlphaBeta_Nodes':   [360, 9000, 250000, 6000000],
-    'AlphaBeta_Memory_MB': [2, 4, 15, 50],       
-}
+def load_results(path=RESULTS_PATH):
+    """
+    Per-depth averages over the corpus positions of a benchmark_suite.py
+    results file. Plain minimax is not run: its columns are estimated from the
+    measured root branching b as b + b^2 + ... + b^d nodes, at alpha-beta's
+    measured time per node and the same (depth-first) memory.
+    Rows without root moves were answered before the alpha-beta search ran
+    (by the threat search) and are left out.
+    """
+    with open(path) as f:
+        results = json.load(f)
+    rows = pd.DataFrame(results["results"])
+    rows = rows[rows['root_moves'] > 0]
+    df = rows.groupby('depth').agg(
+        AlphaBeta_Time_ms=('time_ms', 'mean'),
+        AlphaBeta_Nodes=('nodes', 'mean'),
+        AlphaBeta_Memory_MB=('memory_mb', 'mean'),
+    ).reset_index().rename(columns={'depth': 'Depth'})
 
-df = pd.DataFrame(data)
+    branching = rows['root_moves'].mean()
+    df['Branching'] = branching
+    df['Minimax_Nodes'] = [sum(branching ** k for k in range(1, d + 1)) for d in df['Depth']]
+    df['Minimax_Time_ms'] = df['Minimax_Nodes'] * df['AlphaBeta_Time_ms'] / df['AlphaBeta_Nodes']
+    df['Minimax_Memory_MB'] = df['AlphaBeta_Memory_MB']
+    return df
 
 
 def generate_comparison_table(df):
@@ -53,7 +68,7 @@ def generate_comparison_table(df):
         caption="Alpha-Beta Pruning Performance Metrics vs. Search Depth", 
         label="tab:alpha_beta_scalability",
         column_format="cccc",
-        float_format={"Avg Time (ms)": "%.2f", "Memory (MB)": "%.2f", "Nodes Explored": node_formatter}
+        formatters={"Avg Time (ms)": "{:.2f}".format, "Memory (MB)": "{:.2f}".format, "Nodes Explored": node_formatter}
     )
     print(latex_output_ab)
     
@@ -63,7 +78,7 @@ def generate_comparison_table(df):
         caption="Comparative Performance of Minimax vs. Alpha-Beta Pruning", 
         label="tab:minimax_comparison",
         column_format="cclll",
-        float_format={"Avg Time (ms)": "%.2f", "Memory (MB)": "%.2f", "Nodes Explored": node_formatter}
+        formatters={"Avg Time (ms)": "{:.2f}".format, "Memory (MB)": "{:.2f}".format, "Nodes Explored": node_formatter}
     )
     print(full_latex_output)
 
@@ -97,7 +112,7 @@ def plot_results(df):
     axes[1].legend()
     
     
-    b_star = 25 
+    b_star = df['Branching'][0]
     theoretical_y = [b_star**(d/2) for d in df['Depth']]
     
     
@@ -105,7 +120,7 @@ def plot_results(df):
     theoretical_y = [y * scale_factor for y in theoretical_y]
 
     axes[2].plot(df['Depth'], df['AlphaBeta_Nodes'], marker='s', label='Empirical (Actual Nodes)', color='blue')
-    axes[2].plot(df['Depth'], theoretical_y, linestyle=':', label=f'Theoretical $O(b^{{d/2}})$ where $b={b_star}$', color='black')
+    axes[2].plot(df['Depth'], theoretical_y, linestyle=':', label=f'Theoretical $O(b^{{d/2}})$ where $b={b_star:.0f}$', color='black')
     axes[2].set_title('Alpha-Beta: Empirical vs Theoretical Complexity')
     axes[2].set_yscale('log')
     axes[2].set_xlabel('Depth')
@@ -118,5 +133,8 @@ def plot_results(df):
     plt.savefig('performance_comparison_plots.png')
 
 if __name__ == '__main__':
+    # Run as a script the plots only go to a file; importers such as generate-graphs.py keep their backend.
+    plt.switch_backend('Agg')
+    df = load_results(sys.argv[1] if len(sys.argv) > 1 else RESULTS_PATH)
     generate_comparison_table(df)
     plot_results(df)
\ No newline at end of file
@@ -0,0 +1,133 @@
+import numpy as np
+
+
+class BatchSimulator:
+    """
+    N Pente games stepped together with NumPy.
+
+    The boards live in one (N, rows + 2*PAD, cols + 2*PAD) int8 array whose
+    border is always empty, so every capture and five-in-a-row probe around a
+    move is a plain fancy-index with no bounds checks. step() plays one move
+    in every unfinished game; captures are removed and wins detected for all
+    of them at once, with the same rules as PenteGame.check_captures and
+    PenteGame.check_win. As in PenteGame, the turn does not pass after a
+    winning move.
+    """
+
+    # Captures reach three cells from the move and fives four.
+    PAD = 4
+    RAYS = [(0, 1), (0, -1), (1, 0), (-1, 0), (1, 1), (-1, -1), (1, -1), (-1, 1)]
+    DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+    def __init__(self, config, n):
+        self.n = n
+        self.rows = config.ROWS
+        self.cols = config.COLS
+        self.win_capture_count = config.WIN_CAPTURE_COUNT
+        self.reset()
+
+    def reset(self):
+        pad = self.PAD
+        self.padded = np.zeros((self.n, self.rows + 2 * pad, self.cols + 2 * pad), dtype=np.int8)
+        # View of the playable cells, shaped (N, rows, cols).
+        self.boards = self.padded[:, pad:pad + self.rows, pad:pad + self.cols]
+        # captures[:, color - 1] is the number of stones captured by that colour.
+        self.captures = np.zeros((self.n, 2), dtype=np.int16)
+        self.turn = np.ones(self.n, dtype=np.int8)
+        self.game_over = np.zeros(self.n, dtype=bool)
+        # 0 while the game is running, else the winning colour.
+        self.winner = np.zeros(self.n, dtype=np.int8)
+        self.moves_played = np.zeros(self.n, dtype=np.int32)
+
+    def step(self, rows, cols):
+        """
+        Plays (rows[i], cols[i]) in game i for every unfinished game. Returns a
+        bool array marking the games where a move was made; finished games and
+        moves onto occupied or off-board cells are left unchanged.
+        """
+        rows = np.asarray(rows)
+        cols = np.asarray(cols)
+        pad = self.PAD
+        padded = self.padded
+
+        legal = ~self.game_over & (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+        games = np.nonzero(legal)[0]
+        r = rows[games] + pad
+        c = cols[games] + pad
+        empty = padded[games, r, c] == 0
+        games, r, c = games[empty], r[empty], c[empty]
+        legal[:] = False
+        legal[games] = True
+        if games.size == 0:
+            return legal
+
+        me = self.turn[games]
+        opp = 3 - me
+        padded[games, r, c] = me
+
+        captured = np.zeros(games.size, dtype=np.int16)
+        for dr, dc in self.RAYS:
+            r1, c1 = r + dr, c + dc
+            r2, c2 = r + 2 * dr, c + 2 * dc
+            hit = (
+                (padded[games, r1, c1] == opp)
+                & (padded[games, r2, c2] == opp)
+                & (padded[games, r + 3 * dr, c + 3 * dc] == me)
+            )
+            if hit.any():
+                g = games[hit]
+                padded[g, r1[hit], c1[hit]] = 0
+                padded[g, r2[hit], c2[hit]] = 0
+                captured += 2 * hit
+        self.captures[games, me - 1] += captured
+
+        won = self.captures[games, me - 1] >= self.win_capture_count
+        for dr, dc in self.DIRECTIONS:
+            count = np.ones(games.size, dtype=np.int8)
+            for sign in (1, -1):
+                run = np.ones(games.size, dtype=bool)
+                for i in range(1, 5):
+                    run &= padded[games, r + sign * i * dr, c + sign * i * dc] == me
+                    count += run
+            won |= count >= 5
+
+        self.moves_played[games] += 1
+        winners = games[won]
+        self.game_over[winners] = True
+        self.winner[winners] = me[won]
+        self.turn[games[~won]] = opp[~won]
+        return legal
+
+    def random_moves(self, rng, radius=1, games=None):
+        """
+        A uniformly random empty cell within radius of a stone for every game,
+        or for the given game indices (the centre on an empty board), as
+        (rows, cols) arrays.
+        """
+        pad = self.PAD
+        rows, cols = self.rows, self.cols
+        padded = self.padded if games is None else self.padded[games]
+        occupied = padded != 0
+        near = np.zeros((len(padded), rows, cols), dtype=bool)
+        for dr in range(-radius, radius + 1):
+            for dc in range(-radius, radius + 1):
+                near |= occupied[:, pad + dr:pad + dr + rows, pad + dc:pad + dc + cols]
+        near &= ~occupied[:, pad:pad + rows, pad:pad + cols]
+        empty_board = ~occupied.any(axis=(1, 2))
+        near[empty_board, rows // 2, cols // 2] = True
+
+        weights = rng.random(near.shape, dtype=np.float32) * near
+        flat = weights.reshape(len(padded), -1).argmax(axis=1)
+        return flat // cols, flat % cols
+
+    def play_random(self, rng, max_plies, radius=1):
+        """Plays random moves near the stones until every game is over or max_plies have been played."""
+        rows = np.full(self.n, -1, dtype=np.int64)
+        cols = np.full(self.n, -1, dtype=np.int64)
+        for _ in range(max_plies):
+            active = np.nonzero(~self.game_over)[0]
+            if active.size == 0:
+                break
+            rows[:] = -1
+            rows[active], cols[active] = self.random_moves(rng, radius, active)
+            self.step(rows, cols)
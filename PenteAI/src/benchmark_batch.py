@@ -0,0 +1,85 @@
+import argparse
+import time
+
+import numpy as np
+
+from batch_simulator import BatchSimulator
+from config import Config
+from pente_game import PenteGame
+
+
+def cross_check(config, games, max_plies, seed):
+    """
+    Plays random games in the simulator and replays every move in a PenteGame,
+    comparing boards, captures, turn and result after each ply. Returns the
+    number of mismatching games.
+    """
+    rng = np.random.default_rng(seed)
+    sim = BatchSimulator(config, games)
+    reference = [PenteGame(config) for _ in range(games)]
+    mismatches = set()
+    for ply in range(max_plies):
+        if sim.game_over.all():
+            break
+        # Radius 2 now and then, so the random games also reach long lines and capture wins.
+        rows, cols = sim.random_moves(rng, radius=1 if ply % 4 else 2)
+        legal = sim.step(rows, cols)
+        for i, game in enumerate(reference):
+            if i in mismatches:
+                continue
+            played = game.make_move(int(rows[i]), int(cols[i]))
+            same = (
+                played == bool(legal[i])
+                and np.array_equal(sim.boards[i], np.array(game.board, dtype=np.int8))
+                and sim.captures[i, 0] == game.captures[1]
+                and sim.captures[i, 1] == game.captures[2]
+                and sim.turn[i] == game.turn
+                and bool(sim.game_over[i]) == game.game_over
+                and sim.winner[i] == (game.winner or 0)
+            )
+            if not same:
+                print(f"Mismatch in game {i} at ply {ply}: move {(int(rows[i]), int(cols[i]))}")
+                mismatches.add(i)
+
+    finished = int(sim.game_over.sum())
+    capture_wins = int((sim.captures.max(axis=1) >= config.WIN_CAPTURE_COUNT).sum())
+    print(
+        f"Cross-check: {games} games, {finished} finished ({capture_wins} by captures),"
+        f" {int(sim.captures.sum())} stones captured, {len(mismatches)} mismatches"
+    )
+    return len(mismatches)
+
+
+def games_per_second(config, n, max_plies, seed):
+    rng = np.random.default_rng(seed)
+    sim = BatchSimulator(config, n)
+    start = time.perf_counter()
+    sim.play_random(rng, max_plies)
+    elapsed = time.perf_counter() - start
+    return elapsed, int(sim.game_over.sum()), int(sim.moves_played.sum())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cross-check and time the batched NumPy game simulator.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 10, 100, 1000, 10000])
+    parser.add_argument("--max-plies", type=int, default=200, help="Plies per game before it is abandoned")
+    parser.add_argument("--check-games", type=int, default=200, help="Games cross-checked against PenteGame (0 skips)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = Config()
+    config.sound_enabled = False
+
+    if args.check_games > 0 and cross_check(config, args.check_games, args.max_plies, args.seed):
+        raise SystemExit("BatchSimulator does not match PenteGame")
+
+    for n in args.sizes:
+        elapsed, finished, moves = games_per_second(config, n, args.max_plies, args.seed)
+        print(
+            f"N: {n} | Time: {elapsed * 1000:.1f} ms | Finished: {finished}/{n}"
+            f" | Games/s: {n / elapsed:,.0f} | Moves/s: {moves / elapsed:,.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
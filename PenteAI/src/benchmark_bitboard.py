@@ -0,0 +1,179 @@
+import argparse
+import random
+import time
+
+from benchmark_search import run_search
+from bitboard import BitBoard
+from board_clone import BoardClone
+from config import Config
+from pente_ai import PenteAI
+from pente_game import PenteGame
+from positions import POSITIONS, build_game
+from search_state import SearchState
+
+
+def random_game(config, rng, max_moves=120):
+    """A random legal move sequence played near the centre, so captures happen often."""
+    lo, hi = config.ROWS // 2 - 5, config.ROWS // 2 + 6
+    clone = BoardClone([[0] * config.COLS for _ in range(config.ROWS)], {1: 0, 2: 0}, 1, config)
+    moves = []
+    while len(moves) < max_moves and not clone.game_over:
+        r, c = rng.randrange(lo, hi), rng.randrange(lo, hi)
+        if clone.make_move(r, c):
+            moves.append((r, c))
+    return moves
+
+
+def check_rules_agreement(config, games, seed):
+    """
+    Replays random games on a BitBoard and a PenteGame and compares board,
+    captures, turn (while the game runs), game over and winner after every move, and then unmakes
+    every move and compares again on the way back. Candidate moves are checked
+    against a freshly built SearchState. Returns the number of mismatching games.
+    """
+    rng = random.Random(seed)
+    mismatches = 0
+    for i in range(games):
+        moves = random_game(config, rng)
+        empty = [[0] * config.COLS for _ in range(config.ROWS)]
+        game = PenteGame(config)
+        bits = BitBoard(empty, {1: 0, 2: 0}, 1, config, incremental_eval=False)
+        snapshots = []
+        for ply, (r, c) in enumerate(moves):
+            game.make_move(r, c)
+            bits.make_move(r, c)
+            snapshot = ([row[:] for row in game.board], dict(game.captures), game.turn, game.game_over, game.winner)
+            snapshots.append(snapshot)
+            same = _same_position(bits, snapshot)
+            if same:
+                reference = SearchState(bits.board, bits.captures, bits.turn, config, incremental_eval=False)
+                same = all(
+                    set(bits.candidate_moves(radius)) == set(reference.candidate_moves(radius))
+                    for radius in SearchState.CANDIDATE_RADII
+                )
+            if not same:
+                print(f"Rules mismatch in game {i} at ply {ply}: move {(r, c)}")
+                mismatches += 1
+                break
+        else:
+            for ply in range(len(snapshots) - 1, 0, -1):
+                bits.unmake_move()
+                if not _same_position(bits, snapshots[ply - 1]):
+                    print(f"Unmake mismatch in game {i} back to ply {ply - 1}")
+                    mismatches += 1
+                    break
+    return mismatches
+
+
+def _same_position(state, snapshot):
+    # PenteGame leaves the turn with the winner; search states pass it on regardless.
+    board, captures, turn, game_over, winner = snapshot
+    return (
+        state.board == board
+        and state.captures == captures
+        and (game_over or state.turn == turn)
+        and state.game_over == game_over
+        and (state.winner or None) == (winner or None)
+    )
+
+
+def check_candidate_agreement(config, games, seed):
+    """
+    Plays random games on a SearchState, stepping back a move now and then,
+    and compares PenteAI's candidate moves read from the incrementally kept
+    sets with the full-board scan of the clone path, for both radius rules.
+    Returns the number of mismatching positions.
+    """
+    rng = random.Random(seed)
+    # Depth 2 uses radius 1 from the fifth stone on; depth 4 always uses radius 2.
+    ais = [PenteAI(config, 1, depth=depth, tt_size_mb=0, use_book=False) for depth in (2, 4)]
+    mismatches = 0
+    for _ in range(games):
+        empty = [[0] * config.COLS for _ in range(config.ROWS)]
+        state = SearchState(empty, {1: 0, 2: 0}, 1, config, incremental_eval=False)
+        for r, c in random_game(config, rng):
+            state.make_move(r, c)
+            if state.history and rng.random() < 0.2:
+                state.unmake_move()
+            for ai in ais:
+                expected = set(ai._scan_relevant_moves(state))
+                if set(ai._get_relevant_moves(state)) != expected:
+                    print(f"Candidate mismatch at depth {ai.depth} after {len(state.history)} moves")
+                    mismatches += 1
+    return mismatches
+
+
+def time_make_unmake(config, state_cls, games, radius=None):
+    """Moves/s for make+unmake, optionally also generating candidates after every move."""
+    empty = [[0] * config.COLS for _ in range(config.ROWS)]
+    states = [state_cls(empty, {1: 0, 2: 0}, 1, config, incremental_eval=False) for _ in games]
+    count = 0
+    start = time.perf_counter()
+    for state, moves in zip(states, games):
+        for r, c in moves:
+            state.make_move(r, c)
+            if radius is not None:
+                state.candidate_moves(radius)
+            count += 1
+        while state.history:
+            state.unmake_move()
+    return count / (time.perf_counter() - start)
+
+
+def time_clone(config, games):
+    empty = [[0] * config.COLS for _ in range(config.ROWS)]
+    count = 0
+    start = time.perf_counter()
+    for moves in games:
+        state = BoardClone(empty, {1: 0, 2: 0}, 1, config)
+        for r, c in moves:
+            state = BoardClone(state.board, state.captures, state.turn, config)
+            state.make_move(r, c)
+            count += 1
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and benchmark the bitboard rules engine.")
+    parser.add_argument("--games", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depths", type=int, nargs="*", default=[2, 3])
+    args = parser.parse_args()
+
+    config = Config()
+    config.sound_enabled = False
+
+    if check_rules_agreement(config, min(args.games, 50), args.seed):
+        raise SystemExit("BitBoard does not match PenteGame")
+    print("[Rules Check] BitBoard matches PenteGame on captures, wins, make/unmake and candidates")
+    if check_candidate_agreement(config, args.games, args.seed):
+        raise SystemExit("SearchState candidate sets do not match the full-board scan")
+    print(f"[Candidate Check] Incremental candidate sets match the full-board scan in {args.games} games")
+
+    rng = random.Random(args.seed + 1)
+    games = [random_game(config, rng) for _ in range(args.games)]
+    clone_rate = time_clone(config, games)
+    print(f"[Throughput] BoardClone copy+move: {clone_rate:,.0f} moves/s")
+    for radius in (None, 1, 2):
+        label = "make+unmake" if radius is None else f"make+unmake+candidates(r={radius})"
+        list_rate = time_make_unmake(config, SearchState, games, radius)
+        bit_rate = time_make_unmake(config, BitBoard, games, radius)
+        print(
+            f"[Throughput] {label} | SearchState: {list_rate:,.0f} moves/s"
+            f" | BitBoard: {bit_rate:,.0f} moves/s | Ratio: {bit_rate / list_rate:.2f}x"
+        )
+
+    for name, moves in POSITIONS.items():
+        game = build_game(config, moves)
+        for depth in args.depths:
+            list_move, list_metrics, _ = run_search(config, game, depth, board_backend="list")
+            bit_move, bit_metrics, _ = run_search(config, game, depth, board_backend="bitboard")
+            print(
+                f"[{name}] Depth: {depth} | List: {list_metrics[0]:.2f} ms, {list_metrics[1]} nodes"
+                f" | BitBoard: {bit_metrics[0]:.2f} ms, {bit_metrics[1]} nodes"
+                f" | Same move: {list_move == bit_move}"
+            )
+
+
+if __name__ == "__main__":
+    main()
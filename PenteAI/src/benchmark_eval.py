@@ -0,0 +1,150 @@
+import argparse
+import random
+import time
+
+from config import Config
+import numpy as np
+
+from heuristics import PenteHeuristics
+from numpy_heuristics import NumpyHeuristics
+from pattern_tables import PatternTables
+from search_state import SearchState
+
+
+def random_positions(config, count, seed, max_moves=60):
+    """Yields SearchStates reached by random play near the centre (captures included)."""
+    rng = random.Random(seed)
+    lo, hi = config.ROWS // 2 - 6, config.ROWS // 2 + 7
+    for _ in range(count):
+        state = SearchState(
+            [[0] * config.COLS for _ in range(config.ROWS)], {1: 0, 2: 0}, 1, config
+        )
+        for _ in range(rng.randint(1, max_moves)):
+            if state.game_over:
+                break
+            if state.history and rng.random() < 0.2:
+                state.unmake_move()
+            else:
+                state.make_move(rng.randrange(lo, hi), rng.randrange(lo, hi))
+        yield state
+
+
+def check_incremental_agreement(config, count=500, seed=0):
+    """
+    Compares the incremental evaluator with the full-scan evaluate on random
+    positions; returns the number of mismatching evaluations.
+    """
+    mismatches = 0
+    for i, state in enumerate(random_positions(config, count, seed)):
+        for color in (1, 2):
+            expected = PenteHeuristics.evaluate(state, color)
+            actual = state.evaluator.evaluate(state, color)
+            if actual != expected:
+                print(f"Position {i}: incremental eval {actual} != full scan {expected} for color {color}")
+                mismatches += 1
+    return mismatches
+
+
+def check_numpy_agreement(config, count=500, seed=0):
+    """
+    Compares NumpyHeuristics, one by one and as a batch, with the full-scan
+    evaluate; returns the number of mismatching evaluations.
+    """
+    numpy_eval = NumpyHeuristics(config.ROWS, config.COLS)
+    states = list(random_positions(config, count, seed))
+    boards = np.array([state.board for state in states], dtype=np.int8)
+    captures = np.array([[state.captures[1], state.captures[2]] for state in states])
+    winners = np.array([state.winner or 0 for state in states])
+    mismatches = 0
+    for color in (1, 2):
+        batch = numpy_eval.evaluate_batch(boards, color, captures, winners)
+        for i, (state, batch_score) in enumerate(zip(states, batch)):
+            expected = PenteHeuristics.evaluate(state, color)
+            single = numpy_eval.evaluate(state, color)
+            if single != expected or batch_score != expected:
+                print(
+                    f"Position {i}: NumPy eval {single}, batch {batch_score} != full scan {expected}"
+                    f" for color {color}"
+                )
+                mismatches += 1
+    return mismatches
+
+
+def time_numpy(config, count, seed):
+    numpy_eval = NumpyHeuristics(config.ROWS, config.COLS)
+    states = list(random_positions(config, count, seed))
+    boards = np.array([state.board for state in states], dtype=np.int8)
+    captures = np.array([[state.captures[1], state.captures[2]] for state in states])
+
+    start = time.perf_counter()
+    for state in states:
+        numpy_eval.evaluate(state, 1)
+    single_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    numpy_eval.evaluate_batch(boards, 1, captures)
+    batch_ms = (time.perf_counter() - start) * 1000
+    return single_ms, batch_ms
+
+
+def time_evaluators(config, count, seed):
+    states = list(random_positions(config, count, seed))
+    for state in states:
+        # Settle the lines dirtied while the position was being built.
+        state.evaluator.evaluate(state, 1)
+
+    start = time.perf_counter()
+    for state in states:
+        PenteHeuristics.evaluate(state, 1)
+    full_ms = (time.perf_counter() - start) * 1000
+
+    # Dirty one move's worth of lines per evaluation, as the search does.
+    start = time.perf_counter()
+    for state in states:
+        if state.history:
+            row, col = state.history[-1][:2]
+            state.unmake_move()
+            state.make_move(row, col)
+        state.evaluator.evaluate(state, 1)
+    incremental_ms = (time.perf_counter() - start) * 1000
+    return full_ms, incremental_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check and time the heuristic evaluators.")
+    parser.add_argument("--positions", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    config = Config()
+    config.sound_enabled = False
+
+    start = time.perf_counter()
+    PatternTables.build()
+    print(f"[Pattern Tables] Built {PatternTables.SIZE:,} windows per colour in {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    if check_incremental_agreement(config, args.positions, args.seed):
+        raise SystemExit("Incremental evaluator does not match the full scan")
+    print(f"[Eval Check] Incremental evaluator agrees with full scan on {args.positions} positions")
+
+    if check_numpy_agreement(config, args.positions, args.seed):
+        raise SystemExit("NumPy evaluator does not match the full scan")
+    print(f"[Eval Check] NumPy evaluator agrees with full scan on {args.positions} positions")
+
+    full_ms, incremental_ms = time_evaluators(config, args.positions, args.seed + 1)
+    print(
+        f"[Eval Benchmark] Full scan: {full_ms / args.positions * 1000:.1f} us/eval"
+        f" | Incremental: {incremental_ms / args.positions * 1000:.1f} us/eval"
+        f" | Speedup: {full_ms / incremental_ms:.2f}x"
+    )
+
+    single_ms, batch_ms = time_numpy(config, args.positions, args.seed + 2)
+    print(
+        f"[Eval Benchmark] NumPy single: {single_ms / args.positions * 1000:.1f} us/eval"
+        f" | NumPy batch of {args.positions}: {batch_ms / args.positions * 1000:.1f} us/eval"
+        f" ({args.positions / batch_ms * 1000:,.0f} positions/s)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import argparse
+import random
+import time
+
+from config import Config
+from mcts_ai import MCTSAI
+from pente_ai import PenteAI
+from performance_tracker import PerformanceTracker
+from positions import build_game, random_opening
+
+
+def play_game(config, opening, players, time_limit_ms, max_plies, cpu_seconds):
+    """Plays one game from the opening; adds each side's CPU time to cpu_seconds. Returns the winner or None."""
+    game = build_game(config, opening)
+    for _ in range(max_plies):
+        if game.game_over:
+            break
+        tracker = PerformanceTracker()
+        start = time.process_time()
+        move = players[game.turn].get_best_move(game, tracker, time_limit_ms=time_limit_ms)
+        cpu_seconds[game.turn] += time.process_time() - start
+        if move is None:
+            break
+        game.make_move(move[0], move[1])
+    return game.winner
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MCTS against alpha-beta at the same time per move.")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--time-ms", type=float, default=500, help="Per-move time budget for both engines")
+    parser.add_argument("--depth", type=int, default=6, help="Alpha-beta depth cap")
+    parser.add_argument("--level", type=int, default=50, help="MCTS level (playout budget = MCTS_PLAYOUTS x level)")
+    parser.add_argument("--max-plies", type=int, default=120, help="Games longer than this are draws")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = Config()
+    config.sound_enabled = False
+    rng = random.Random(args.seed)
+
+    results = {"win": 0, "loss": 0, "draw": 0}
+    cpu = {"mcts": 0.0, "alphabeta": 0.0}
+    for index in range(args.games):
+        opening = random_opening(config, rng, 2)
+        mcts_color = 1 if index % 2 == 0 else 2
+        players = {
+            mcts_color: MCTSAI(config, mcts_color, depth=args.level, seed=args.seed + index),
+            3 - mcts_color: PenteAI(config, 3 - mcts_color, depth=args.depth, use_book=False),
+        }
+        cpu_seconds = {1: 0.0, 2: 0.0}
+        winner = play_game(config, opening, players, args.time_ms, args.max_plies, cpu_seconds)
+        for ai in players.values():
+            ai.close()
+        cpu["mcts"] += cpu_seconds[mcts_color]
+        cpu["alphabeta"] += cpu_seconds[3 - mcts_color]
+        if winner is None:
+            results["draw"] += 1
+        elif winner == mcts_color:
+            results["win"] += 1
+        else:
+            results["loss"] += 1
+        print(f"Game {index + 1}/{args.games}: opening {opening}, MCTS plays {mcts_color}, winner {winner}")
+
+    score = (results["win"] + 0.5 * results["draw"]) / max(args.games, 1)
+    print(
+        f"MCTS vs alpha-beta at {args.time_ms:.0f} ms/move: {results['win']} wins, {results['loss']} losses,"
+        f" {results['draw']} draws ({100.0 * score:.1f}%)"
+        f" | CPU seconds: MCTS {cpu['mcts']:.1f}, alpha-beta {cpu['alphabeta']:.1f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
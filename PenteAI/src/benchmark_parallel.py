@@ -0,0 +1,61 @@
+import argparse
+import os
+
+from config import Config
+from pente_ai import PenteAI
+from performance_tracker import PerformanceTracker
+from positions import POSITIONS, build_game
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Speedup curve of parallel search by worker count.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[3, 4, 5])
+    parser.add_argument("--workers", type=int, nargs="+", default=None,
+                        help="Worker counts to try (default: powers of two up to the CPU count)")
+    parser.add_argument("--positions", nargs="+", default=list(POSITIONS), choices=list(POSITIONS))
+    parser.add_argument("--mode", default="root", choices=PenteAI.PARALLEL_MODES,
+                        help="Parallel search mode to measure")
+    args = parser.parse_args()
+
+    worker_counts = args.workers
+    if worker_counts is None:
+        cpus = os.cpu_count() or 1
+        worker_counts = [1]
+        while worker_counts[-1] * 2 <= cpus:
+            worker_counts.append(worker_counts[-1] * 2)
+        if worker_counts[-1] != cpus:
+            worker_counts.append(cpus)
+
+    config = Config()
+    config.sound_enabled = False
+
+    for name in args.positions:
+        game = build_game(config, POSITIONS[name])
+        for depth in args.depths:
+            baseline_ms = None
+            baseline_move = None
+            for workers in worker_counts:
+                ai = PenteAI(config, game.turn, depth=depth, workers=workers, parallel_mode=args.mode,
+                             use_book=False)
+                if workers > 1:
+                    # Start the pool (and warm each worker) outside the timed search.
+                    ai.get_best_move(game, PerformanceTracker(), max_depth=1)
+                tracker = PerformanceTracker()
+                tracker.start_timer()
+                move = ai.get_best_move(game, tracker)
+                elapsed, nodes, _ = tracker.stop_timer()
+                if args.mode == "lazy_smp" and workers > 1:
+                    print(ai._parallel.format_stats())
+                ai.close()
+
+                if baseline_ms is None:
+                    baseline_ms, baseline_move = elapsed, move
+                print(
+                    f"[{name}] Depth: {depth} | Workers: {workers} | Time: {elapsed:.2f} ms"
+                    f" | Nodes: {nodes} | Speedup: {baseline_ms / elapsed:.2f}x"
+                    f" | Same move as 1 worker: {move == baseline_move}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+import argparse
+import random
+
+from benchmark_search import run_search
+from config import Config
+from pente_ai import PenteAI
+from performance_tracker import PerformanceTracker
+from positions import POSITIONS, build_game, random_opening
+
+
+# (pvs, lmr) settings compared against plain alpha-beta.
+VARIANTS = {
+    "alpha-beta": (False, False),
+    "pvs": (True, False),
+    "pvs+lmr": (True, True),
+}
+
+
+def compare_nodes(config, depths):
+    for name, moves in POSITIONS.items():
+        game = build_game(config, moves)
+        for depth in depths:
+            cells = []
+            for variant, (pvs, lmr) in VARIANTS.items():
+                move, metrics, tracker = run_search(config, game, depth, pvs=pvs, lmr=lmr)
+                cells.append(
+                    f"{variant}: {metrics[1]} nodes, {metrics[0]:.0f} ms, move {move}"
+                    f" (reduced {tracker.lmr_reductions}, re-searched {tracker.pvs_researches})"
+                )
+            print(f"[{name}] Depth: {depth} | " + " | ".join(cells))
+
+
+def play_game(config, opening, players, time_limit_ms, max_plies):
+    """Plays one game from the opening; players maps colour to PenteAI. Returns the winner or None for a draw."""
+    game = build_game(config, opening)
+    for _ in range(max_plies):
+        if game.game_over:
+            break
+        tracker = PerformanceTracker()
+        move = players[game.turn].get_best_move(game, tracker, time_limit_ms=time_limit_ms)
+        if move is None:
+            break
+        game.make_move(move[0], move[1])
+    return game.winner
+
+
+def self_play(config, games, depth, time_limit_ms, max_plies, seed):
+    """Plays pvs+lmr against plain alpha-beta at the same per-move time, alternating colours."""
+    rng = random.Random(seed)
+    results = {"win": 0, "loss": 0, "draw": 0}
+    for index in range(games):
+        opening = random_opening(config, rng, 2)
+        test_color = 1 if index % 2 == 0 else 2
+        players = {
+            test_color: PenteAI(config, test_color, depth=depth, use_book=False, pvs=True, lmr=True),
+            3 - test_color: PenteAI(config, 3 - test_color, depth=depth, use_book=False, pvs=False, lmr=False),
+        }
+        winner = play_game(config, opening, players, time_limit_ms, max_plies)
+        for ai in players.values():
+            ai.close()
+        if winner is None:
+            results["draw"] += 1
+        elif winner == test_color:
+            results["win"] += 1
+        else:
+            results["loss"] += 1
+        print(f"Game {index + 1}/{games}: opening {opening}, pvs+lmr plays {test_color}, winner {winner}")
+
+    score = (results["win"] + 0.5 * results["draw"]) / max(games, 1)
+    print(
+        f"pvs+lmr vs alpha-beta at {time_limit_ms:.0f} ms/move: "
+        f"{results['win']} wins, {results['loss']} losses, {results['draw']} draws ({100.0 * score:.1f}%)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure principal variation search and late move reductions.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[3, 4])
+    parser.add_argument("--games", type=int, default=10, help="Self-play games (0 skips self-play)")
+    parser.add_argument("--game-depth", type=int, default=6, help="Depth cap for self-play searches")
+    parser.add_argument("--time-ms", type=float, default=300, help="Per-move time budget in self-play")
+    parser.add_argument("--max-plies", type=int, default=120, help="Self-play games longer than this are draws")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    config = Config()
+    config.sound_enabled = False
+
+    compare_nodes(config, args.depths)
+    if args.games > 0:
+        self_play(config, args.games, args.game_depth, args.time_ms, args.max_plies, args.seed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+import argparse
+
+from config import Config
+from pente_ai import PenteAI
+from performance_tracker import PerformanceTracker, TelemetrySink
+from positions import POSITIONS, build_game
+from profiling import SearchProfiler
+
+
+# Make/unmake search without the extensions the clone path lacks (TT, threat
+# and quiescence search, symmetry, PVS/LMR), so the two board representations
+# are compared on the same search.
+PLAIN_SEARCH = {
+    "tt_size_mb": 0, "threat_search_nodes": 0, "quiescence_nodes": 0, "symmetry": False, "pvs": False, "lmr": False,
+}
+
+
+def run_search(config, game, depth, time_limit_ms=None, max_nodes=None, telemetry=False, trace_memory=False,
+               profiler=None, profile_label=None, **ai_kwargs):
+    # Benchmarks measure the search itself, so the opening book is off unless asked for.
+    ai_kwargs.setdefault("use_book", False)
+    ai = PenteAI(config, game.turn, depth=depth, **ai_kwargs)
+    tracker = PerformanceTracker(telemetry=telemetry, trace_memory=trace_memory)
+    tracker.start_timer()
+    if profiler is not None:
+        move = profiler.run(
+            profile_label, ai.get_best_move, game, tracker, time_limit_ms=time_limit_ms, max_nodes=max_nodes
+        )
+    else:
+        move = ai.get_best_move(game, tracker, time_limit_ms=time_limit_ms, max_nodes=max_nodes)
+    metrics = tracker.stop_timer()
+    if trace_memory:
+        tracker.record_cache_sizes(ai.cache_sizes())
+    return move, metrics, tracker
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare clone-based and make/unmake search.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--tt-mb", type=float, default=None, help="Transposition table size (0 disables)")
+    parser.add_argument("--time-ms", type=float, default=None, help="Per-move time budget for make/unmake search")
+    parser.add_argument("--max-nodes", type=int, default=None, help="Per-move node budget for make/unmake search")
+    parser.add_argument("--q-nodes", type=int, default=None, help="Quiescence node budget per iteration (0 disables)")
+    parser.add_argument("--telemetry", default=None, metavar="PATH",
+                        help="Time the make/unmake search by phase and append its records to this JSONL file")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="Trace the make/unmake search with tracemalloc (slows it down) and report its heap use")
+    parser.add_argument("--profile", default=None, metavar="DIR",
+                        help="Profile the make/unmake searches into DIR (see profiling.py)")
+    args = parser.parse_args()
+
+    config = Config()
+    config.sound_enabled = False
+    sink = TelemetrySink(args.telemetry) if args.telemetry else None
+    profiler = SearchProfiler(args.profile) if args.profile else None
+
+    for name, moves in POSITIONS.items():
+        game = build_game(config, moves)
+        for depth in args.depths:
+            clone_move, clone_metrics, _ = run_search(config, game, depth, search_mode="clone", tt_size_mb=0)
+            _, plain_metrics, _ = run_search(config, game, depth, **PLAIN_SEARCH)
+            move, metrics, tracker = run_search(
+                config, game, depth, time_limit_ms=args.time_ms, max_nodes=args.max_nodes, tt_size_mb=args.tt_mb,
+                quiescence_nodes=args.q_nodes, telemetry=sink is not None, trace_memory=args.trace_memory,
+                profiler=profiler, profile_label=f"{name}-d{depth}",
+            )
+            if sink is not None:
+                sink.write(tracker.to_record(position=name, depth=depth))
+            tt = tracker.tt_stats
+            deltas = PerformanceTracker.compare(clone_metrics, metrics)
+            print(
+                f"[{name}] Depth: {depth} | Clone: {clone_metrics[0]:.2f} ms, {clone_metrics[1]} nodes"
+                f" | Plain make/unmake: {plain_metrics[0]:.2f} ms, {plain_metrics[1]} nodes"
+                f" ({PerformanceTracker.compare(clone_metrics, plain_metrics)['speedup']:.2f}x)"
+                f" | Make/Unmake: {metrics[0]:.2f} ms, {metrics[1]} nodes, depth {tracker.depth_reached}"
+                f" | Delta: {deltas['time_delta_ms']:+.2f} ms, {deltas['node_delta']:+d} nodes"
+                f" | Speedup: {deltas['speedup']:.2f}x"
+                f" | Same move: {clone_move == move}"
+                f" | TT hits: {tt.get('hits', 0)} misses: {tt.get('misses', 0)} collisions: {tt.get('collisions', 0)}"
+                f" | First-move cutoffs: {tracker.first_move_cutoff_pct:.1f}%"
+                f" | Threat search: {tracker.threat_nodes} nodes, win found: {tracker.threat_win_found}"
+                f" | Quiescence nodes: {tracker.quiescence_nodes}"
+            )
+            if args.trace_memory:
+                caches = ", ".join(f"{name} {size / 1024:.0f} KB" for name, size in tracker.cache_bytes.items())
+                print(
+                    f"    Traced peak: {tracker.peak_alloc_mb:.2f} MB | Retained: {tracker.retained_alloc_mb:.2f} MB"
+                    f" in {tracker.alloc_blocks} blocks | Caches: {caches}"
+                )
+                for site in tracker.top_allocations:
+                    print(f"      {site['site']}: {site['kb']:.1f} KB in {site['blocks']} blocks")
+    if sink is not None:
+        sink.close()
+
+
+if __name__ == "__main__":
+    main()
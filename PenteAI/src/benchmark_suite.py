@@ -0,0 +1,228 @@
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+
+import numpy as np
+
+from benchmark_search import run_search
+from config import Config
+from pente_game import PenteGame
+from profiling import SearchProfiler, aggregate, hot_functions
+
+
+BENCHMARK_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmarks")
+CORPUS_PATH = os.path.join(BENCHMARK_DIR, "corpus.json")
+RESULTS_PATH = os.path.join(BENCHMARK_DIR, "results.json")
+# Version of the results file layout read by analyze_results.py and generate-graphs.py.
+RESULTS_FORMAT = 1
+# Config settings that change what the benchmarked search does; only these are recorded with the results.
+SEARCH_SETTINGS = (
+    "ROWS", "COLS", "WIN_CAPTURE_COUNT", "TT_SIZE_MB", "AI_WORKERS", "AI_PARALLEL_MODE", "AI_SYMMETRY",
+    "AI_PVS", "AI_LMR", "THREAT_SEARCH_NODES", "THREAT_SEARCH_DEPTH", "QUIESCENCE_NODES",
+)
+
+
+def load_corpus(path):
+    with open(path) as f:
+        corpus = json.load(f)
+    for position in corpus["positions"]:
+        position["moves"] = [tuple(move) for move in position["moves"]]
+    return corpus
+
+
+def build_position(config, position):
+    game = PenteGame(config)
+    for r, c in position["moves"]:
+        if not game.make_move(r, c):
+            raise ValueError(f"Illegal move {(r, c)} in corpus position {position['name']}")
+    if game.game_over:
+        raise ValueError(f"Corpus position {position['name']} is already decided")
+    return game
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)), capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(config, corpus, depths, repeats, seed, time_limit_ms, ai_kwargs, profiler=None):
+    """
+    Searches every corpus position at every depth with a fresh PenteAI, repeats
+    times, and returns one row per (position, depth) with the median time.
+    With a profiler every search is profiled as <position>-d<depth>-r<repeat>.
+    The memory is the tracemalloc peak of one more, untimed search, since the
+    process RSS only grows over the run.
+    """
+    rows = []
+    for position in corpus["positions"]:
+        game = build_position(config, position)
+        for depth in depths:
+            times = []
+            for repeat in range(repeats):
+                random.seed(seed)
+                np.random.seed(seed)
+                move, metrics, tracker = run_search(
+                    config, game, depth, time_limit_ms=time_limit_ms, profiler=profiler,
+                    profile_label=f"{position['name']}-d{depth}-r{repeat}", **ai_kwargs
+                )
+                times.append(metrics[0])
+            random.seed(seed)
+            np.random.seed(seed)
+            _, _, traced = run_search(config, game, depth, time_limit_ms=time_limit_ms, trace_memory=True, **ai_kwargs)
+            time_ms = statistics.median(times)
+            nodes = metrics[1]
+            row = {
+                "position": position["name"],
+                "category": position["category"],
+                "depth": depth,
+                "time_ms": time_ms,
+                "time_ms_runs": times,
+                "nodes": nodes,
+                "nodes_per_sec": nodes / (time_ms / 1000) if time_ms > 0 else 0.0,
+                "memory_mb": traced.peak_alloc_mb,
+                "move": list(move) if move else None,
+                "depth_reached": tracker.depth_reached,
+                "root_moves": tracker.root_moves,
+            }
+            rows.append(row)
+            print(
+                f"[{position['name']}] Depth: {depth} | Time: {time_ms:.2f} ms | Nodes: {nodes}"
+                f" | Nodes/s: {row['nodes_per_sec']:,.0f} | Peak heap: {row['memory_mb']:.2f} MB | Move: {move}"
+            )
+    return rows
+
+
+def compare(base, new, time_tolerance, node_tolerance, min_time_ms):
+    """
+    Prints the per-row changes between two result files and returns the
+    regressions: rows whose median time or node count grew by more than the
+    tolerance (time changes under min_time_ms are treated as noise).
+    """
+    if base["corpus_version"] != new["corpus_version"]:
+        raise ValueError(
+            f"Results are for different corpus versions ({base['corpus_version']} and {new['corpus_version']})"
+        )
+    if base.get("settings") != new.get("settings"):
+        print("Warning: The runs used different search settings; node counts are not comparable.")
+    if bool(base.get("profile")) != bool(new.get("profile")):
+        print("Warning: Only one of the runs was profiled; its times include the profiler overhead.")
+    base_rows = {(row["position"], row["depth"]): row for row in base["results"]}
+    regressions = []
+    for row in new["results"]:
+        key = (row["position"], row["depth"])
+        old = base_rows.get(key)
+        if old is None:
+            continue
+        time_ratio = row["time_ms"] / old["time_ms"] if old["time_ms"] > 0 else 1.0
+        node_ratio = row["nodes"] / old["nodes"] if old["nodes"] > 0 else 1.0
+        flags = []
+        if time_ratio > 1 + time_tolerance and row["time_ms"] - old["time_ms"] >= min_time_ms:
+            flags.append("TIME")
+        if node_ratio > 1 + node_tolerance:
+            flags.append("NODES")
+        if row["move"] != old["move"]:
+            flags.append("move changed")
+        print(
+            f"[{key[0]}] Depth: {key[1]} | Time: {old['time_ms']:.2f} -> {row['time_ms']:.2f} ms ({time_ratio:.2f}x)"
+            f" | Nodes: {old['nodes']} -> {row['nodes']} ({node_ratio:.2f}x)"
+            + (f" | {', '.join(flags)}" if flags else "")
+        )
+        if "TIME" in flags or "NODES" in flags:
+            regressions.append(key)
+    if base.get("profile") and new.get("profile"):
+        compare_hot_functions(base["profile"]["hot_functions"], new["profile"]["hot_functions"])
+    return regressions
+
+
+def compare_hot_functions(base, new):
+    """Prints the share of search time of the new run's hottest functions next to the base run's."""
+    base_pct = {row["function"]: row["own_pct"] for row in base}
+    for row in new:
+        old = base_pct.get(row["function"])
+        before = f"{old:.1f}%" if old is not None else "-"
+        print(f"{row['function']}: own time {before} -> {row['own_pct']:.1f}% ({row['calls']} calls)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reproducible search benchmark over a versioned position corpus.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run = commands.add_parser("run", help="Benchmark PenteAI on the corpus and write a results file")
+    run.add_argument("--corpus", default=CORPUS_PATH)
+    run.add_argument("--depths", type=int, nargs="+", default=[1, 2, 3, 4])
+    run.add_argument("--repeats", type=int, default=3, help="Searches per row; the median time is kept")
+    run.add_argument("--seed", type=int, default=0)
+    run.add_argument("--time-ms", type=float, default=None, help="Per-search time budget (default: none)")
+    run.add_argument("--tt-mb", type=float, default=None, help="Transposition table size (0 disables)")
+    run.add_argument("--out", default=RESULTS_PATH)
+    run.add_argument("--profile", default=None, metavar="DIR",
+                     help="Profile every search into DIR (best empty) and store the hottest functions in the results"
+                          " (times then include the profiler overhead)")
+
+    diff = commands.add_parser("compare", help="Compare two results files and flag regressions")
+    diff.add_argument("base")
+    diff.add_argument("new")
+    diff.add_argument("--time-tolerance", type=float, default=0.15, help="Allowed relative time increase")
+    diff.add_argument("--node-tolerance", type=float, default=0.05, help="Allowed relative node increase")
+    diff.add_argument("--min-time-ms", type=float, default=5.0, help="Smaller time increases are ignored")
+    args = parser.parse_args()
+
+    if args.command == "compare":
+        with open(args.base) as f:
+            base = json.load(f)
+        with open(args.new) as f:
+            new = json.load(f)
+        regressions = compare(base, new, args.time_tolerance, args.node_tolerance, args.min_time_ms)
+        print(f"{len(regressions)} regressions")
+        sys.exit(1 if regressions else 0)
+
+    config = Config()
+    config.sound_enabled = False
+    corpus = load_corpus(args.corpus)
+    ai_kwargs = {"tt_size_mb": args.tt_mb}
+    profiler = SearchProfiler(args.profile) if args.profile else None
+    rows = run_suite(config, corpus, args.depths, args.repeats, args.seed, args.time_ms, ai_kwargs, profiler)
+    profile = None
+    if profiler is not None:
+        stats, _ = aggregate(args.profile)
+        # Only the directory name: the results file is committed and must not carry local paths.
+        profile = {
+            "directory": os.path.basename(os.path.normpath(args.profile)),
+            "hot_functions": hot_functions(stats, 25),
+        }
+    settings = {key: getattr(config, key) for key in SEARCH_SETTINGS}
+    if args.tt_mb is not None:
+        settings["TT_SIZE_MB"] = args.tt_mb
+
+    results = {
+        "format": RESULTS_FORMAT,
+        "corpus_version": corpus["version"],
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "seed": args.seed,
+        "repeats": args.repeats,
+        "time_limit_ms": args.time_ms,
+        "settings": settings,
+        "results": rows,
+        "profile": profile,
+    }
+    os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(results, f, indent=1)
+    print(f"Wrote {len(rows)} results to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+import argparse
+
+from benchmark_search import run_search
+from config import Config
+from positions import POSITIONS, build_game
+from search_state import SearchState
+from zobrist import transform_cell
+
+
+# Opening positions; all but the last have a non-trivial symmetry.
+OPENINGS = {
+    "centre": [(9, 9)],
+    "adjacent": [(9, 9), (9, 10)],
+    "diagonal": [(9, 9), (10, 10)],
+    "line": [(9, 9), (8, 8), (10, 10)],
+    "opening": POSITIONS["opening"],
+}
+
+
+def equivalent_moves(config, game, a, b):
+    """True if a and b are the same move up to a symmetry of the position."""
+    if a == b:
+        return True
+    if a is None or b is None:
+        return False
+    state = SearchState(
+        game.board, game.captures, game.turn, config, incremental_eval=False, track_symmetries=True
+    )
+    return any(
+        transform_cell(symmetry, a[0], a[1], config.ROWS, config.COLS) == b
+        for symmetry in state.self_symmetries()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure symmetry-canonical hashing and root pruning.")
+    parser.add_argument("--depths", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--time-ms", type=float, default=None, help="Per-move time budget")
+    args = parser.parse_args()
+
+    config = Config()
+    config.sound_enabled = False
+
+    totals = {False: [0, 0, 0.0], True: [0, 0, 0.0]}
+    for name, moves in OPENINGS.items():
+        game = build_game(config, moves)
+        for depth in args.depths:
+            results = {}
+            for symmetry in (False, True):
+                move, metrics, tracker = run_search(
+                    config, game, depth, time_limit_ms=args.time_ms, symmetry=symmetry,
+                    threat_search_nodes=0, quiescence_nodes=0,
+                )
+                results[symmetry] = (move, metrics, tracker)
+                totals[symmetry][0] += tracker.root_moves_searched
+                totals[symmetry][1] += metrics[1]
+                totals[symmetry][2] += metrics[0]
+            off_move, off_metrics, off_tracker = results[False]
+            on_move, on_metrics, on_tracker = results[True]
+            print(
+                f"[{name}] Depth: {depth}"
+                f" | Root moves: {off_tracker.root_moves_searched} -> {on_tracker.root_moves_searched}"
+                f" | Nodes: {off_metrics[1]} -> {on_metrics[1]}"
+                f" | Time: {off_metrics[0]:.2f} -> {on_metrics[0]:.2f} ms"
+                f" | TT hits: {off_tracker.tt_stats.get('hits', 0)} -> {on_tracker.tt_stats.get('hits', 0)}"
+                f" | Equivalent move: {equivalent_moves(config, game, off_move, on_move)}"
+            )
+
+    off, on = totals[False], totals[True]
+    print(
+        f"Total | Root moves: {off[0]} -> {on[0]} ({100.0 * (off[0] - on[0]) / max(off[0], 1):.1f}% fewer)"
+        f" | Nodes: {off[1]} -> {on[1]} ({100.0 * (off[1] - on[1]) / max(off[1], 1):.1f}% fewer)"
+        f" | Time: {off[2]:.0f} -> {on[2]:.0f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+from search_state import SearchState
+
+
+class BitBoard(SearchState):
+    """
+    SearchState whose rules engine runs on one bitboard per colour, stored as
+    Python ints.
+
+    Cell (r, c) is bit r * width + c, where width = cols + 1: the extra padding
+    column is always empty, so shifting along a row or diagonal can never wrap
+    onto the next row. Five-in-a-row is a shift-and-AND per direction, captures
+    are precomputed pair/end masks around the played cell and candidate moves
+    are a bitwise dilation of the occupied cells. The list-of-lists board is
+    still kept in sync because the heuristics and move ordering index it.
+    """
+
+    _MASKS_CACHE = {}
+
+    def __init__(self, board_matrix, captures, turn, config, incremental_eval=True, track_symmetries=False):
+        self.width = config.COLS + 1
+        # Bit shifts for the four line directions: row, column, diagonal, anti-diagonal.
+        self.shifts = (1, self.width, self.width + 1, self.width - 1)
+        self.bits = {1: 0, 2: 0}
+        self.valid_mask, self.capture_masks, self.byte_cells = self._get_masks(config.ROWS, config.COLS)
+        self.num_bytes = len(self.byte_cells)
+        super().__init__(board_matrix, captures, turn, config, incremental_eval, track_symmetries)
+
+    def candidate_moves(self, radius):
+        occupied = self.bits[1] | self.bits[2]
+        near = occupied
+        w = self.width
+        for _ in range(radius):
+            near |= (
+                (near << 1) | (near >> 1)
+                | (near << w) | (near >> w)
+                | (near << (w + 1)) | (near >> (w + 1))
+                | (near << (w - 1)) | (near >> (w - 1))
+            )
+            near &= self.valid_mask
+        return self.cells_of(near & ~occupied)
+
+    def cells_of(self, mask):
+        """Lists the (row, col) of every set bit in mask, a byte at a time."""
+        byte_cells = self.byte_cells
+        cells = []
+        for i, byte in enumerate(mask.to_bytes(self.num_bytes, "little")):
+            if byte:
+                cells += byte_cells[i][byte]
+        return cells
+
+    def has_five(self, color):
+        b = self.bits[color]
+        for d in self.shifts:
+            m = b & (b >> d)
+            m &= m >> (2 * d)
+            if m & (b >> (4 * d)):
+                return True
+        return False
+
+    def _on_stone_added(self, r, c):
+        color = self.board[r][c]
+        self.bits[color] |= 1 << (r * self.width + c)
+        self.stone_count += 1
+
+    def _on_stone_removed(self, r, c, color):
+        self.bits[color] &= ~(1 << (r * self.width + c))
+        self.stone_count -= 1
+
+    def _apply_captures(self, r, c, me):
+        opp_bits = self.bits[3 - me]
+        my_bits = self.bits[me]
+        captured = []
+        for pair_mask, end_bit, first, second in self.capture_masks[r * self.width + c]:
+            if opp_bits & pair_mask == pair_mask and my_bits & end_bit:
+                self.board[first[0]][first[1]] = 0
+                self.board[second[0]][second[1]] = 0
+                captured.append(first)
+                captured.append(second)
+        if captured:
+            self.captures[me] += len(captured)
+        return captured
+
+    def _check_win(self, r, c, me):
+        if self.captures[me] >= self.win_capture_count:
+            return True
+        return self.has_five(me)
+
+    @classmethod
+    def _get_masks(cls, rows, cols):
+        """
+        Board mask; per cell, the (pair_mask, end_bit, cell1, cell2) of every
+        capture ray; and per byte of the bitboard, the cells each byte value holds.
+        """
+        masks = cls._MASKS_CACHE.get((rows, cols))
+        if masks is None:
+            width = cols + 1
+            valid_mask = 0
+            capture_masks = [[] for _ in range(rows * width)]
+            for r in range(rows):
+                for c in range(cols):
+                    valid_mask |= 1 << (r * width + c)
+                    for dr, dc in cls.DIRECTIONS:
+                        for sign in (1, -1):
+                            r1, c1 = r + dr * sign, c + dc * sign
+                            r2, c2 = r + 2 * dr * sign, c + 2 * dc * sign
+                            r3, c3 = r + 3 * dr * sign, c + 3 * dc * sign
+                            if 0 <= r3 < rows and 0 <= c3 < cols:
+                                pair_mask = (1 << (r1 * width + c1)) | (1 << (r2 * width + c2))
+                                end_bit = 1 << (r3 * width + c3)
+                                capture_masks[r * width + c].append(
+                                    (pair_mask, end_bit, (r1, c1), (r2, c2))
+                                )
+            cell_at = {r * width + c: (r, c) for r in range(rows) for c in range(cols)}
+            num_bytes = (rows * width + 7) // 8
+            byte_cells = [
+                [
+                    [cell_at[i * 8 + bit] for bit in range(8) if value >> bit & 1 and i * 8 + bit in cell_at]
+                    for value in range(256)
+                ]
+                for i in range(num_bytes)
+            ]
+            masks = (valid_mask, capture_masks, byte_cells)
+            cls._MASKS_CACHE[(rows, cols)] = masks
+        return masks
@@ -0,0 +1,121 @@
+import argparse
+import json
+from collections import defaultdict
+
+from config import Config
+from move_ordering import MoveOrdering
+from opening_book import OpeningBook, default_book_path
+from pente_ai import PenteAI
+from performance_tracker import PerformanceTracker
+from positions import build_game
+from search_state import SearchState
+from zobrist import get_zobrist_keys, transform_cell
+
+
+def canonical_entry(zobrist, game, move):
+    """(canonical hash, move in the canonical orientation) for playing move in game."""
+    key, symmetry = zobrist.canonical_hash(game.board, game.captures, game.turn)
+    return key, transform_cell(symmetry, move[0], move[1], game.config.ROWS, game.config.COLS)
+
+
+def book_from_search(config, plies, depth, branching, time_limit_ms):
+    """
+    Searches every position reachable in the first plies moves when each side
+    plays either the searched move or one of the next best-ordered candidates.
+    """
+    zobrist = get_zobrist_keys(config.ROWS, config.COLS)
+    ordering = MoveOrdering(config.ROWS, config.COLS)
+    entries = {}
+    frontier = [[]]
+    for ply in range(plies):
+        next_frontier = []
+        for moves in frontier:
+            game = build_game(config, moves)
+            if game.game_over:
+                continue
+            key, symmetry = zobrist.canonical_hash(game.board, game.captures, game.turn)
+            if key in entries:
+                continue
+            ai = PenteAI(config, game.turn, depth=depth, use_book=False)
+            tracker = PerformanceTracker()
+            best = ai.get_best_move(game, tracker, time_limit_ms=time_limit_ms)
+            ai.close()
+            if best is None:
+                continue
+            canonical = transform_cell(symmetry, best[0], best[1], config.ROWS, config.COLS)
+            entries[key] = (canonical[0], canonical[1], 1, tracker.depth_reached)
+            print(f"Ply {ply}: {len(entries)} positions | {moves} -> {best} (depth {tracker.depth_reached})")
+
+            state = SearchState(game.board, game.captures, game.turn, config, incremental_eval=False)
+            alternatives = [
+                move for move in ordering.order(state, sorted(state.candidate_moves(1)), 0) if move != best
+            ]
+            for move in [best] + alternatives[: branching - 1]:
+                next_frontier.append(moves + [move])
+        frontier = next_frontier
+    return entries
+
+
+def book_from_games(config, paths, plies):
+    """
+    Tallies the moves played in recorded games (JSONL lines with a "moves" list
+    of [row, col] and an optional "winner") and keeps, per position, the move
+    that won most often, then the most played one.
+    """
+    zobrist = get_zobrist_keys(config.ROWS, config.COLS)
+    tallies = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+    for path in paths:
+        with open(path) as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                winner = record.get("winner")
+                game = build_game(config, [])
+                for r, c in record["moves"][:plies]:
+                    key, move = canonical_entry(zobrist, game, (r, c))
+                    tally = tallies[key][move]
+                    tally[0] += 1 if winner == game.turn else 0
+                    tally[1] += 1
+                    if not game.make_move(r, c) or game.game_over:
+                        break
+
+    entries = {}
+    for key, moves in tallies.items():
+        move, (wins, count) = max(moves.items(), key=lambda item: (item[1][0], item[1][1], item[0]))
+        entries[key] = (move[0], move[1], count, 0)
+    return entries
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the memory-mapped opening book.")
+    parser.add_argument("--out", default=None, help="Book file (default: PenteAI/cache/opening_book.bin)")
+    parser.add_argument("--plies", type=int, default=8, help="Opening moves covered by the book")
+    parser.add_argument("--from-search", action="store_true", help="Fill the book with deep PenteAI searches")
+    parser.add_argument("--depth", type=int, default=4, help="Search depth for --from-search")
+    parser.add_argument("--branching", type=int, default=2,
+                        help="Moves expanded per position for --from-search (searched move first)")
+    parser.add_argument("--time-ms", type=float, default=None, help="Per-position time budget for --from-search")
+    parser.add_argument("--from-games", nargs="+", default=[], help="JSONL files of recorded games")
+    args = parser.parse_args()
+
+    if not args.from_search and not args.from_games:
+        parser.error("give --from-search and/or --from-games")
+
+    config = Config()
+    config.sound_enabled = False
+    entries = {}
+    if args.from_games:
+        entries.update(book_from_games(config, args.from_games, args.plies))
+    if args.from_search:
+        # Searched moves take precedence over recorded ones.
+        entries.update(book_from_search(config, args.plies, args.depth, args.branching, args.time_ms))
+
+    path = args.out or default_book_path()
+    OpeningBook.write(path, entries, config.ROWS, config.COLS)
+    print(f"Wrote {len(entries)} positions to {path}")
+
+
+if __name__ == "__main__":
+    main()
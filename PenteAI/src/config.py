@@ -12,6 +12,47 @@ class Config:
         self.ROWS = 19
         self.COLS = 19
         self.WIN_CAPTURE_COUNT = 10
+        self.TT_SIZE_MB = 16
+        # Per-move search budget for the AI; None searches to the full menu depth.
+        self.AI_TIME_LIMIT_MS = 5000
+        # Processes used for parallel search; 1 searches in-process.
+        self.AI_WORKERS = 1
+        # How AI_WORKERS > 1 split the work: "root" (one task per root move) or
+        # "lazy_smp" (every worker searches the whole tree over a shared table).
+        self.AI_PARALLEL_MODE = "root"
+        # Node budget and depth (attacker moves) of the forced-win threat search; 0 nodes disables it.
+        # It runs inside the move's time limit, so it also stops when AI_TIME_LIMIT_MS runs out.
+        # Kept small: it runs before every search, and a few nodes already find most short wins.
+        self.THREAT_SEARCH_NODES = 10
+        self.THREAT_SEARCH_DEPTH = 5
+        # Node budget per search iteration of the capture/five quiescence search; 0 disables it.
+        self.QUIESCENCE_NODES = 4000
+        # Opening book built by build_opening_book.py; None uses PenteAI/cache/opening_book.bin.
+        self.OPENING_BOOK_PATH = None
+        # Search the human's likely replies in the background during their turn.
+        self.AI_PONDER = True
+        # Symmetry-canonical transposition keys and pruning of symmetric root moves.
+        self.AI_SYMMETRY = True
+        # Principal variation (zero-window) search and late move reductions in the alpha-beta search.
+        self.AI_PVS = True
+        self.AI_LMR = True
+        # Engine behind the AI player: "alphabeta" (PenteAI) or "mcts" (MCTSAI).
+        self.AI_ENGINE = "alphabeta"
+        # MCTS playouts per difficulty level, UCB1 exploration constant, plies
+        # played out before the position is evaluated, and children expanded per node.
+        self.MCTS_PLAYOUTS = 400
+        self.MCTS_EXPLORATION = 0.7
+        self.MCTS_PLAYOUT_DEPTH = 8
+        self.MCTS_MAX_CHILDREN = 12
+        # Per-phase timing (move generation, ordering, evaluation, ...) of every AI search.
+        self.AI_TELEMETRY = False
+        # Trace each AI search with tracemalloc (peak heap, top allocation sites, cache sizes); slows searches down.
+        self.AI_TRACE_MEMORY = False
+        # Directory receiving a cProfile and collapsed-stack profile of every AI move
+        # (see profiling.py); set through the PENTE_PROFILE_DIR environment variable. None disables profiling.
+        self.AI_PROFILE_DIR = os.environ.get("PENTE_PROFILE_DIR") or None
+        # JSONL file receiving one telemetry record per AI move; None uses PenteAI/cache/telemetry.jsonl.
+        self.TELEMETRY_PATH = None
         self.sound_enabled = True
         self.sounds = {}
 
@@ -1,14 +1,16 @@
 import pygame
+import os
 import sys
 from config import Config
 from pente_game import PenteGame
-from pente_ai import PenteAI
+from ai_worker import AIWorker
 from theme import *
 from render_board import BoardRenderer
 from render_pieces import PieceRenderer
 from render_panel import PanelRenderer
 from menu import Menu
-from performance_tracker import PerformanceTracker
+from performance_tracker import PerformanceTracker, TelemetrySink
+from pattern_tables import default_cache_dir
 
 
 WHITE = (255, 255, 255)
@@ -36,18 +38,30 @@ class GameApp:
         self.game = PenteGame(self.config)
         self.menu = Menu(self.config)
         self.game_mode = "PVP"
-        self.ai_player = None
+        self.ai_worker = None
+        self.ponder_started = False
         self.player_color = 1
         self.last_ai_move_time = 0
         self.ai_delay_ms = 500
 
         
-        self.ai_tracker = PerformanceTracker() 
+        # Frame times (ms) recorded while the AI worker is thinking.
+        self.thinking_frame_ms = []
+        # One JSONL telemetry record per AI move.
+        self.telemetry_sink = TelemetrySink(
+            self.config.TELEMETRY_PATH or os.path.join(default_cache_dir(), "telemetry.jsonl")
+        )
         
         
         self.last_ai_time = 0.0
         self.last_ai_nodes = 0
         self.last_peak_memory = 0.0 
+        self.last_tt_stats = {}
+        self.last_depth_reached = 0
+        self.last_first_cut_pct = 0.0
+        self.last_ponder_hit_rate = 0.0
+        self.last_ponder_saved_ms = 0.0
+        self.last_frame_pcts = {}
         self.ai_depth = 0 
         self.font_size = 18
         
@@ -67,7 +81,9 @@ class GameApp:
             self._handle_input()
             self._update_ai()
             self._draw()
-            self.clock.tick(60)
+            frame_ms = self.clock.tick(60)
+            if self.ai_worker is not None and self.ai_worker.thinking:
+                self.thinking_frame_ms.append(frame_ms)
         self._shutdown()
 
     def _handle_input(self):
@@ -89,8 +105,10 @@ class GameApp:
                     
                     self.ai_depth = self.menu.selected_difficulty 
                     
-                    self.ai_player = PenteAI(
-                        self.config, ai_color, depth=self.ai_depth
+                    if self.ai_worker:
+                        self.ai_worker.close()
+                    self.ai_worker = AIWorker(
+                        self.config, ai_color, self.ai_depth, self.menu.selected_engine
                     )
                     self._start_game()
                 elif action == "NEXT_THEME":
@@ -106,6 +124,7 @@ class GameApp:
             elif self.state == "GAME":
                 if event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_ESCAPE:
+                        self._cancel_ai()
                         self.state = "MENU"
                         self.menu.state = "MAIN"
                         return
@@ -119,6 +138,7 @@ class GameApp:
                         if self.game_mode == "AI":
                             resigning_player = self.player_color
 
+                        self._cancel_ai()
                         self.game.resign(resigning_player)
                     else:
                         self._on_game_click()
@@ -136,6 +156,7 @@ class GameApp:
             self.hover_pos = None
 
     def _start_game(self):
+        self._cancel_ai()
         self._init_graphics(self.themes[self.current_theme_idx])
         self.state = "GAME"
         self.menu.state = "MAIN"
@@ -144,35 +165,65 @@ class GameApp:
         self.last_ai_move_time = pygame.time.get_ticks()
 
     def _update_ai(self):
+        if self.ai_worker is None:
+            return
+        result = self.ai_worker.poll()
+        if result is not None:
+            self._apply_ai_result(result)
+
         if self.state == "GAME" and not self.game.game_over and self.game_mode == "AI":
             if self.game.turn != self.player_color:
-                if pygame.time.get_ticks() - self.last_ai_move_time > self.ai_delay_ms:
-                    self._draw() 
-                    
-                    
-                    current_depth = self.ai_player.depth 
-                    self.ai_tracker.start_timer()
-                    
-                    
-                    move = self.ai_player.get_best_move(self.game, self.ai_tracker)
-                    
-                    
-                    time_taken, nodes_explored, peak_memory = self.ai_tracker.stop_timer()
-                    
-                    self.last_ai_time = time_taken
-                    self.last_ai_nodes = nodes_explored
-                    self.last_peak_memory = peak_memory 
-                    
-                    
-                    
-                    print(f"[AI Benchmark] Depth: {current_depth} | Time: {time_taken:.2f} ms | Nodes: {nodes_explored} | Memory: {peak_memory:.2f} MB")
-                    
-                    if move:
-                        self.game.make_move(move[0], move[1])
-                    self.last_ai_move_time = pygame.time.get_ticks()
+                if (
+                    not self.ai_worker.thinking
+                    and pygame.time.get_ticks() - self.last_ai_move_time > self.ai_delay_ms
+                ):
+                    self.thinking_frame_ms = []
+                    self.ai_worker.request_move(self.game, time_limit_ms=self.config.AI_TIME_LIMIT_MS)
+                    self.ponder_started = False
+            elif not self.ponder_started:
+                self.ai_worker.ponder(self.game, time_limit_ms=self.config.AI_TIME_LIMIT_MS)
+                self.ponder_started = True
+
+    def _apply_ai_result(self, result):
+        if self.state != "GAME" or self.game.game_over or self.game.turn == self.player_color:
+            return
+        self.last_ai_time = result["time_ms"]
+        self.last_ai_nodes = result["nodes"]
+        self.last_peak_memory = result["memory_mb"]
+        self.last_depth_reached = result["depth_reached"]
+        self.last_first_cut_pct = result["first_cut_pct"]
+        self.last_tt_stats = result["tt_stats"]
+        self.last_ponder_hit_rate = result["ponder_hit_rate"]
+        self.last_ponder_saved_ms = result["ponder_saved_ms"]
+        self.last_frame_pcts = PerformanceTracker.percentiles(self.thinking_frame_ms)
+
+        record = {
+            "ply": len(self.game.move_history),
+            "engine": self.menu.selected_engine,
+            "level": self.ai_depth,
+            "response_ms": self.last_ai_time,
+            "ponder_hit": result["ponder_hit"],
+            "ponder_hit_rate": self.last_ponder_hit_rate,
+            "ponder_saved_ms": self.last_ponder_saved_ms,
+            "frame_ms": self.last_frame_pcts,
+        }
+        record.update(result["telemetry"])
+        self.telemetry_sink.write(record)
+
+        move = result["move"]
+        if move:
+            self.game.make_move(move[0], move[1])
+        self.last_ai_move_time = pygame.time.get_ticks()
+
+    def _cancel_ai(self):
+        """Drops the pending AI move, if any, and stops pondering."""
+        if self.ai_worker is not None:
+            self.ai_worker.cancel()
+        self.ponder_started = False
 
     def _on_game_click(self):
         if self.game.game_over:
+            self._cancel_ai()
             self.game.reset()
         elif self.hover_pos:
             if self.game_mode == "AI" and self.game.turn != self.player_color:
@@ -191,11 +242,19 @@ class GameApp:
         y_start = 250 
 
         text_lines = [
-            f" AI METRICS (D={self.ai_depth}) ",
+            f" AI METRICS (D={self.last_depth_reached}/{self.ai_depth}) ",
             f"Time: {self.last_ai_time:.2f} ms",
             f"Nodes: {self.last_ai_nodes:,}", 
+            f"TT hits: {self.last_tt_stats.get('hits', 0):,}",
+            f"1st cut: {self.last_first_cut_pct:.1f}%",
             f"Memory: {self.last_peak_memory:.2f} MB", 
         ]
+        if self.config.AI_PONDER:
+            text_lines += [
+                f"Ponder hits: {self.last_ponder_hit_rate:.0f}%",
+                f"Saved: {self.last_ponder_saved_ms:.0f} ms",
+            ]
+        text_lines.append(f"Frame p95: {self.last_frame_pcts.get(95, 0):.0f} ms")
         
         y_pos = y_start
         
@@ -233,5 +292,8 @@ class GameApp:
      
 
     def _shutdown(self):
+        if self.ai_worker:
+            self.ai_worker.close()
+        self.telemetry_sink.close()
         pygame.quit()
         sys.exit()
\ No newline at end of file
@@ -1,22 +1,20 @@
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 
-data = {
-    'Depth': [1, 2, 3, 4],
-    
-   
-    'AlphaBeta_Time_ms': [4.64, 19.52, 554.39, 454.37], 
-    'AlphaBeta_Nodes': [32, 271, 9436, 6415],
-    
-    'Minimax_Time_ms_est': [10, 500, 30000, 1500000], 
-    'Minimax_Nodes_est': [360, 129600, 46656000, 16796160000],
-}
+from analyze_results import RESULTS_PATH, load_results
+
+# Measured by `python benchmark_suite.py run`; the minimax columns are estimates (see load_results).
+data = load_results(sys.argv[1] if len(sys.argv) > 1 else RESULTS_PATH)
 
 df_depth = np.array(data['Depth'])
 df_ab_time = np.array(data['AlphaBeta_Time_ms'])
-df_minimax_time = np.array(data['Minimax_Time_ms_est'])
+df_minimax_time = np.array(data['Minimax_Time_ms'])
 df_ab_nodes = np.array(data['AlphaBeta_Nodes'])
-df_minimax_nodes = np.array(data['Minimax_Nodes_est'])
+df_minimax_nodes = np.array(data['Minimax_Nodes'])
+b_star = data['Branching'][0]
+theoretical_nodes = b_star ** (df_depth / 2) * df_ab_nodes[0] / b_star ** (df_depth[0] / 2)
 
 
 
@@ -50,7 +48,7 @@ axes[1].legend()
 
 
 axes[2].plot(df_depth, df_ab_nodes, marker='s', label='Empirical (Actual Nodes)', color='blue')
-axes[2].plot(df_depth, df_ab_nodes, linestyle=':', label='Theoretical $O(b^{d/2})$ tracking', color='black')
+axes[2].plot(df_depth, theoretical_nodes, linestyle=':', label=f'Theoretical $O(b^{{d/2}})$ where $b={b_star:.0f}$', color='black')
 
 axes[2].set_title('Alpha-Beta: Empirical vs Theoretical Complexity')
 axes[2].set_yscale('log')
@@ -0,0 +1,145 @@
+from heuristics import PenteHeuristics
+from pattern_tables import get_pattern_tables
+
+
+class IncrementalHeuristics:
+    """
+    Incremental version of PenteHeuristics.evaluate.
+
+    The board is split into every full row, column and diagonal. The shape
+    score of each line (for both colours) is cached, together with the running
+    centre-control total. When a stone is added or removed only the four lines
+    through that cell are marked dirty; they are re-scored once, the next time
+    evaluate() is called, and the line totals are patched with the difference.
+    Lines are scored with the precomputed PatternTables. The result is
+    identical to the full-scan PenteHeuristics.evaluate.
+
+    checkpoint() and rollback() bracket a move of the search: every line
+    re-scored in between is journaled, and rollback() puts the old scores back
+    instead of re-scoring the lines the undone move touched.
+    """
+
+    DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+    def __init__(self, board, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.tables = get_pattern_tables()
+        self.lines = []
+        # cell_lines[r][c] holds the ids of the four lines through the cell.
+        self.cell_lines = [[[] for _ in range(cols)] for _ in range(rows)]
+        self._build_lines()
+
+        self.line_scores = [(0, 0)] * len(self.lines)
+        self.shape_totals = {1: 0, 2: 0}
+        self.center_totals = {1: 0, 2: 0}
+        self.dirty = set()
+        # (line_id, previous scores) of lines re-scored while a checkpoint is open,
+        # and per open checkpoint the journal length and totals.
+        self._journal = []
+        self._checkpoints = []
+
+        for r in range(rows):
+            for c in range(cols):
+                if board[r][c] != 0:
+                    self.center_totals[board[r][c]] += self._center_score(r, c)
+        for line_id in range(len(self.lines)):
+            self._rescore_line(board, line_id)
+
+    def stone_added(self, r, c, color):
+        self.center_totals[color] += self._center_score(r, c)
+        self.dirty.update(self.cell_lines[r][c])
+
+    def stone_removed(self, r, c, color):
+        self.center_totals[color] -= self._center_score(r, c)
+        self.dirty.update(self.cell_lines[r][c])
+
+    def checkpoint(self, board):
+        """Scores the pending lines of board and remembers the scores for the next rollback()."""
+        self._flush(board)
+        self._checkpoints.append((
+            len(self._journal), self.shape_totals[1], self.shape_totals[2],
+            self.center_totals[1], self.center_totals[2],
+        ))
+
+    def rollback(self):
+        """Returns to the scores of the last checkpoint(); the board must be back in that position."""
+        start, white, black, white_center, black_center = self._checkpoints.pop()
+        journal = self._journal
+        line_scores = self.line_scores
+        while len(journal) > start:
+            line_id, scores = journal.pop()
+            line_scores[line_id] = scores
+        self.shape_totals[1] = white
+        self.shape_totals[2] = black
+        self.center_totals[1] = white_center
+        self.center_totals[2] = black_center
+        self.dirty.clear()
+
+    def shape_score(self, board, color):
+        """Equivalent of PenteHeuristics._scan_board for the current position."""
+        self._flush(board)
+        return self.center_totals[color] + self.shape_totals[color]
+
+    def evaluate(self, state, player_color):
+        if state.game_over:
+            if state.winner == player_color:
+                return PenteHeuristics.SCORE_WIN * 10
+            elif state.winner is not None:
+                return -PenteHeuristics.SCORE_WIN * 10
+            return 0
+
+        score = 0
+        opponent = 3 - player_color
+
+        score += state.captures[player_color] * PenteHeuristics.SCORE_CAPTURE_EXISTING
+        score -= state.captures[opponent] * (
+            PenteHeuristics.SCORE_CAPTURE_EXISTING * 1.2
+        )
+
+        my_shapes = self.shape_score(state.board, player_color)
+        opp_shapes = self.shape_score(state.board, opponent)
+
+        score += my_shapes
+        score -= opp_shapes * 1.1
+        return score
+
+    def _flush(self, board):
+        if self.dirty:
+            for line_id in self.dirty:
+                self._rescore_line(board, line_id)
+            self.dirty.clear()
+
+    def _rescore_line(self, board, line_id):
+        values = [board[r][c] for r, c in self.lines[line_id]]
+        new_white, new_black = self.tables.score_line(values)
+        old = self.line_scores[line_id]
+        if self._checkpoints:
+            self._journal.append((line_id, old))
+        self.shape_totals[1] += new_white - old[0]
+        self.shape_totals[2] += new_black - old[1]
+        self.line_scores[line_id] = (new_white, new_black)
+
+    def _center_score(self, r, c):
+        dist = abs(r - self.rows // 2) + abs(c - self.cols // 2)
+        return max(0, (20 - dist) * PenteHeuristics.SCORE_CENTER_CONTROL)
+
+    def _build_lines(self):
+        rows, cols = self.rows, self.cols
+        for dr, dc in self.DIRECTIONS:
+            for r in range(rows):
+                for c in range(cols):
+                    # A line starts at the first cell whose predecessor is off the board.
+                    pr, pc = r - dr, c - dc
+                    if 0 <= pr < rows and 0 <= pc < cols:
+                        continue
+                    line = []
+                    tr, tc = r, c
+                    while 0 <= tr < rows and 0 <= tc < cols:
+                        line.append((tr, tc))
+                        tr += dr
+                        tc += dc
+                    line_id = len(self.lines)
+                    self.lines.append(line)
+                    for lr, lc in line:
+                        self.cell_lines[lr][lc].append(line_id)
@@ -0,0 +1,180 @@
+import multiprocessing
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor
+from types import SimpleNamespace
+
+from parallel_search import _ai_settings, _get_worker_ai, _shutdown_pool, _wait_or_stop
+from performance_tracker import PerformanceTracker
+from shared_tt import SharedTranspositionTable
+
+
+class LazySMPSearch:
+    """
+    Lazy SMP: every worker runs the normal iterative deepening search on the
+    whole position, and all of them share one SharedTranspositionTable.
+
+    Odd-numbered workers aim one ply deeper than the rest, so the workers
+    drift apart and fill the table with entries the others can cut off on.
+    The search ends as soon as one worker finishes, or when the parent's
+    stop_flag is set: the rest are stopped through a shared flag and the move
+    of the deepest completed iteration is played (ties go to the lowest
+    worker index).
+    """
+
+    def __init__(self, workers, tt_size_mb):
+        self.workers = workers
+        self.tt_size_mb = tt_size_mb
+        self.table = None
+        # Search count, sent to the workers to age the shared table.
+        self.generation = 0
+        self.last_stats = None
+        self._pool = None
+        # Worker tasks of the latest search, cancelled on close() if still queued.
+        self._futures = []
+        self._stop = None
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            self.table = SharedTranspositionTable(self.tt_size_mb)
+            self._stop = multiprocessing.Value("b", 0)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.table.name, self._stop),
+            )
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            _shutdown_pool(self._pool, self._futures)
+            self._pool = None
+            self._futures = []
+        if self.table is not None:
+            self.table.close()
+            self.table = None
+
+    def search(self, ai, state, root_moves, max_depth, tracker, time_limit_ms=None, max_nodes=None):
+        """Returns the best move; nodes, TT and per-worker stats are recorded on tracker."""
+        pool = self._ensure_pool()
+        deadline = time.time() + time_limit_ms / 1000 if time_limit_ms is not None else None
+        position = (state.board, state.captures, state.turn)
+        # Workers use the shared table instead of building their own.
+        settings = dict(_ai_settings(ai), tt_size_mb=0)
+        node_share = max(1, max_nodes // self.workers) if max_nodes is not None else None
+
+        start = time.perf_counter()
+        self._stop.value = 0
+        self.generation += 1
+        futures = [
+            pool.submit(
+                _search_worker, settings, position, max_depth + worker % 2, worker, deadline, node_share,
+                self.generation,
+            )
+            for worker in range(self.workers)
+        ]
+        self._futures = futures
+        _wait_or_stop(futures, ai.stop_flag, self._stop, return_when=FIRST_COMPLETED)
+        self._stop.value = 1
+        results = sorted((future.result() for future in futures), key=lambda result: result["worker"])
+        elapsed = time.perf_counter() - start
+
+        best = min(results, key=lambda result: (-result["depth"], result["worker"]))
+        best_move = best["move"] if best["move"] is not None else root_moves[0]
+
+        totals = {"hits": 0, "misses": 0, "collisions": 0, "stores": 0}
+        for result in results:
+            for name in totals:
+                totals[name] += result["tt"][name]
+        tracker.add_nodes(sum(result["nodes"] for result in results))
+        tracker.record_depth(best["depth"])
+        tracker.record_tt_stats(totals)
+        worker_stats = [
+            {
+                "worker": result["worker"],
+                "depth": result["depth"],
+                "nodes": result["nodes"],
+                "hits": result["tt"]["hits"],
+                "misses": result["tt"]["misses"],
+                "elapsed": result["elapsed"],
+            }
+            for result in results
+        ]
+        tracker.record_worker_stats(worker_stats)
+        self.last_stats = {
+            "fill": self.table.fill_ratio(),
+            "elapsed": elapsed,
+            "nodes": sum(result["nodes"] for result in results),
+            "workers": worker_stats,
+        }
+        return best_move
+
+    def stats(self):
+        """Stats of the last search: table fill, per-worker hit rates and nodes per second."""
+        if self.last_stats is None:
+            return None
+        stats = dict(self.last_stats)
+        elapsed = stats["elapsed"]
+        stats["nodes_per_sec"] = stats["nodes"] / elapsed if elapsed > 0 else 0.0
+        stats["workers"] = [
+            dict(worker, hit_rate=_hit_rate(worker),
+                 nodes_per_sec=worker["nodes"] / worker["elapsed"] if worker["elapsed"] > 0 else 0.0)
+            for worker in stats["workers"]
+        ]
+        return stats
+
+    def format_stats(self):
+        stats = self.stats()
+        if stats is None:
+            return "Lazy SMP: no search yet"
+        lines = [
+            f"Lazy SMP | Workers: {len(stats['workers'])} | TT fill: {stats['fill'] * 100:.1f}%"
+            f" | Nodes: {stats['nodes']} | Nodes/s: {stats['nodes_per_sec']:.0f}"
+        ]
+        for worker in stats["workers"]:
+            lines.append(
+                f"  Worker {worker['worker']}: Depth {worker['depth']} | Nodes: {worker['nodes']}"
+                f" | TT hit rate: {worker['hit_rate'] * 100:.1f}% | Nodes/s: {worker['nodes_per_sec']:.0f}"
+            )
+        return "\n".join(lines)
+
+
+def _hit_rate(worker):
+    probes = worker["hits"] + worker["misses"]
+    return worker["hits"] / probes if probes else 0.0
+
+
+_WORKER_TABLE = None
+_WORKER_STOP = None
+
+
+def _init_worker(table_name, stop_flag):
+    global _WORKER_TABLE, _WORKER_STOP
+    _WORKER_TABLE = SharedTranspositionTable(name=table_name)
+    _WORKER_STOP = stop_flag
+
+
+def _search_worker(settings, position, depth, worker, deadline, max_nodes, generation):
+    """Worker task: iterative deepening to depth on the shared table; returns a result dict."""
+    ai = _get_worker_ai(settings)
+    _WORKER_TABLE.generation = generation
+    ai.tt = _WORKER_TABLE
+    ai.stop_flag = _WORKER_STOP
+    # The parent already ran the threat search on this position.
+    ai.threat_search = None
+    board, captures, turn = position
+    game = SimpleNamespace(board=board, captures=captures, turn=turn)
+    tracker = PerformanceTracker()
+
+    time_limit_ms = None
+    if deadline is not None:
+        time_limit_ms = max(0.0, (deadline - time.time()) * 1000)
+    start = time.perf_counter()
+    move = ai.get_best_move(game, tracker, time_limit_ms=time_limit_ms, max_nodes=max_nodes, max_depth=depth)
+    return {
+        "worker": worker,
+        "move": move,
+        "depth": tracker.depth_reached,
+        "nodes": tracker.nodes_explored,
+        "tt": _WORKER_TABLE.stats(),
+        "elapsed": time.perf_counter() - start,
+    }
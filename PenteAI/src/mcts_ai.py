@@ -0,0 +1,244 @@
+import math
+import random
+import time
+
+from move_ordering import MoveOrdering
+from performance_tracker import PerformanceTracker
+from search_state import SearchState
+from threat_search import tactical_moves
+
+
+class _Node:
+    """A position in the search tree, reached from parent by move."""
+
+    __slots__ = ("move", "parent", "key", "children", "untried", "visits", "value")
+
+    def __init__(self, move, parent, key):
+        self.move = move
+        self.parent = parent
+        # Zobrist hash of the position, used to find the node again on the next move.
+        self.key = key
+        self.children = []
+        # Moves not expanded yet, best-ordered last; None until the node is first expanded.
+        self.untried = None
+        self.visits = 0
+        # Summed playout results for the player who played move.
+        self.value = 0.0
+
+
+class MCTSAI:
+    """
+    Monte Carlo tree search (UCT) engine with the same interface as PenteAI.
+
+    Every iteration walks down the tree by UCB1, expands one child, and plays
+    the position out on a make/unmake SearchState. Playouts only use the cells
+    next to a stone (the radius-1 candidate set _get_relevant_moves also
+    draws from), always take an immediate win or block, prefer captures and
+    threatening moves, and stop after MCTS_PLAYOUT_DEPTH plies, when the
+    static evaluation is turned into a result. Nodes only expand the
+    MCTS_MAX_CHILDREN best-ordered moves. The tree is kept after a move, and
+    the subtree of the position actually reached is reused on the next one.
+
+    depth plays the role of a strength level: the playout budget is
+    MCTS_PLAYOUTS per level.
+    """
+
+    # Evaluation difference that maps a cut-off playout to about a 76% result.
+    EVAL_SCALE = 20_000
+    # Moves drawn per quiet playout step; the most threatening one is played.
+    PLAYOUT_SAMPLES = 3
+
+    def __init__(self, config, ai_color, depth=2, playouts=None, time_limit_ms=None, seed=None):
+        self.config = config
+        self.color = ai_color
+        self.depth = depth
+        self.playouts = playouts if playouts is not None else config.MCTS_PLAYOUTS * depth
+        self.exploration = config.MCTS_EXPLORATION
+        self.playout_depth = config.MCTS_PLAYOUT_DEPTH
+        self.max_children = config.MCTS_MAX_CHILDREN
+        self.rng = random.Random(seed)
+        self.ordering = MoveOrdering(config.ROWS, config.COLS)
+        self.principal_variation = []
+        # Searches run in-process; the attribute lets callers treat both engines alike.
+        self.workers = 1
+        self.stop_flag = None
+        self.root = None
+
+    def close(self):
+        self.root = None
+
+    def cache_sizes(self):
+        """Retained bytes of the reusable tree and the move ordering tables."""
+        return {
+            "tree": PerformanceTracker.retained_bytes(self.root) if self.root is not None else 0,
+            "history": PerformanceTracker.retained_bytes(self.ordering),
+        }
+
+    def get_best_move(self, game, tracker: PerformanceTracker, time_limit_ms=None, max_nodes=None, max_depth=None):
+        """
+        Runs playouts until the playout budget (max_nodes if given), time_limit_ms
+        or the stop flag runs out and plays the most visited root move. With
+        tracker.telemetry on, playouts and move generation are timed into the tracker.
+        """
+        if not tracker.telemetry:
+            return self._get_best_move(game, tracker, time_limit_ms, max_nodes)
+        undo = tracker.instrument([(self, "_playout", "playout"), (self, "_expansion_moves", "movegen")])
+        try:
+            return self._get_best_move(game, tracker, time_limit_ms, max_nodes)
+        finally:
+            undo()
+
+    def _get_best_move(self, game, tracker, time_limit_ms, max_nodes):
+        state = SearchState(game.board, game.captures, game.turn, self.config)
+        if state.stone_count == 0:
+            return (state.rows // 2, state.cols // 2)
+        wins, _, _ = tactical_moves(state)
+        if wins:
+            return wins[0]
+
+        root = self._reuse_root(state.hash)
+        tracker.record_mcts_reuse(root.visits)
+        budget = max_nodes if max_nodes is not None else self.playouts
+        deadline = None
+        if time_limit_ms is not None:
+            deadline = time.perf_counter() + time_limit_ms / 1000.0
+
+        playouts = 0
+        max_ply = 0
+        while playouts < budget:
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+            if self.stop_flag is not None and self.stop_flag.value:
+                break
+            max_ply = max(max_ply, self._iterate(root, state))
+            playouts += 1
+            tracker.increment_node()
+
+        tracker.record_depth(max_ply)
+        if not root.children:
+            moves = self._expansion_moves(state)
+            return moves[-1] if moves else None
+        best = max(root.children, key=lambda child: child.visits)
+        self.principal_variation = self._principal_variation(root)
+        return best.move
+
+    def _iterate(self, root, state):
+        """One selection, expansion, playout and backup; returns the tree depth reached."""
+        node = root
+        path = [(root, 0)]
+        while node.untried is not None and not node.untried and node.children and not state.game_over:
+            node = self._select(node)
+            mover = state.turn
+            state.make_move(*node.move)
+            path.append((node, mover))
+
+        if not state.game_over:
+            if node.untried is None:
+                node.untried = self._expansion_moves(state)
+            if node.untried:
+                move = node.untried.pop()
+                mover = state.turn
+                state.make_move(*move)
+                child = _Node(move, node, state.hash)
+                node.children.append(child)
+                path.append((child, mover))
+
+        tree_ply = len(state.history)
+        result = self._playout(state)
+        while state.history:
+            state.unmake_move()
+
+        for node, mover in path:
+            node.visits += 1
+            node.value += result if mover == 1 else 1.0 - result
+        return tree_ply
+
+    def _select(self, node):
+        log_visits = math.log(node.visits)
+        exploration = self.exploration
+        best = None
+        best_score = -1.0
+        for child in node.children:
+            score = child.value / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best_score = score
+                best = child
+        return best
+
+    def _expansion_moves(self, state):
+        """The best-ordered candidate moves of the position, the best one last."""
+        radius = self._candidate_radius(state.stone_count)
+        moves = self.ordering.order(state, sorted(state.candidate_moves(radius)), 0)
+        return moves[: self.max_children][::-1]
+
+    def _candidate_radius(self, stone_count):
+        """
+        PenteAI's rule without its depth term: radius 2 in the opening (under
+        5 stones), radius 1 after. PenteAI widens to radius 2 above depth 3
+        because deeper alpha-beta searches can afford the extra moves, but here
+        depth is a playout budget, not a search depth, and expansion keeps only
+        the MCTS_MAX_CHILDREN best-ordered moves anyway; radius 1 also matches
+        the cells the playouts draw from.
+        """
+        return 2 if stone_count < 5 else 1
+
+    def _playout(self, state):
+        """Plays on from the state; returns the result for player 1 (1 win, 0 loss)."""
+        rng = self.rng
+        for _ in range(self.playout_depth):
+            if state.game_over:
+                break
+            wins, blocks, captures = tactical_moves(state)
+            if wins:
+                move = wins[0]
+            elif blocks:
+                move = rng.choice(blocks)
+            elif captures and rng.random() < 0.5:
+                move = rng.choice(captures)
+            else:
+                move = self._sample_move(state)
+            state.make_move(*move)
+
+        if state.game_over:
+            return 1.0 if state.winner == 1 else 0.0
+        score = state.evaluator.evaluate(state, 1)
+        return 0.5 + 0.5 * math.tanh(score / self.EVAL_SCALE)
+
+    def _sample_move(self, state):
+        candidates = state.candidate_moves(1)
+        board = state.board
+        me = state.turn
+        threat_score = self.ordering.threat_score
+        best = None
+        best_score = -1
+        for _ in range(self.PLAYOUT_SAMPLES):
+            r, c = self.rng.choice(candidates)
+            score = threat_score(board, r, c, me)
+            if score > best_score:
+                best_score = score
+                best = (r, c)
+        return best
+
+    def _reuse_root(self, key):
+        """The node of the current position from the previous tree (up to two plies down), or a fresh root."""
+        if self.root is not None:
+            frontier = [self.root]
+            for _ in range(3):
+                for node in frontier:
+                    if node.key == key:
+                        node.parent = None
+                        node.move = None
+                        self.root = node
+                        return node
+                frontier = [child for node in frontier for child in node.children]
+        self.root = _Node(None, None, key)
+        return self.root
+
+    @staticmethod
+    def _principal_variation(root):
+        pv = []
+        node = root
+        while node.children:
+            node = max(node.children, key=lambda child: child.visits)
+            pv.append(node.move)
+        return pv
@@ -2,11 +2,14 @@ import pygame
 
 
 class Menu:
+    ENGINE_LABELS = {"alphabeta": "Alpha-Beta", "mcts": "MCTS"}
+
     def __init__(self, config):
         self.config = config
         self.current_theme_name = "Kaya Wood"
         self.state = "MAIN"
         self.selected_difficulty = 2
+        self.selected_engine = config.AI_ENGINE
 
         self._init_resources()
         self._init_ui()
@@ -62,8 +65,11 @@ class Menu:
         self.btn_diff_up = pygame.Rect(0, 0, 40, 40)
         self.btn_diff_up.center = (cx + 100, base_y + 130)
 
+        self.btn_engine = pygame.Rect(0, 0, BTN_W, BTN_H)
+        self.btn_engine.center = (cx, base_y + 190)
+
         self.btn_back = pygame.Rect(0, 0, BTN_W, BTN_H)
-        self.btn_back.center = (cx, base_y + 190)
+        self.btn_back.center = (cx, base_y + 250)
 
     def handle_event(self, event):
         if event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
@@ -91,6 +97,11 @@ class Menu:
                     if self.selected_difficulty < 4:
                         self.selected_difficulty += 1
 
+                elif self.btn_engine.collidepoint(event.pos):
+                    engines = list(self.ENGINE_LABELS)
+                    index = engines.index(self.selected_engine)
+                    self.selected_engine = engines[(index + 1) % len(engines)]
+
                 elif self.btn_back.collidepoint(event.pos):
                     self.state = "MAIN"
                     return None
@@ -177,12 +188,21 @@ class Menu:
             self._draw_button(screen, self.btn_diff_down, "-", WOOD_LIGHT, WOOD_TEXT)
             self._draw_button(screen, self.btn_diff_up, "+", WOOD_LIGHT, WOOD_TEXT)
 
+            # MCTS uses the setting as a playout-budget level rather than a depth.
+            level_name = "Depth" if self.selected_engine == "alphabeta" else "Level"
             self._draw_text_centered(
                 screen,
-                f"Depth: {self.selected_difficulty}",
+                f"{level_name}: {self.selected_difficulty}",
                 self.font_btn,
                 (self.config.WIDTH // 2, self.btn_diff_down.centery),
             )
+            self._draw_button(
+                screen,
+                self.btn_engine,
+                f"Engine: {self.ENGINE_LABELS[self.selected_engine]}",
+                (222, 184, 135),
+                WOOD_TEXT,
+            )
             self._draw_button(
                 screen, self.btn_back, "Back", (160, 82, 45), (255, 230, 200)
             )
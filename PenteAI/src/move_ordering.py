@@ -0,0 +1,105 @@
+class MoveOrdering:
+    """
+    Move ordering for the alpha-beta search: transposition/PV move first, then
+    a cheap static threat score, then killer moves for the ply, then the
+    history heuristic.
+    """
+
+    DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+    SCORE_HASH_MOVE = 10_000_000
+    SCORE_MAKE_FIVE = 5_000_000
+    SCORE_BLOCK_FIVE = 2_000_000
+    SCORE_MAKE_FOUR = 1_000_000
+    SCORE_CAPTURE = 800_000
+    SCORE_BLOCK_FOUR = 500_000
+    SCORE_KILLER = 100_000
+
+    KILLER_SLOTS = 2
+
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.history = [[0] * cols for _ in range(rows)]
+        self.killers = []
+
+    def new_search(self, max_ply):
+        """Clears the killers and ages the history table at the start of a search."""
+        self.killers = [[None] * self.KILLER_SLOTS for _ in range(max_ply + 1)]
+        for row in self.history:
+            for c in range(self.cols):
+                row[c] >>= 1
+
+    def ensure_ply(self, ply):
+        while len(self.killers) <= ply:
+            self.killers.append([None] * self.KILLER_SLOTS)
+
+    def order(self, state, moves, ply, hash_move=None):
+        board = state.board
+        me = state.turn
+        killers = self.killers[ply] if ply < len(self.killers) else ()
+        history = self.history
+        scored = []
+        for move in moves:
+            r, c = move
+            if move == hash_move:
+                score = self.SCORE_HASH_MOVE
+            else:
+                score = self.threat_score(board, r, c, me)
+                if move in killers:
+                    score += self.SCORE_KILLER
+                score += history[r][c]
+            scored.append((score, move))
+        scored.sort(key=lambda item: item[0], reverse=True)
+        return [move for _, move in scored]
+
+    def record_cutoff(self, move, ply, depth):
+        """Updates the killer slots and history table after a beta cutoff."""
+        r, c = move
+        self.history[r][c] += depth * depth
+        self.ensure_ply(ply)
+        slots = self.killers[ply]
+        if slots[0] != move:
+            slots[1] = slots[0]
+            slots[0] = move
+
+    def threat_score(self, board, r, c, me):
+        """Static score of playing me at (r, c): fives/fours made or blocked and captures."""
+        rows, cols = self.rows, self.cols
+        opp = 3 - me
+        score = 0
+        for dr, dc in self.DIRECTIONS:
+            own = 1
+            theirs = 0
+            for sign in (1, -1):
+                sr, sc = dr * sign, dc * sign
+                tr, tc = r + sr, c + sc
+                while 0 <= tr < rows and 0 <= tc < cols and board[tr][tc] == me:
+                    own += 1
+                    tr += sr
+                    tc += sc
+                tr, tc = r + sr, c + sc
+                while 0 <= tr < rows and 0 <= tc < cols and board[tr][tc] == opp:
+                    theirs += 1
+                    tr += sr
+                    tc += sc
+
+                r3, c3 = r + 3 * sr, c + 3 * sc
+                if (
+                    0 <= r3 < rows
+                    and 0 <= c3 < cols
+                    and board[r + sr][c + sc] == opp
+                    and board[r + 2 * sr][c + 2 * sc] == opp
+                    and board[r3][c3] == me
+                ):
+                    score += self.SCORE_CAPTURE
+
+            if own >= 5:
+                score += self.SCORE_MAKE_FIVE
+            elif own == 4:
+                score += self.SCORE_MAKE_FOUR
+            if theirs >= 4:
+                score += self.SCORE_BLOCK_FIVE
+            elif theirs == 3:
+                score += self.SCORE_BLOCK_FOUR
+        return score
@@ -0,0 +1,111 @@
+import numpy as np
+from numpy.lib.stride_tricks import as_strided
+
+from heuristics import PenteHeuristics
+from pattern_tables import PatternTables, get_pattern_tables
+
+
+class NumpyHeuristics:
+    """
+    Vectorized whole-board version of PenteHeuristics.evaluate.
+
+    Boards are loaded into int8 arrays padded with off-board cells. For each of
+    the four directions a strided view exposes the 8-cell window (cell before,
+    6-cell run window, cell after) of every board cell without copying, the
+    windows are folded into PatternTables codes and scored with one fancy-index
+    per colour. A stack of boards shaped (N, rows, cols) is scored in one call.
+    """
+
+    DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+    # Windows reach one cell behind and six cells ahead of the run start.
+    PAD = 6
+
+    def __init__(self, rows, cols, tables=None):
+        self.rows = rows
+        self.cols = cols
+        tables = tables or get_pattern_tables()
+        self.white_table = np.frombuffer(tables.white, dtype=np.int64)
+        self.black_table = np.frombuffer(tables.black, dtype=np.int64)
+
+        r = np.arange(rows)[:, None]
+        c = np.arange(cols)[None, :]
+        dist = np.abs(r - rows // 2) + np.abs(c - cols // 2)
+        self.center_weights = np.maximum(0, (20 - dist) * PenteHeuristics.SCORE_CENTER_CONTROL).astype(np.int64)
+
+    def evaluate(self, board_clone, player_color):
+        """Drop-in replacement for PenteHeuristics.evaluate on a single position."""
+        winner = board_clone.winner if board_clone.game_over else 0
+        captures = np.array([[board_clone.captures[1], board_clone.captures[2]]], dtype=np.int64)
+        winners = np.array([winner if winner is not None else 0])
+        scores = self.evaluate_batch(
+            np.asarray(board_clone.board, dtype=np.int8)[None], player_color, captures, winners
+        )
+        if board_clone.game_over:
+            return int(scores[0])
+        return float(scores[0])
+
+    def evaluate_batch(self, boards, player_color, captures=None, winners=None):
+        """
+        Scores N positions from player_color's point of view.
+
+        boards: (N, rows, cols) array of 0/1/2. captures: (N, 2) stones captured
+        by white and black (zeros if omitted). winners: (N,) winner per board,
+        0 while the game is still running (all running if omitted).
+        """
+        boards = np.asarray(boards, dtype=np.int8)
+        if boards.ndim == 2:
+            boards = boards[None]
+        n = boards.shape[0]
+        if captures is None:
+            captures = np.zeros((n, 2), dtype=np.int64)
+        captures = np.asarray(captures, dtype=np.int64)
+
+        shapes = self.shape_scores(boards)
+        opponent = 3 - player_color
+        my_caps = captures[:, player_color - 1]
+        opp_caps = captures[:, opponent - 1]
+
+        # Same operation order as PenteHeuristics.evaluate, so the floats match exactly.
+        score = (my_caps * PenteHeuristics.SCORE_CAPTURE_EXISTING).astype(np.float64)
+        score -= opp_caps * (PenteHeuristics.SCORE_CAPTURE_EXISTING * 1.2)
+        score += shapes[player_color]
+        score -= shapes[opponent] * 1.1
+
+        if winners is not None:
+            winners = np.asarray(winners)
+            score = np.where(winners == player_color, PenteHeuristics.SCORE_WIN * 10, score)
+            score = np.where(
+                (winners != 0) & (winners != player_color), -PenteHeuristics.SCORE_WIN * 10, score
+            )
+        return score
+
+    def shape_scores(self, boards):
+        """Per-colour PenteHeuristics._scan_board totals, as {1: (N,), 2: (N,)} int64 arrays."""
+        n = boards.shape[0]
+        pad = self.PAD
+        padded = np.full(
+            (n, self.rows + 2 * pad, self.cols + 2 * pad), PatternTables.OFF_BOARD, dtype=np.int8
+        )
+        padded[:, pad : pad + self.rows, pad : pad + self.cols] = boards
+        s_n, s_r, s_c = padded.strides
+
+        white = (self.center_weights * (boards == 1)).sum(axis=(1, 2))
+        black = (self.center_weights * (boards == 2)).sum(axis=(1, 2))
+
+        for dr, dc in self.DIRECTIONS:
+            # windows[b, r, c, k] is the cell (k - 1) steps from (r, c) along the direction.
+            origin = padded[:, pad - dr :, pad - dc :]
+            windows = as_strided(
+                origin,
+                shape=(n, self.rows, self.cols, PatternTables.WINDOW),
+                strides=(s_n, s_r, s_c, dr * s_r + dc * s_c),
+                writeable=False,
+            )
+            codes = np.zeros((n, self.rows, self.cols), dtype=np.int32)
+            for k in range(PatternTables.WINDOW):
+                codes <<= 2
+                codes |= windows[..., k]
+            # Table entries are zero unless the window's start cell begins a run of that colour.
+            white += self.white_table[codes].sum(axis=(1, 2))
+            black += self.black_table[codes].sum(axis=(1, 2))
+        return {1: white, 2: black}
@@ -0,0 +1,103 @@
+import mmap
+import os
+import struct
+
+from pattern_tables import default_cache_dir
+from zobrist import SYMMETRY_INVERSE, get_zobrist_keys, transform_cell
+
+
+class OpeningBook:
+    """
+    Read-only opening book stored as a header followed by fixed-width records
+    sorted by canonical position hash.
+
+    The file is memory-mapped, so opening it costs nothing and its pages are
+    shared by every process using the same book; a lookup is a binary search
+    over the records. Positions are keyed by ZobristKeys.canonical_hash and
+    moves are stored in the canonical orientation, so one record serves all
+    rotations and reflections of a position.
+    """
+
+    MAGIC = b"PBK1"
+    HEADER = struct.Struct("<4sIHH")  # magic, record count, rows, cols
+    RECORD = struct.Struct("<QBBHH")  # canonical hash, row, col, weight, search depth
+
+    def __init__(self, path, rows, cols):
+        self.path = path
+        self.rows = rows
+        self.cols = cols
+        self.zobrist = get_zobrist_keys(rows, cols)
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, count, book_rows, book_cols = self.HEADER.unpack_from(self._map, 0)
+            if magic != self.MAGIC:
+                raise ValueError("not an opening book file")
+            if (book_rows, book_cols) != (rows, cols):
+                raise ValueError(f"book is for a {book_rows}x{book_cols} board")
+            if len(self._map) != self.HEADER.size + count * self.RECORD.size:
+                raise ValueError("truncated file")
+        except (ValueError, struct.error):
+            self._file.close()
+            raise
+        self.count = count
+
+    @classmethod
+    def open(cls, path, rows, cols):
+        """Opens the book at path; None if there is no book there or it cannot be read."""
+        if not os.path.exists(path):
+            return None
+        try:
+            return cls(path, rows, cols)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Warning: Could not open opening book {path}: {e}")
+            return None
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+    def lookup(self, board, captures, turn):
+        """Book move for the position, in the board's own orientation, or None."""
+        key, symmetry = self.zobrist.canonical_hash(board, captures, turn)
+        entry = self.probe(key)
+        if entry is None:
+            return None
+        row, col = transform_cell(SYMMETRY_INVERSE[symmetry], entry[0], entry[1], self.rows, self.cols)
+        if board[row][col] != 0:
+            # A hash collision with a different position.
+            return None
+        return row, col
+
+    def probe(self, key):
+        """(row, col, weight, depth) stored for a canonical hash, or None."""
+        record = self.RECORD
+        data = self._map
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset = self.HEADER.size + mid * record.size
+            mid_key = struct.unpack_from("<Q", data, offset)[0]
+            if mid_key < key:
+                lo = mid + 1
+            elif mid_key > key:
+                hi = mid
+            else:
+                return record.unpack_from(data, offset)[1:]
+        return None
+
+    @classmethod
+    def write(cls, path, entries, rows, cols):
+        """Writes entries {canonical hash: (row, col, weight, depth)} as a sorted book file."""
+        tmp_path = path + ".tmp"
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            f.write(cls.HEADER.pack(cls.MAGIC, len(entries), rows, cols))
+            for key in sorted(entries):
+                row, col, weight, depth = entries[key]
+                f.write(cls.RECORD.pack(key, row, col, min(weight, 0xFFFF), depth))
+        os.replace(tmp_path, path)
+
+
+def default_book_path():
+    return os.path.join(default_cache_dir(), "opening_book.bin")
@@ -0,0 +1,272 @@
+import math
+import multiprocessing
+import time
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ProcessPoolExecutor, wait
+from types import SimpleNamespace
+
+from heuristics import PenteHeuristics
+from pente_ai import PenteAI, SearchTimeout
+from performance_tracker import PerformanceTracker
+
+# How often (seconds) a parallel search checks the parent's stop flag while its workers run.
+STOP_POLL_SECONDS = 0.02
+
+
+class RootParallelSearch:
+    """
+    Root-split parallel search over a persistent process pool.
+
+    Each iteration of the iterative deepening loop submits one task per root
+    move, in ordering order, so idle workers always pick up the next most
+    promising move. Workers share the best root score found so far through a
+    multiprocessing.Value and use it as their alpha bound. Results are merged
+    deterministically: the highest exactly-searched score wins, ties go to the
+    earlier move in the ordering, and any fail-low result that ties with it
+    from an earlier move is re-searched with a full window. Setting the
+    parent's stop_flag stops the running tasks through a shared flag.
+    """
+
+    def __init__(self, workers):
+        self.workers = workers
+        self._pool = None
+        # Tasks of the latest iteration, cancelled on close() if still queued.
+        self._futures = []
+        self._shared_alpha = None
+        self._stop = None
+
+    def _ensure_pool(self):
+        if self._pool is None:
+            self._shared_alpha = multiprocessing.Value("d", -math.inf)
+            self._stop = multiprocessing.Value("b", 0)
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self._shared_alpha, self._stop),
+            )
+        return self._pool
+
+    def close(self):
+        if self._pool is not None:
+            _shutdown_pool(self._pool, self._futures)
+            self._pool = None
+            self._futures = []
+
+    def search(self, ai, state, root_moves, max_depth, tracker, time_limit_ms=None, max_nodes=None):
+        """Returns the best root move; nodes from every worker are added to tracker."""
+        pool = self._ensure_pool()
+        deadline = time.time() + time_limit_ms / 1000 if time_limit_ms is not None else None
+        position = (state.hash, state.board, state.captures, state.turn)
+        settings = _ai_settings(ai)
+
+        best_move = root_moves[0]
+        depth_reached = 0
+        nodes_used = 0
+        self._stop.value = 0
+
+        for depth in range(1, max_depth + 1):
+            node_share = None
+            if max_nodes is not None:
+                # The node budget is global: split what is left evenly across the root moves.
+                remaining = max_nodes - nodes_used
+                if remaining <= 0:
+                    break
+                node_share = max(1, remaining // len(root_moves))
+
+            self._shared_alpha.value = -math.inf
+            futures = [
+                pool.submit(_search_move, settings, position, depth, index, move, deadline, node_share)
+                for index, move in enumerate(root_moves)
+            ]
+            self._futures = futures
+            stopped = _wait_or_stop(futures, ai.stop_flag, self._stop)
+            results = [future.result() for future in futures]
+            iteration_nodes = sum(result[4] for result in results)
+            nodes_used += iteration_nodes
+            tracker.add_nodes(iteration_nodes)
+            if stopped:
+                # The caller gave up on this search; whatever it returns is discarded.
+                break
+
+            completed = [result for result in results if not result[5]]
+            if len(completed) < len(results):
+                # Budget ran out mid-iteration: keep the last completed iteration,
+                # or the best finished move if not even depth 1 completed.
+                if depth_reached == 0 and completed:
+                    best_move = self._merge(ai, state, completed, depth, tracker)[0]
+                break
+
+            best_move, best_score = self._merge(ai, state, results, depth, tracker)
+            depth_reached = depth
+            # Next iteration searches the best moves first.
+            by_score = sorted(results, key=lambda result: (-result[2], result[0]))
+            root_moves = [best_move] + [result[1] for result in by_score if result[1] != best_move]
+            if abs(best_score) >= PenteHeuristics.SCORE_WIN * 10:
+                break
+
+        tracker.record_depth(depth_reached)
+        return best_move
+
+    def _merge(self, ai, state, results, depth, tracker):
+        exact = [result for result in results if result[3]]
+        if not exact:
+            # Every move failed low against a bound that no longer exists (a
+            # timed-out worker's): fall back to the highest bound.
+            exact = results
+        best_index, best_move, best_score = min(
+            ((result[0], result[1], result[2]) for result in exact),
+            key=lambda item: (-item[2], item[0]),
+        )
+        for index, move, score, is_exact, _, _ in sorted(results):
+            if index >= best_index:
+                break
+            if not is_exact and score >= best_score:
+                # An earlier move tied with the best under a bound; settle it exactly.
+                ai._start_budget(None, None)
+                ai._pv_table = [[] for _ in range(depth + 1)]
+                state.make_move(*move)
+                exact_score = ai._minimax(state, depth - 1, 1, -math.inf, math.inf, False, tracker)
+                state.unmake_move()
+                if exact_score >= best_score:
+                    best_index, best_move, best_score = index, move, exact_score
+                    break
+        return best_move, best_score
+
+
+def _shutdown_pool(pool, futures):
+    """pool.shutdown() after cancelling the futures still queued (shutdown's cancel_futures needs Python 3.9)."""
+    for future in futures:
+        future.cancel()
+    pool.shutdown()
+
+
+def _wait_or_stop(futures, stop_flag, stop, return_when=ALL_COMPLETED):
+    """
+    wait() for futures that also sets the workers' shared stop Value as soon
+    as stop_flag (the parent search's) is set, so a cancelled search does not
+    run on in the pool. Returns True if the search was stopped that way.
+    """
+    if stop_flag is None:
+        wait(futures, return_when=return_when)
+        return False
+    while True:
+        done, pending = wait(futures, timeout=STOP_POLL_SECONDS, return_when=return_when)
+        if not pending or (done and return_when == FIRST_COMPLETED):
+            return False
+        if stop_flag.value:
+            stop.value = 1
+            return True
+
+
+def plain_config(config):
+    """The plain uppercase settings of a Config, safe to send to another process (the real one holds pygame sounds)."""
+    return {
+        name: value for name, value in vars(config).items()
+        if name.isupper() and isinstance(value, (int, float, str, type(None)))
+    }
+
+
+def _ai_settings(ai):
+    return {
+        "config": plain_config(ai.config),
+        "color": ai.color,
+        "depth": ai.depth,
+        "tt_size_mb": ai.tt_size_mb,
+        "incremental_eval": ai.incremental_eval,
+        "board_backend": ai.board_backend,
+        "symmetry": ai.symmetry,
+        "pvs": ai.pvs,
+        "lmr": ai.lmr,
+    }
+
+
+_WORKER_ALPHA = None
+_WORKER_STOP = None
+_WORKER_AIS = {}
+# The root position of the current search, reused by every task on that position.
+_WORKER_STATE = (None, None)
+
+
+def _init_worker(shared_alpha, stop_flag):
+    global _WORKER_ALPHA, _WORKER_STOP
+    _WORKER_ALPHA = shared_alpha
+    _WORKER_STOP = stop_flag
+
+
+def _get_worker_ai(settings):
+    # One PenteAI per configuration per worker, so its transposition table and
+    # history table persist across tasks and moves.
+    key = (
+        tuple(sorted(settings["config"].items())),
+        settings["color"],
+        settings["depth"],
+        settings["tt_size_mb"],
+        settings["incremental_eval"],
+        settings["board_backend"],
+        settings["symmetry"],
+        settings["pvs"],
+        settings["lmr"],
+    )
+    ai = _WORKER_AIS.get(key)
+    if ai is None:
+        ai = PenteAI(
+            SimpleNamespace(**settings["config"]),
+            settings["color"],
+            depth=settings["depth"],
+            tt_size_mb=settings["tt_size_mb"],
+            incremental_eval=settings["incremental_eval"],
+            board_backend=settings["board_backend"],
+            symmetry=settings["symmetry"],
+            pvs=settings["pvs"],
+            lmr=settings["lmr"],
+            workers=1,
+            use_book=False,
+        )
+        _WORKER_AIS[key] = ai
+    return ai
+
+
+def _search_move(settings, position, depth, index, move, deadline, max_nodes):
+    """Worker task: (index, move, score, exact, nodes, timed_out) for one root move at depth."""
+    global _WORKER_STATE
+    ai = _get_worker_ai(settings)
+    position_hash, board, captures, turn = position
+    state_key = (id(ai), position_hash)
+    if _WORKER_STATE[0] == state_key:
+        state = _WORKER_STATE[1]
+    else:
+        state = ai.new_state(board, captures, turn)
+        _WORKER_STATE = (state_key, state)
+        # A new root position starts a new search generation of the worker's table.
+        if ai.tt is not None:
+            ai.tt.new_search()
+    tracker = PerformanceTracker()
+    ai.stop_flag = _WORKER_STOP
+
+    time_limit_ms = None
+    if deadline is not None:
+        time_limit_ms = (deadline - time.time()) * 1000
+        if time_limit_ms <= 0:
+            return index, move, -math.inf, False, 0, True
+    if _WORKER_STOP.value:
+        return index, move, -math.inf, False, 0, True
+    ai._start_budget(time_limit_ms, max_nodes)
+    ai._pv_table = [[] for _ in range(depth + 1)]
+    ai.principal_variation = []
+    ai.ordering.ensure_ply(depth)
+
+    alpha = _WORKER_ALPHA.value
+    state.make_move(*move)
+    try:
+        score = ai._minimax(state, depth - 1, 1, alpha, math.inf, False, tracker)
+    except SearchTimeout:
+        while state.history:
+            state.unmake_move()
+        return index, move, -math.inf, False, tracker.nodes_explored, True
+    state.unmake_move()
+
+    exact = score > alpha
+    if exact:
+        with _WORKER_ALPHA.get_lock():
+            if score > _WORKER_ALPHA.value:
+                _WORKER_ALPHA.value = score
+    return index, move, score, exact, tracker.nodes_explored, False
@@ -0,0 +1,172 @@
+import hashlib
+import os
+from array import array
+
+from heuristics import PenteHeuristics
+
+
+class PatternTables:
+    """
+    Precomputed line-shape scores.
+
+    A run starting at cell i of a line is scored from the 8 cells i-1 .. i+6
+    (the cell before the run, the 6-cell window and the cell after it). Each
+    cell is one base-4 digit (0 empty, 1 white, 2 black, 3 off the board), so
+    a window is a 16-bit integer and its score for each colour is a single
+    table lookup. The tables are generated from the PenteHeuristics weights
+    and cached on disk, keyed by a fingerprint of those weights.
+    """
+
+    WINDOW = 8
+    OFF_BOARD = 3
+    SIZE = 4 ** WINDOW
+    MASK = SIZE - 1
+
+    def __init__(self, white, black):
+        self.tables = {1: white, 2: black}
+        self.white = white
+        self.black = black
+
+    @classmethod
+    def build(cls):
+        white = array("q", bytes(8 * cls.SIZE))
+        black = array("q", bytes(8 * cls.SIZE))
+        for code in range(cls.SIZE):
+            cells = [(code >> (2 * (cls.WINDOW - 1 - k))) & 3 for k in range(cls.WINDOW)]
+            # Off-board cells behave exactly like out-of-range cells in _evaluate_line.
+            values = [-1 if v == cls.OFF_BOARD else v for v in cells]
+            for color, table in ((1, white), (2, black)):
+                if cells[1] == color and cells[0] != color:
+                    table[code] = score_segment(values, 1, color)
+        return cls(white, black)
+
+    @classmethod
+    def load_or_build(cls, cache_dir):
+        path = os.path.join(cache_dir, f"pattern_tables_{weights_fingerprint()}.bin")
+        if os.path.exists(path):
+            try:
+                data = array("q")
+                with open(path, "rb") as f:
+                    data.fromfile(f, 2 * cls.SIZE)
+                return cls(data[: cls.SIZE], data[cls.SIZE :])
+            except (OSError, EOFError) as e:
+                print(f"Warning: Could not read pattern tables {path}: {e}")
+
+        tables = cls.build()
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                tables.white.tofile(f)
+                tables.black.tofile(f)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not cache pattern tables to {path}: {e}")
+        return tables
+
+    def score_line(self, values):
+        """Returns the (white, black) shape scores of one full line of board values."""
+        white, black = self.white, self.black
+        padded = [self.OFF_BOARD] + values + [self.OFF_BOARD] * (self.WINDOW - 1)
+        code = 0
+        for k in range(self.WINDOW):
+            code = (code << 2) | padded[k]
+        white_score = 0
+        black_score = 0
+        mask = self.MASK
+        for i in range(len(values)):
+            if padded[i + 1]:
+                white_score += white[code]
+                black_score += black[code]
+            code = ((code << 2) & mask) | padded[i + self.WINDOW]
+        return white_score, black_score
+
+
+def weights_fingerprint():
+    """Short hash of every SCORE_* weight, so re-tuned weights rebuild the tables."""
+    weights = sorted(
+        (name, value) for name, value in vars(PenteHeuristics).items() if name.startswith("SCORE_")
+    )
+    return hashlib.sha1(repr(weights).encode()).hexdigest()[:12]
+
+
+def default_cache_dir():
+    base_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    return os.path.join(base_path, "cache")
+
+
+_TABLES = None
+
+
+def get_pattern_tables():
+    """Returns the process-wide tables, loading them from (or building them into) the cache."""
+    global _TABLES
+    if _TABLES is None:
+        _TABLES = PatternTables.load_or_build(default_cache_dir())
+    return _TABLES
+
+
+def score_segment(values, start, color):
+    """One-dimensional port of PenteHeuristics._evaluate_line, used to generate the tables."""
+    n = len(values)
+    sequence = [values[start + i] if start + i < n else -1 for i in range(6)]
+
+    def is_open(i):
+        return 0 <= i < n and values[i] == 0
+
+    stone_count = 0
+    gap_index = -1
+
+    for i, val in enumerate(sequence):
+        if val == color:
+            stone_count += 1
+        elif val == 0:
+            if gap_index == -1:
+                gap_index = i
+            else:
+                break
+        else:
+            break
+
+    if stone_count >= 5:
+        return PenteHeuristics.SCORE_WIN
+
+    if stone_count == 4:
+        open_start = is_open(start - 1)
+
+        stones_seen = 0
+        last_stone_idx = -1
+        for i, val in enumerate(sequence):
+            if val == color:
+                stones_seen += 1
+                last_stone_idx = i
+            if stones_seen == 4:
+                break
+
+        open_end = is_open(start + last_stone_idx + 1)
+        if open_start or open_end:
+            return PenteHeuristics.SCORE_OPEN_FOUR
+        return PenteHeuristics.SCORE_CLOSED_FOUR
+
+    if stone_count == 3:
+        p = sequence[0:4]
+        is_split = (
+            p[0] == color and p[1] == 0 and p[2] == color and p[3] == color
+        ) or (p[0] == color and p[1] == color and p[2] == 0 and p[3] == color)
+
+        open_start = is_open(start - 1)
+        open_end = is_open(start + (4 if is_split else 3))
+        open_count = (1 if open_start else 0) + (1 if open_end else 0)
+
+        if is_split and open_count > 0:
+            return PenteHeuristics.SCORE_SPLIT_THREE
+        if open_count == 2:
+            return PenteHeuristics.SCORE_OPEN_THREE
+        if open_count == 1:
+            return PenteHeuristics.SCORE_CLOSED_THREE
+
+    if stone_count == 2:
+        if is_open(start - 1) and is_open(start + 2):
+            return PenteHeuristics.SCORE_OPEN_TWO
+
+    return 0
@@ -1,80 +1,617 @@
+import time
+
+from bitboard import BitBoard
 from board_clone import BoardClone
 from heuristics import PenteHeuristics
+from move_ordering import MoveOrdering
+from opening_book import OpeningBook, default_book_path
+from pattern_tables import get_pattern_tables
 from performance_tracker import PerformanceTracker
+from search_state import SearchState
+from threat_search import ThreatSearch, tactical_moves
+from transposition_table import TranspositionTable
+from zobrist import SYMMETRY_INVERSE, transform_cell
+
+
+class SearchTimeout(Exception):
+    """Raised inside the search when the time or node budget is exhausted."""
 
 
 class PenteAI:
-    def __init__(self, config, ai_color, depth=2):
+    # Nodes between wall-clock checks while a budget is active.
+    BUDGET_CHECK_INTERVAL = 64
+    # Deepest quiescence line below the horizon, in plies.
+    QUIESCENCE_MAX_PLY = 6
+    # Width of the zero window used to test moves after the first one.
+    NULL_WINDOW = 1
+    # Late move reductions: moves after the first LMR_FULL_MOVES at nodes with
+    # at least LMR_MIN_DEPTH plies left are searched LMR_REDUCTION plies
+    # shallower unless they are the hash move, a killer or tactical.
+    LMR_FULL_MOVES = 3
+    LMR_MIN_DEPTH = 3
+    LMR_REDUCTION = 1
+
+    # "make_unmake" searches one SearchState in place; "clone" is the original
+    # BoardClone-per-node path, kept as a reference for benchmarking.
+    SEARCH_MODES = ("make_unmake", "clone")
+    # Rules engine behind the make/unmake search: list-of-lists or per-colour bitboards.
+    BOARD_BACKENDS = {"list": SearchState, "bitboard": BitBoard}
+    PARALLEL_MODES = ("root", "lazy_smp")
+
+    def __init__(self, config, ai_color, depth=2, search_mode="make_unmake", tt_size_mb=None,
+                 incremental_eval=True, board_backend="list", workers=None, parallel_mode=None,
+                 threat_search_nodes=None, quiescence_nodes=None, use_book=True,
+                 symmetry=None, pvs=None, lmr=None):
+        if search_mode not in self.SEARCH_MODES:
+            raise ValueError(f"Unknown search mode: {search_mode}")
+        if board_backend not in self.BOARD_BACKENDS:
+            raise ValueError(f"Unknown board backend: {board_backend}")
         self.config = config
         self.color = ai_color
         self.depth = depth
+        self.search_mode = search_mode
+        self.incremental_eval = incremental_eval
+        self.board_backend = board_backend
+        # Key the transposition table by symmetry-canonical hash and drop
+        # equivalent root moves when the position is symmetric.
+        self.symmetry = symmetry if symmetry is not None else config.AI_SYMMETRY
+        # Principal variation search and late move reductions.
+        self.pvs = pvs if pvs is not None else config.AI_PVS
+        self.lmr = lmr if lmr is not None else config.AI_LMR
         self.opponent_color = 3 - ai_color 
 
+        if tt_size_mb is None:
+            tt_size_mb = config.TT_SIZE_MB
+        self.tt_size_mb = tt_size_mb
+        # The table persists across moves; a size of 0 disables it.
+        self.tt = TranspositionTable(tt_size_mb) if tt_size_mb > 0 else None
+        self.ordering = MoveOrdering(config.ROWS, config.COLS)
+        if threat_search_nodes is None:
+            threat_search_nodes = config.THREAT_SEARCH_NODES
+        # Memory-mapped opening book consulted before searching, if one has been built.
+        self.book = None
+        if use_book:
+            self.book = OpeningBook.open(config.OPENING_BOOK_PATH or default_book_path(), config.ROWS, config.COLS)
+        # Node budget of the quiescence search per iteration; 0 evaluates leaves directly.
+        self.quiescence_nodes = quiescence_nodes if quiescence_nodes is not None else config.QUIESCENCE_NODES
+        # Forced-win search tried before the main search; a budget of 0 disables it.
+        self.threat_search = None
+        if threat_search_nodes > 0:
+            self.threat_search = ThreatSearch(
+                config.ROWS, config.COLS, threat_search_nodes, config.THREAT_SEARCH_DEPTH
+            )
+        self.principal_variation = []
+        self._pv_table = [[]]
+        self._cutoffs = 0
+        self._first_move_cutoffs = 0
+        self._ply_cutoffs = {}
+        self._reductions = 0
+        self._researches = 0
+        self._partial_best = None
+        # Shared flag another process can set to stop the search at the next budget check.
+        self.stop_flag = None
+        self._start_budget(None, None)
+
+        # Parallel search over a process pool when more than one worker is configured.
+        self.workers = workers if workers is not None else config.AI_WORKERS
+        self.parallel_mode = parallel_mode or config.AI_PARALLEL_MODE
+        if self.parallel_mode not in self.PARALLEL_MODES:
+            raise ValueError(f"Unknown parallel mode: {self.parallel_mode}")
+        self._parallel = None
+        if self.workers > 1:
+            if self.parallel_mode == "lazy_smp":
+                from lazy_smp import LazySMPSearch
+                self._parallel = LazySMPSearch(self.workers, max(tt_size_mb, 1))
+            else:
+                from parallel_search import RootParallelSearch
+                self._parallel = RootParallelSearch(self.workers)
+
+    def close(self):
+        """Shuts down the worker pool, if any, and closes the opening book."""
+        if self._parallel is not None:
+            self._parallel.close()
+        if self.book is not None:
+            self.book.close()
+            self.book = None
+
+    def cache_sizes(self):
+        """Retained bytes of the structures the search keeps between moves, by name."""
+        retained_bytes = PerformanceTracker.retained_bytes
+        sizes = {
+            "history": retained_bytes(self.ordering),
+            "pattern_tables": retained_bytes(get_pattern_tables()),
+        }
+        if self.tt is not None:
+            sizes["tt"] = retained_bytes(self.tt)
+        if self.threat_search is not None:
+            sizes["threat"] = retained_bytes(self.threat_search)
+        return sizes
+
     
-    def get_best_move(self, game, tracker: PerformanceTracker):
-        initial_state = BoardClone(game.board, game.captures, game.turn, self.config)
-        possible_moves = self._get_relevant_moves(initial_state)
+    def get_best_move(self, game, tracker: PerformanceTracker, time_limit_ms=None, max_nodes=None, max_depth=None):
+        """
+        Plays the opening book move if the position is in the book, then runs
+        the threat search and plays a forced win straight away if it finds one.
+        Otherwise iterative deepening search from depth 1 up to
+        max_depth (defaults to self.depth). When time_limit_ms or max_nodes runs out the current
+        iteration is abandoned and the best move of the last completed
+        iteration is returned.
+
+        With tracker.telemetry on, the search phases are timed into the tracker.
+        """
+        if not tracker.telemetry:
+            return self._get_best_move(game, tracker, time_limit_ms, max_nodes, max_depth)
+        undo = tracker.instrument(self._timed_methods())
+        try:
+            return self._get_best_move(game, tracker, time_limit_ms, max_nodes, max_depth)
+        finally:
+            undo()
+
+    def _timed_methods(self):
+        """(object, method, phase) of every method timed under telemetry; make/unmake are added per state."""
+        methods = [
+            (self, "_get_relevant_moves", "movegen"),
+            (self.ordering, "order", "ordering"),
+            (self, "_evaluate", "eval"),
+            (self, "_quiescence", "quiescence"),
+        ]
+        if self.tt is not None:
+            methods += [(self.tt, "probe", "tt"), (self.tt, "store", "tt")]
+        if self.threat_search is not None:
+            methods.append((self.threat_search, "find_win", "threat"))
+        return methods
+
+    def _get_best_move(self, game, tracker, time_limit_ms, max_nodes, max_depth):
+        if self.search_mode == "clone":
+            return self._get_best_move_clone(game, tracker)
+
+        if self.book is not None:
+            book_move = self.book.lookup(game.board, game.captures, game.turn)
+            if book_move is not None:
+                tracker.record_book_hit()
+                return book_move
+
+        if self.tt is not None:
+            self.tt.reset_stats()
+            self.tt.new_search()
+        state = self.new_state(game.board, game.captures, game.turn)
+        if tracker.telemetry:
+            # The state only lives for this search, so its wrappers are never removed.
+            tracker.instrument([(state, "make_move", "make_unmake"), (state, "unmake_move", "make_unmake")])
+        possible_moves = self._get_relevant_moves(state)
 
         if not possible_moves:
           
-            if not initial_state.board_occupied():
+            if not state.board_occupied():
                 return (self.config.ROWS // 2, self.config.COLS // 2)
             return None
 
-        
+        # The threat search spends the same time budget and honours the same stop flag as the main search.
+        self._start_budget(time_limit_ms, max_nodes)
+        if self.threat_search is not None:
+            winning_move = self.threat_search.find_win(state, self._out_of_time)
+            tracker.record_threat_search(self.threat_search.nodes, winning_move is not None)
+            if winning_move is not None:
+                return winning_move
+
         center_r, center_c = self.config.ROWS // 2, self.config.COLS // 2
         possible_moves.sort(key=lambda m: abs(m[0] - center_r) + abs(m[1] - center_c))
+        root_moves = len(possible_moves)
+        if self.symmetry:
+            possible_moves = self._prune_symmetric_moves(state, possible_moves)
+        tracker.record_root_moves(root_moves, len(possible_moves))
+        max_depth = max_depth or self.depth
+        self.ordering.new_search(max_depth)
+        self._cutoffs = 0
+        self._first_move_cutoffs = 0
+        self._ply_cutoffs = {}
+        self._reductions = 0
+        self._researches = 0
+        hash_move = None
+        if self.tt is not None:
+            key, symmetry = self._tt_key(state)
+            entry = self.tt.probe(key)
+            if entry is not None:
+                hash_move = self._from_canonical(entry[3], symmetry)
+        # Stable sort: moves with equal ordering scores stay closest-to-centre first.
+        possible_moves = self.ordering.order(state, possible_moves, 0, hash_move)
+
+        if self._parallel is not None:
+            if self._deadline is not None:
+                time_limit_ms = max(0.0, (self._deadline - time.perf_counter()) * 1000)
+            return self._parallel.search(
+                self, state, possible_moves, max_depth, tracker, time_limit_ms, max_nodes
+            )
+
+        self.principal_variation = []
+        best_move = possible_moves[0]
+        depth_reached = 0
+
+        for depth in range(1, max_depth + 1):
+            if self.principal_variation:
+                self._move_to_front(possible_moves, self.principal_variation[0])
+            # The quiescence budget is per iteration, so the deepest one is not starved.
+            self._q_nodes = 0
+            try:
+                score, move = self._search_root(state, possible_moves, depth, tracker)
+            except SearchTimeout:
+                # Unwind the abandoned iteration back to the root position.
+                while state.history:
+                    state.unmake_move()
+                if depth_reached == 0 and self._partial_best is not None:
+                    best_move = self._partial_best
+                break
 
+            best_move = move
+            self.principal_variation = self._pv_table[0]
+            depth_reached = depth
+            tracker.record_iteration(depth, tracker.nodes_explored)
+            if abs(score) >= PenteHeuristics.SCORE_WIN * 10:
+                # A forced win or loss was found; deeper iterations cannot change it.
+                break
+
+        tracker.record_depth(depth_reached)
+        tracker.record_ordering_stats(self._cutoffs, self._first_move_cutoffs, self._ply_cutoffs)
+        tracker.record_reduction_stats(self._reductions, self._researches)
+        if self.tt is not None:
+            tracker.record_tt_stats(self.tt.stats())
+        return best_move
+
+    def _search_root(self, state, possible_moves, depth, tracker):
         best_score = float("-inf")
         best_move = possible_moves[0]
         alpha = float("-inf")
         beta = float("inf")
+        self._partial_best = None
+        self._pv_table = [[] for _ in range(depth + 1)]
+
+        for i, (r, c) in enumerate(possible_moves):
+            if state.make_move(r, c):
+                score = self._search_child(state, depth, 0, i == 0, 0, alpha, beta, False, tracker)
+                state.unmake_move()
 
-        for r, c in possible_moves:
-            next_state = BoardClone(
-                initial_state.board,
-                initial_state.captures,
-                initial_state.turn,
-                self.config,
-            )
-            
-          
-            if next_state.make_move(r, c): 
-               
-                score = self._minimax(next_state, self.depth - 1, alpha, beta, False, tracker) 
-                
                 if score > best_score:
                     best_score = score
                     best_move = (r, c)
+                    self._partial_best = best_move
+                    self._pv_table[0] = [best_move] + self._pv_table[1]
                 alpha = max(alpha, best_score)
                 if beta <= alpha:
                     break 
-        return best_move
+
+        if self.tt is not None:
+            key, symmetry = self._tt_key(state)
+            self.tt.store(key, depth, TranspositionTable.EXACT, best_score, self._to_canonical(best_move, symmetry))
+        return best_score, best_move
+
+    def new_state(self, board, captures, turn):
+        """SearchState for a position, on the configured backend and with the configured features."""
+        return self.BOARD_BACKENDS[self.board_backend](
+            board, captures, turn, self.config,
+            incremental_eval=self.incremental_eval, track_symmetries=self.symmetry,
+        )
+
+    def _tt_key(self, state):
+        """Transposition table key of the position and the symmetry its moves are stored under."""
+        if state.sym_hashes is None:
+            return state.hash, 0
+        return state.canonical()
+
+    def _to_canonical(self, move, symmetry):
+        if move is None or symmetry == 0:
+            return move
+        return transform_cell(symmetry, move[0], move[1], self.config.ROWS, self.config.COLS)
+
+    def _from_canonical(self, move, symmetry):
+        if move is None or symmetry == 0:
+            return move
+        return transform_cell(SYMMETRY_INVERSE[symmetry], move[0], move[1], self.config.ROWS, self.config.COLS)
+
+    def _prune_symmetric_moves(self, state, moves):
+        """Keeps the first move of each set of moves the position's own symmetries map onto each other."""
+        symmetries = state.self_symmetries()
+        if not symmetries:
+            return moves
+        rows, cols = self.config.ROWS, self.config.COLS
+        kept = []
+        seen = set()
+        for move in moves:
+            if move in seen:
+                continue
+            kept.append(move)
+            for symmetry in symmetries:
+                seen.add(transform_cell(symmetry, move[0], move[1], rows, cols))
+        return kept
+
+    def _start_budget(self, time_limit_ms, max_nodes):
+        self._nodes = 0
+        self._q_nodes = 0
+        self._deadline = None
+        if time_limit_ms is not None:
+            self._deadline = time.perf_counter() + time_limit_ms / 1000
+        self._max_nodes = max_nodes
+        self._next_budget_check = self.BUDGET_CHECK_INTERVAL
+        if max_nodes is not None:
+            self._next_budget_check = min(self._next_budget_check, max_nodes)
+
+    def _out_of_time(self):
+        return (
+            (self._deadline is not None and time.perf_counter() >= self._deadline)
+            or (self.stop_flag is not None and self.stop_flag.value)
+        )
+
+    def _check_budget(self):
+        if self._max_nodes is not None and self._nodes >= self._max_nodes:
+            raise SearchTimeout()
+        if self._out_of_time():
+            raise SearchTimeout()
+        self._next_budget_check = self._nodes + self.BUDGET_CHECK_INTERVAL
+        if self._max_nodes is not None:
+            self._next_budget_check = min(self._next_budget_check, self._max_nodes)
 
    
-    def _minimax(self, state, depth, alpha, beta, maximizing, tracker: PerformanceTracker):
+    def _minimax(self, state, depth, ply, alpha, beta, maximizing, tracker: PerformanceTracker):
         
        
         tracker.increment_node() 
+        self._nodes += 1
+        if self._nodes >= self._next_budget_check:
+            self._check_budget()
+
+        pv_table = self._pv_table
+        pv_table[ply] = []
+
+        tt = self.tt
+        tt_move = None
+        if tt is not None:
+            key, symmetry = self._tt_key(state)
+            entry = tt.probe(key)
+            if entry is not None:
+                entry_depth, flag, score, tt_move = entry
+                tt_move = self._from_canonical(tt_move, symmetry)
+                if entry_depth >= depth:
+                    if flag == TranspositionTable.EXACT:
+                        return score
+                    if flag == TranspositionTable.LOWER:
+                        alpha = max(alpha, score)
+                    else:
+                        beta = min(beta, score)
+                    if beta <= alpha:
+                        return score
         
         if depth == 0 or state.game_over:
-            return PenteHeuristics.evaluate(state, self.color)
+            if state.game_over or self._q_nodes >= self.quiescence_nodes:
+                score = self._evaluate(state)
+                flag = TranspositionTable.EXACT
+            else:
+                score = self._quiescence(state, alpha, beta, maximizing, tracker, 0)
+                if score <= alpha:
+                    flag = TranspositionTable.UPPER
+                elif score >= beta:
+                    flag = TranspositionTable.LOWER
+                else:
+                    flag = TranspositionTable.EXACT
+            # Once this iteration's quiescence budget has run out, leaf scores depend on how far
+            # the iteration got rather than on the position, so they are not worth keeping.
+            truncated = not state.game_over and 0 < self.quiescence_nodes <= self._q_nodes
+            if tt is not None and not truncated:
+                tt.store(key, depth, flag, score, None)
+            return score
 
        
         possible_moves = self._get_relevant_moves(state)
         if not possible_moves:
             
-            return PenteHeuristics.evaluate(state, self.color) 
+            return self._evaluate(state) 
+        if tt_move is None and ply < len(self.principal_variation):
+            tt_move = self.principal_variation[ply]
+        possible_moves = self.ordering.order(state, possible_moves, ply, tt_move)
+
+        alpha_orig, beta_orig = alpha, beta
+        best_move = None
+        lmr = self.lmr and depth >= self.LMR_MIN_DEPTH
+        killers = self.ordering.killers[ply] if ply < len(self.ordering.killers) else ()
 
         if maximizing:
             max_eval = float("-inf")
             
+            for i, (r, c) in enumerate(possible_moves):
+                reduction = 0
+                if lmr and i >= self.LMR_FULL_MOVES and self._is_quiet(state, (r, c), tt_move, killers):
+                    reduction = self.LMR_REDUCTION
+                if state.make_move(r, c):
+                    eval = self._search_child(state, depth, ply, i == 0, reduction, alpha, beta, False, tracker)
+                    state.unmake_move()
+
+                    if eval > max_eval:
+                        max_eval = eval
+                        best_move = (r, c)
+                    if eval > alpha:
+                        pv_table[ply] = [best_move] + pv_table[ply + 1]
+                    alpha = max(alpha, eval)
+                    if beta <= alpha:
+                        self._record_cutoff((r, c), ply, depth, i)
+                        break
+            best = max_eval
+        else:
+            min_eval = float("inf")
+            
+            for i, (r, c) in enumerate(possible_moves):
+                reduction = 0
+                if lmr and i >= self.LMR_FULL_MOVES and self._is_quiet(state, (r, c), tt_move, killers):
+                    reduction = self.LMR_REDUCTION
+                if state.make_move(r, c):
+                    eval = self._search_child(state, depth, ply, i == 0, reduction, alpha, beta, True, tracker)
+                    state.unmake_move()
+
+                    if eval < min_eval:
+                        min_eval = eval
+                        best_move = (r, c)
+                    if eval < beta:
+                        pv_table[ply] = [best_move] + pv_table[ply + 1]
+                    beta = min(beta, eval)
+                    if beta <= alpha:
+                        self._record_cutoff((r, c), ply, depth, i)
+                        break
+            best = min_eval
+
+        if tt is not None:
+            if best <= alpha_orig:
+                flag = TranspositionTable.UPPER
+            elif best >= beta_orig:
+                flag = TranspositionTable.LOWER
+            else:
+                flag = TranspositionTable.EXACT
+            tt.store(key, depth, flag, best, self._to_canonical(best_move, symmetry))
+        return best
+
+    def _search_child(self, state, depth, ply, first, reduction, alpha, beta, maximizing, tracker):
+        """
+        Scores the move just made at ply (the child is searched at ply + 1, however
+        much its depth is reduced). With PVS every move but the first is only
+        tested against the parent's bound with a zero window, and a move that
+        beats the bound, or was searched with a reduced depth, is searched again
+        with the full window and depth.
+        """
+        if first or (not self.pvs and not reduction):
+            return self._minimax(state, depth - 1, ply + 1, alpha, beta, maximizing, tracker)
+        if reduction:
+            self._reductions += 1
+        low, high = alpha, beta
+        if self.pvs:
+            # maximizing is the child's side; the parent moved for the other one.
+            if maximizing and beta != float("inf"):
+                low = beta - self.NULL_WINDOW
+            elif not maximizing and alpha != float("-inf"):
+                high = alpha + self.NULL_WINDOW
+        score = self._minimax(state, depth - 1 - reduction, ply + 1, low, high, maximizing, tracker)
+        improves = score < beta if maximizing else score > alpha
+        if improves and (reduction or (low, high) != (alpha, beta)):
+            self._researches += 1
+            score = self._minimax(state, depth - 1, ply + 1, alpha, beta, maximizing, tracker)
+        return score
+
+    def _is_quiet(self, state, move, tt_move, killers):
+        """True if move may be reduced: not the hash move or a killer, and makes or stops no threat."""
+        if move == tt_move or move in killers:
+            return False
+        return self.ordering.threat_score(state.board, move[0], move[1], state.turn) == 0
+
+    def _quiescence(self, state, alpha, beta, maximizing, tracker, qply):
+        """
+        Extends a horizon node with captures, five-completions and blocks of the
+        opponent's five until the position is quiet. The side to move may stand
+        pat on the static score unless the opponent threatens to win next move.
+        """
+        tracker.increment_quiescence_node()
+        self._q_nodes += 1
+        stand_pat = self._evaluate(state)
+        if state.game_over or qply >= self.QUIESCENCE_MAX_PLY or self._q_nodes >= self.quiescence_nodes:
+            return stand_pat
+
+        wins, blocks, captures = tactical_moves(state)
+        if wins:
+            state.make_move(*wins[0])
+            score = self._evaluate(state)
+            state.unmake_move()
+            return score
+        if not blocks and not captures:
+            return stand_pat
+
+        best = None
+        if not blocks:
+            best = stand_pat
+            if maximizing:
+                if best >= beta:
+                    return best
+                alpha = max(alpha, best)
+            else:
+                if best <= alpha:
+                    return best
+                beta = min(beta, best)
+
+        for move in dict.fromkeys(blocks + captures):
+            state.make_move(*move)
+            score = self._quiescence(state, alpha, beta, not maximizing, tracker, qply + 1)
+            state.unmake_move()
+            if maximizing:
+                if best is None or score > best:
+                    best = score
+                alpha = max(alpha, score)
+            else:
+                if best is None or score < best:
+                    best = score
+                beta = min(beta, score)
+            if beta <= alpha:
+                break
+        return best
+
+    def _evaluate(self, state):
+        if state.evaluator is not None:
+            return state.evaluator.evaluate(state, self.color)
+        return PenteHeuristics.evaluate(state, self.color)
+
+    def _record_cutoff(self, move, ply, depth, move_index):
+        self._cutoffs += 1
+        self._ply_cutoffs[ply] = self._ply_cutoffs.get(ply, 0) + 1
+        if move_index == 0:
+            self._first_move_cutoffs += 1
+        self.ordering.record_cutoff(move, ply, depth)
+
+    @staticmethod
+    def _move_to_front(moves, move):
+        if move in moves:
+            moves.remove(move)
+            moves.insert(0, move)
+
+    def _get_best_move_clone(self, game, tracker: PerformanceTracker):
+        initial_state = BoardClone(game.board, game.captures, game.turn, self.config)
+        possible_moves = self._scan_relevant_moves(initial_state)
+
+        if not possible_moves:
+            return None
+
+        center_r, center_c = self.config.ROWS // 2, self.config.COLS // 2
+        possible_moves.sort(key=lambda m: abs(m[0] - center_r) + abs(m[1] - center_c))
+
+        best_score = float("-inf")
+        best_move = possible_moves[0]
+        alpha = float("-inf")
+        beta = float("inf")
+
+        for r, c in possible_moves:
+            next_state = BoardClone(
+                initial_state.board,
+                initial_state.captures,
+                initial_state.turn,
+                self.config,
+            )
+            if next_state.make_move(r, c):
+                score = self._minimax_clone(next_state, self.depth - 1, alpha, beta, False, tracker)
+                if score > best_score:
+                    best_score = score
+                    best_move = (r, c)
+                alpha = max(alpha, best_score)
+                if beta <= alpha:
+                    break
+        return best_move
+
+    def _minimax_clone(self, state, depth, alpha, beta, maximizing, tracker: PerformanceTracker):
+        tracker.increment_node()
+
+        if depth == 0 or state.game_over:
+            return PenteHeuristics.evaluate(state, self.color)
+
+        possible_moves = self._scan_relevant_moves(state)
+        if not possible_moves:
+            return PenteHeuristics.evaluate(state, self.color)
+
+        if maximizing:
+            max_eval = float("-inf")
             for r, c in possible_moves:
                 child = BoardClone(state.board, state.captures, state.turn, self.config)
                 if child.make_move(r, c):
-                  
-                    eval = self._minimax(child, depth - 1, alpha, beta, False, tracker)
-                    
+                    eval = self._minimax_clone(child, depth - 1, alpha, beta, False, tracker)
                     max_eval = max(max_eval, eval)
                     alpha = max(alpha, eval)
                     if beta <= alpha:
@@ -82,20 +619,30 @@ class PenteAI:
             return max_eval
         else:
             min_eval = float("inf")
-            
             for r, c in possible_moves:
                 child = BoardClone(state.board, state.captures, state.turn, self.config)
                 if child.make_move(r, c):
-                    
-                    eval = self._minimax(child, depth - 1, alpha, beta, True, tracker)
-                    
+                    eval = self._minimax_clone(child, depth - 1, alpha, beta, True, tracker)
                     min_eval = min(min_eval, eval)
                     beta = min(beta, eval)
                     if beta <= alpha:
                         break
             return min_eval
 
+    def _candidate_radius(self, stone_count):
+        radius = 2 if self.depth > 3 else 1
+        if stone_count < 5:
+            radius = 2
+        return radius
+
     def _get_relevant_moves(self, state):
+        """Reads the candidate set SearchState maintains incrementally on make/unmake."""
+        if state.stone_count == 0:
+            return [(state.rows // 2, state.cols // 2)]
+        return state.candidate_moves(self._candidate_radius(state.stone_count))
+
+    def _scan_relevant_moves(self, state):
+        """Full-board scan producing the same candidates; used by the BoardClone path."""
         rows, cols = state.rows, state.cols
         board = state.board
         relevant = set()
@@ -111,9 +658,7 @@ class PenteAI:
             return [(rows // 2, cols // 2)]
 
         
-        radius = 2 if self.depth > 3 else 1 
-        if not occupied or len(occupied) < 5: 
-             radius = 2
+        radius = self._candidate_radius(len(occupied))
 
         
         for r, c in occupied:
@@ -129,4 +674,4 @@ class PenteAI:
         return list(relevant)
 
     def _get_opponent_color(self):
-        return 3 - self.color
\ No newline at end of file
+        return 3 - self.color
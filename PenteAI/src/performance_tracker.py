@@ -1,13 +1,79 @@
+import json
+import math
+import sys
 import time
+import tracemalloc
+import types
 import os
 import psutil
 
 class PerformanceTracker:
-    """Utility class to measure execution time, node count, and memory usage for a search algorithm."""
+    """
+    Utility class to measure execution time, node count, and memory usage for a search algorithm.
+
+    With telemetry on, the engine also routes its hot methods through timed()
+    wrappers (see instrument()), so the search time is broken down by phase.
+    With it off nothing is wrapped and the search runs at full speed. to_record()
+    gathers everything measured for one move into a dict for a TelemetrySink.
+
+    memory_mb is the process RSS after the search, pygame included. With
+    trace_memory on, tracemalloc also measures the search's own Python heap:
+    the peak above the heap at start_timer, the blocks and bytes still
+    allocated at stop_timer, and the source lines that allocated most of them.
+    Tracing slows the search several times over, so its timings are not
+    comparable with untraced ones.
+    """
+
+    # Search phases timed when telemetry is on. Each phase counts its own time
+    # only; time spent in a nested timed call goes to that call's phase.
+    PHASES = ("movegen", "ordering", "eval", "make_unmake", "tt", "quiescence", "threat", "playout")
+    # Allocation sites listed by a traced search.
+    TOP_ALLOCATIONS = 10
+    # Allocations of tracemalloc itself are left out of the traced figures.
+    TRACE_FILTERS = (
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<unknown>"),
+    )
+    # Objects retained_bytes() neither counts nor walks into.
+    UNSIZED_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType)
     
-    def __init__(self):
+    def __init__(self, telemetry=False, trace_memory=False):
+        self.telemetry = telemetry
+        self.trace_memory = trace_memory
         self.nodes_explored = 0
-        self.start_time = 0
+        self.start_ns = 0
+        self.elapsed_ns = 0
+        self.memory_mb = 0.0
+        self.phase_ns = dict.fromkeys(self.PHASES, 0)
+        self._phase_stack = []
+        # Beta cutoffs by ply, and (depth, cumulative nodes) after every completed iteration.
+        self.ply_cutoffs = {}
+        self.iterations = []
+        self.tt_stats = {}
+        self.depth_reached = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.worker_stats = []
+        self.threat_nodes = 0
+        self.threat_win_found = False
+        self.quiescence_nodes = 0
+        self.book_hit = False
+        self.root_moves = 0
+        self.root_moves_searched = 0
+        self.lmr_reductions = 0
+        self.pvs_researches = 0
+        self.mcts_reused_visits = 0
+        # tracemalloc results of the last traced search; see stop_timer().
+        self.peak_alloc_mb = 0.0
+        self.retained_alloc_mb = 0.0
+        self.alloc_blocks = 0
+        self.top_allocations = []
+        # Retained bytes of the engine's search caches, by name.
+        self.cache_bytes = {}
+        self._snapshot = None
+        self._traced_start = 0
+        self._owns_tracing = False
         self.process = psutil.Process(os.getpid()) 
 
     def _get_current_memory_usage_mb(self):
@@ -18,18 +84,315 @@ class PerformanceTracker:
     def start_timer(self):
         """Resets the tracker and starts the timer and memory tracking."""
         self.nodes_explored = 0
-        self.start_time = time.time() * 1000 
+        self.tt_stats = {}
+        self.depth_reached = 0
+        self.cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.worker_stats = []
+        self.threat_nodes = 0
+        self.threat_win_found = False
+        self.quiescence_nodes = 0
+        self.book_hit = False
+        self.root_moves = 0
+        self.root_moves_searched = 0
+        self.lmr_reductions = 0
+        self.pvs_researches = 0
+        self.mcts_reused_visits = 0
+        self.memory_mb = 0.0
+        self.phase_ns = dict.fromkeys(self.PHASES, 0)
+        self.ply_cutoffs = {}
+        self.iterations = []
+        self.elapsed_ns = 0
+        self.peak_alloc_mb = 0.0
+        self.retained_alloc_mb = 0.0
+        self.alloc_blocks = 0
+        self.top_allocations = []
+        self.cache_bytes = {}
+        if self.trace_memory:
+            self._start_tracing()
+        self.start_ns = time.perf_counter_ns()
+
+    def _start_tracing(self):
+        self._owns_tracing = not tracemalloc.is_tracing()
+        if self._owns_tracing:
+            tracemalloc.start()
+        self._snapshot = tracemalloc.take_snapshot().filter_traces(self.TRACE_FILTERS)
+        self._traced_start = tracemalloc.get_traced_memory()[0]
+        # reset_peak is Python 3.9+. Without it, a trace this tracker started still has a fresh
+        # peak, but a trace that was already running reports the peak since it started.
+        if hasattr(tracemalloc, "reset_peak"):
+            tracemalloc.reset_peak()
+
+    def _stop_tracing(self):
+        _, peak = tracemalloc.get_traced_memory()
+        snapshot = tracemalloc.take_snapshot().filter_traces(self.TRACE_FILTERS)
+        if self._owns_tracing:
+            tracemalloc.stop()
+        diffs = snapshot.compare_to(self._snapshot, "lineno")
+        self._snapshot = None
+        self.peak_alloc_mb = max(0, peak - self._traced_start) / (1024 * 1024)
+        self.retained_alloc_mb = sum(diff.size_diff for diff in diffs) / (1024 * 1024)
+        self.alloc_blocks = sum(diff.count_diff for diff in diffs)
+        self.top_allocations = [
+            {
+                "site": f"{os.path.basename(diff.traceback[0].filename)}:{diff.traceback[0].lineno}",
+                "kb": diff.size_diff / 1024,
+                "blocks": diff.count_diff,
+            }
+            for diff in diffs[: self.TOP_ALLOCATIONS]
+            if diff.size_diff > 0
+        ]
         
     def increment_node(self):
         """Increments the count every time a game state is evaluated (a node is visited)."""
         self.nodes_explored += 1
         
+    def increment_quiescence_node(self):
+        """Counts a quiescence search node; these are kept out of nodes_explored."""
+        self.quiescence_nodes += 1
+
+    def add_nodes(self, count):
+        """Adds nodes explored elsewhere (e.g. by worker processes) to the current search."""
+        self.nodes_explored += count
+
+    def record_tt_stats(self, stats):
+        """Stores the transposition table hit/miss/collision counts for the current search."""
+        self.tt_stats = dict(stats)
+
+    def record_depth(self, depth):
+        """Stores the deepest fully completed iteration of an iterative deepening search."""
+        self.depth_reached = depth
+
+    def record_ordering_stats(self, cutoffs, first_move_cutoffs, ply_cutoffs=None):
+        """Stores how many beta cutoffs happened, how many came from the first move tried, and their count by ply."""
+        self.cutoffs = cutoffs
+        self.first_move_cutoffs = first_move_cutoffs
+        self.ply_cutoffs = dict(ply_cutoffs or {})
+
+    def record_iteration(self, depth, nodes):
+        """Stores the cumulative node count after an iterative deepening iteration completed."""
+        self.iterations.append((depth, nodes))
+
+    def record_reduction_stats(self, reductions, researches):
+        """Stores how many moves late move reductions searched shallower and how many had to be searched again."""
+        self.lmr_reductions = reductions
+        self.pvs_researches = researches
+
+    def record_mcts_reuse(self, visits):
+        """Stores how many playouts of the previous MCTS tree were kept for the current move."""
+        self.mcts_reused_visits = visits
+
+    def record_root_moves(self, generated, searched):
+        """Stores the root branching before and after symmetric moves were pruned."""
+        self.root_moves = generated
+        self.root_moves_searched = searched
+
+    def record_cache_sizes(self, sizes):
+        """Stores the retained bytes of the engine's search caches (see the engines' cache_sizes())."""
+        self.cache_bytes = dict(sizes)
+
+    def record_book_hit(self):
+        """Marks the move as played from the opening book without a search."""
+        self.book_hit = True
+
+    def record_threat_search(self, nodes, win_found):
+        """Stores the nodes the forced-win threat search used (not counted in nodes_explored)."""
+        self.threat_nodes = nodes
+        self.threat_win_found = win_found
+
+    def record_worker_stats(self, stats):
+        """Stores per-worker search stats (depth, nodes, TT hits/misses, time) of a parallel search."""
+        self.worker_stats = [dict(worker) for worker in stats]
+
+    @property
+    def first_move_cutoff_pct(self):
+        """Percentage of beta cutoffs produced by the first move searched (move ordering quality)."""
+        if self.cutoffs == 0:
+            return 0.0
+        return 100.0 * self.first_move_cutoffs / self.cutoffs
+
+    @property
+    def effective_branching_factor(self):
+        """Nodes of the last completed iteration over those of the one before; 0 with fewer than two iterations."""
+        if len(self.iterations) < 2:
+            return 0.0
+        counts = [0] + [nodes for _, nodes in self.iterations]
+        last = counts[-1] - counts[-2]
+        previous = counts[-2] - counts[-3]
+        return last / previous if previous > 0 else 0.0
+
+    @property
+    def tt_hit_rate(self):
+        """Percentage of transposition table probes that found an entry."""
+        probes = self.tt_stats.get("hits", 0) + self.tt_stats.get("misses", 0)
+        if probes == 0:
+            return 0.0
+        return 100.0 * self.tt_stats.get("hits", 0) / probes
+
     def stop_timer(self):
         """
         Stops the timer and returns the metrics: 
         (elapsed_time_ms, nodes_explored, final_memory_MB).
+        With trace_memory on, also stores the traced peak, the heap still
+        allocated since start_timer and its top allocation sites.
         """
-        end_time = time.time() * 1000
-        elapsed = end_time - self.start_time
-        final_mem_usage = self._get_current_memory_usage_mb()
-        return elapsed, self.nodes_explored, final_mem_usage
\ No newline at end of file
+        self.elapsed_ns = time.perf_counter_ns() - self.start_ns
+        if self.trace_memory and self._snapshot is not None:
+            self._stop_tracing()
+        self.memory_mb = self._get_current_memory_usage_mb()
+        return self.elapsed_ns / 1e6, self.nodes_explored, self.memory_mb
+
+    def timed(self, phase, func):
+        """func wrapped so the time spent in it (minus nested timed calls) is added to phase."""
+        phase_ns = self.phase_ns
+        stack = self._phase_stack
+        clock = time.perf_counter_ns
+
+        def wrapper(*args, **kwargs):
+            start = clock()
+            stack.append(0)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = clock() - start
+                phase_ns[phase] += elapsed - stack.pop()
+                if stack:
+                    stack[-1] += elapsed
+
+        return wrapper
+
+    def instrument(self, targets):
+        """
+        Times the methods given as (object, method name, phase) by shadowing
+        them with timed() wrappers on the instances; returns a function that
+        removes the wrappers again.
+        """
+        patched = []
+        for obj, name, phase in targets:
+            setattr(obj, name, self.timed(phase, getattr(obj, name)))
+            patched.append((obj, name))
+
+        def undo():
+            for obj, name in patched:
+                delattr(obj, name)
+
+        return undo
+
+    def to_record(self, **context):
+        """Everything measured for the move as a JSON-ready dict, with context (game, engine, ...) merged in."""
+        elapsed_ms = self.elapsed_ns / 1e6
+        record = dict(context)
+        record.update({
+            "time_ms": elapsed_ms,
+            "nodes": self.nodes_explored,
+            "nodes_per_sec": self.nodes_explored / (elapsed_ms / 1000) if elapsed_ms > 0 else 0.0,
+            "memory_mb": self.memory_mb,
+            "depth_reached": self.depth_reached,
+            "iterations": [list(iteration) for iteration in self.iterations],
+            "effective_branching_factor": self.effective_branching_factor,
+            "cutoffs": self.cutoffs,
+            "first_move_cutoff_pct": self.first_move_cutoff_pct,
+            "ply_cutoffs": {str(ply): count for ply, count in sorted(self.ply_cutoffs.items())},
+            "tt": dict(self.tt_stats, hit_rate=self.tt_hit_rate),
+            "book_hit": self.book_hit,
+            "threat_nodes": self.threat_nodes,
+            "threat_win_found": self.threat_win_found,
+            "quiescence_nodes": self.quiescence_nodes,
+            "root_moves": self.root_moves,
+            "root_moves_searched": self.root_moves_searched,
+            "lmr_reductions": self.lmr_reductions,
+            "pvs_researches": self.pvs_researches,
+            "mcts_reused_visits": self.mcts_reused_visits,
+        })
+        if self.telemetry:
+            phases = {phase: ns / 1e6 for phase, ns in self.phase_ns.items() if ns}
+            phases["other"] = max(0.0, elapsed_ms - sum(phases.values()))
+            record["phases_ms"] = phases
+        if self.trace_memory:
+            record["traced_memory"] = {
+                "peak_mb": self.peak_alloc_mb,
+                "retained_mb": self.retained_alloc_mb,
+                "blocks": self.alloc_blocks,
+                "top_allocations": self.top_allocations,
+            }
+        if self.cache_bytes:
+            record["cache_kb"] = {name: size / 1024 for name, size in self.cache_bytes.items()}
+        return record
+
+    @staticmethod
+    def retained_bytes(obj):
+        """
+        sys.getsizeof of obj plus everything reachable from it through
+        containers, instance __dict__ and __slots__, each object counted once.
+        Classes, modules and functions are not followed.
+        """
+        seen = set()
+        stack = [obj]
+        total = 0
+        while stack:
+            item = stack.pop()
+            if id(item) in seen or isinstance(item, PerformanceTracker.UNSIZED_TYPES):
+                continue
+            seen.add(id(item))
+            total += sys.getsizeof(item)
+            if isinstance(item, dict):
+                stack.extend(item.keys())
+                stack.extend(item.values())
+            elif isinstance(item, (list, tuple, set, frozenset)):
+                stack.extend(item)
+            else:
+                attributes = getattr(item, "__dict__", None)
+                if attributes is not None:
+                    stack.append(attributes)
+                for name in getattr(type(item), "__slots__", ()):
+                    if hasattr(item, name):
+                        stack.append(getattr(item, name))
+        return total
+
+    @staticmethod
+    def percentiles(samples, points=(50, 95, 99)):
+        """Nearest-rank percentiles of samples (e.g. frame times), as {point: value}; empty if no samples."""
+        if not samples:
+            return {}
+        ordered = sorted(samples)
+        return {
+            point: ordered[min(len(ordered) - 1, max(0, math.ceil(point / 100 * len(ordered)) - 1))]
+            for point in points
+        }
+
+    @staticmethod
+    def compare(baseline, candidate):
+        """
+        Compares two stop_timer() results and returns a dict of deltas
+        (candidate - baseline) for time and nodes, plus the time speedup factor.
+        """
+        base_time, base_nodes = baseline[0], baseline[1]
+        cand_time, cand_nodes = candidate[0], candidate[1]
+        return {
+            "time_delta_ms": cand_time - base_time,
+            "node_delta": cand_nodes - base_nodes,
+            "speedup": base_time / cand_time if cand_time > 0 else float("inf"),
+        }
+
+
+class TelemetrySink:
+    """Appends one JSON record per line to a file, opened on the first write."""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = None
+
+    def write(self, record):
+        try:
+            if self._file is None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                self._file = open(self.path, "a")
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+        except OSError as e:
+            print(f"Warning: Could not write telemetry to {self.path}: {e}")
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,112 @@
+import threading
+from types import SimpleNamespace
+
+from performance_tracker import PerformanceTracker
+from search_state import SearchState
+from zobrist import get_zobrist_keys
+
+
+class Ponderer:
+    """
+    Thinks on the human's time.
+
+    While the human is to move, a background thread plays each of their most
+    likely replies (the reply predicted by the AI's last principal variation
+    first, then the best-ordered candidates) and runs the AI's normal search
+    on the resulting position. Finished results are cached by position hash;
+    the search also fills the AI's transposition table, which persists across
+    moves. stop() cancels the thread through the AI's stop flag, and take()
+    returns the cached move if the human played one of the predicted replies.
+    """
+
+    def __init__(self, ai, predictions=3, time_limit_ms=None, telemetry=False):
+        self.ai = ai
+        self.predictions = predictions
+        self.time_limit_ms = time_limit_ms
+        self.telemetry = telemetry
+        self.zobrist = get_zobrist_keys(ai.config.ROWS, ai.config.COLS)
+        self.results = {}
+        self.hits = 0
+        self.lookups = 0
+        self.saved_ms = 0.0
+        self._stop = SimpleNamespace(value=0)
+        self._thread = None
+
+    @property
+    def active(self):
+        """True from start() until the ponder result is taken or pondering is stopped."""
+        return self._thread is not None
+
+    @property
+    def hit_rate(self):
+        """Percentage of AI moves answered from a finished ponder search."""
+        if self.lookups == 0:
+            return 0.0
+        return 100.0 * self.hits / self.lookups
+
+    def start(self, game):
+        """Starts pondering on a position where the human is to move."""
+        self.stop()
+        self.results = {}
+        self._stop.value = 0
+        state = SearchState(game.board, game.captures, game.turn, self.ai.config, incremental_eval=False)
+        self._thread = threading.Thread(target=self._run, args=(state,), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Cancels the background search and waits for it to unwind."""
+        if self._thread is not None:
+            self._stop.value = 1
+            self._thread.join()
+            self._thread = None
+
+    def take(self, game):
+        """
+        Stops pondering and returns (move, tracker) searched for the current
+        position, or None if the human's move was not one of the predictions.
+        """
+        self.stop()
+        self.lookups += 1
+        key = self.zobrist.hash_position(game.board, game.captures, game.turn)
+        result = self.results.pop(key, None)
+        self.results = {}
+        if result is None:
+            return None
+        move, tracker, elapsed_ms = result
+        self.hits += 1
+        self.saved_ms += elapsed_ms
+        return move, tracker
+
+    def _predict(self, state):
+        if state.stone_count == 0:
+            return [(state.rows // 2, state.cols // 2)]
+        predicted = []
+        pv = self.ai.principal_variation
+        if len(pv) > 1 and state.board[pv[1][0]][pv[1][1]] == 0:
+            predicted.append(pv[1])
+        radius = self.ai._candidate_radius(state.stone_count)
+        for move in self.ai.ordering.order(state, state.candidate_moves(radius), 0):
+            if len(predicted) >= self.predictions:
+                break
+            if move not in predicted:
+                predicted.append(move)
+        return predicted
+
+    def _run(self, state):
+        ai = self.ai
+        ai.stop_flag = self._stop
+        try:
+            for r, c in self._predict(state):
+                if self._stop.value or not state.make_move(r, c):
+                    break
+                if not state.game_over:
+                    position = SimpleNamespace(board=state.board, captures=state.captures, turn=state.turn)
+                    tracker = PerformanceTracker(telemetry=self.telemetry)
+                    tracker.start_timer()
+                    move = ai.get_best_move(position, tracker, time_limit_ms=self.time_limit_ms)
+                    elapsed_ms = tracker.stop_timer()[0]
+                    if not self._stop.value:
+                        self.results[state.hash] = (move, tracker, elapsed_ms)
+                state.unmake_move()
+        finally:
+            ai.stop_flag = None
@@ -0,0 +1,29 @@
+from pente_game import PenteGame
+
+
+# Short move sequences (alternating White/Black) used as benchmark positions.
+POSITIONS = {
+    "opening": [(9, 9), (9, 10), (10, 10)],
+    "midgame": [(9, 9), (9, 10), (10, 10), (8, 8), (11, 11), (10, 9), (8, 10), (12, 12)],
+    "capture": [(9, 9), (9, 10), (10, 10), (9, 11), (8, 8), (11, 11), (9, 12), (10, 9)],
+}
+
+
+def build_game(config, moves):
+    game = PenteGame(config)
+    for r, c in moves:
+        game.make_move(r, c)
+    return game
+
+
+def random_opening(config, rng, plies):
+    """Random moves next to the centre, so the self-play games do not all repeat."""
+    center_r, center_c = config.ROWS // 2, config.COLS // 2
+    game = build_game(config, [])
+    moves = []
+    while len(moves) < plies:
+        r = center_r + rng.randint(-2, 2)
+        c = center_c + rng.randint(-2, 2)
+        if game.board[r][c] == 0 and game.make_move(r, c):
+            moves.append((r, c))
+    return moves
@@ -0,0 +1,167 @@
+import argparse
+import cProfile
+import glob
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class SearchProfiler:
+    """
+    Profiles engine searches one move at a time.
+
+    run() calls the search under cProfile while a sampling thread records the
+    searching thread's Python stack every interval_ms. Each move leaves
+    <label>.pstats and <label>.collapsed in directory; the collapsed file has
+    one "outer;...;inner count" line per sampled stack, the input format of
+    flamegraph.pl and speedscope. With sampling_only the cProfile pass (and
+    its overhead, often 2x or more) is skipped and only stacks are written.
+    aggregate() merges a directory of profiles, e.g. of a whole benchmark run.
+    """
+
+    # Written by main(); skipped when a directory is aggregated.
+    COMBINED_NAME = "combined.collapsed"
+
+    def __init__(self, directory, interval_ms=1.0, sampling_only=False):
+        self.directory = directory
+        self.interval_ms = interval_ms
+        self.sampling_only = sampling_only
+        # Moves profiled so far; numbers the files of unlabelled moves.
+        self.moves = 0
+        self.session = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}"
+
+    def run(self, label, func, *args, **kwargs):
+        """Returns func(*args, **kwargs), profiled into <label> files (an automatic name if label is None)."""
+        self.moves += 1
+        if label is None:
+            label = f"{self.session}-{self.moves:04d}"
+        sampler = _StackSampler(threading.get_ident(), self.interval_ms / 1000.0, self.run.__code__)
+        profile = None if self.sampling_only else cProfile.Profile()
+        # The sampler only runs when the search thread releases the GIL.
+        switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(min(switch_interval, self.interval_ms / 1000.0))
+        sampler.start()
+        if profile is not None:
+            profile.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            if profile is not None:
+                profile.disable()
+            sampler.stop()
+            sys.setswitchinterval(switch_interval)
+            self._dump(label, profile, sampler.stacks)
+
+    def _dump(self, label, profile, stacks):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = os.path.join(self.directory, label)
+            if profile is not None:
+                profile.dump_stats(path + ".pstats")
+            write_collapsed(path + ".collapsed", stacks)
+        except OSError as e:
+            print(f"Warning: Could not write profile {label} to {self.directory}: {e}")
+
+
+class _StackSampler(threading.Thread):
+    """Counts the stacks of another thread, from the frame below stop_code down to the running one."""
+
+    def __init__(self, thread_id, interval, stop_code):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stop_code = stop_code
+        self.stacks = Counter()
+        self._done = threading.Event()
+
+    def run(self):
+        while not self._done.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            names = []
+            while frame is not None and frame.f_code is not self.stop_code:
+                code = frame.f_code
+                # co_qualname (Class.method) is Python 3.11+; older versions only have the bare name.
+                name = getattr(code, "co_qualname", code.co_name)
+                names.append(f"{os.path.basename(code.co_filename)}:{name}")
+                frame = frame.f_back
+            if names:
+                self.stacks[";".join(reversed(names))] += 1
+
+    def stop(self):
+        self._done.set()
+        self.join()
+
+
+def write_collapsed(path, stacks):
+    with open(path, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
+
+
+def read_collapsed(path):
+    stacks = Counter()
+    with open(path) as f:
+        for line in f:
+            stack, _, count = line.rstrip("\n").rpartition(" ")
+            if stack:
+                stacks[stack] += int(count)
+    return stacks
+
+
+def aggregate(directory):
+    """
+    Merges every profile in directory: returns (pstats.Stats of all .pstats
+    files or None if there are none, Counter of all collapsed stacks).
+    """
+    stats = None
+    for path in sorted(glob.glob(os.path.join(directory, "*.pstats"))):
+        if stats is None:
+            stats = pstats.Stats(path)
+        else:
+            stats.add(path)
+    stacks = Counter()
+    for path in sorted(glob.glob(os.path.join(directory, "*.collapsed"))):
+        if os.path.basename(path) != SearchProfiler.COMBINED_NAME:
+            stacks.update(read_collapsed(path))
+    return stats, stacks
+
+
+def hot_functions(stats, top=20):
+    """The top functions by own time, as JSON-ready dicts with their share of the total own time."""
+    total = stats.total_tt or 1.0
+    rows = []
+    for (filename, line, name), (_, calls, own, cumulative, _) in stats.stats.items():
+        rows.append({
+            "function": f"{os.path.basename(filename)}:{line}({name})",
+            "calls": calls,
+            "own_ms": own * 1000,
+            "cumulative_ms": cumulative * 1000,
+            "own_pct": 100.0 * own / total,
+        })
+    rows.sort(key=lambda row: row["own_ms"], reverse=True)
+    return rows[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Merge the per-move search profiles in a directory.")
+    parser.add_argument("directory")
+    parser.add_argument("--top", type=int, default=20, help="Functions listed")
+    parser.add_argument("--sort", default="tottime", help="pstats sort key of the printed listing")
+    args = parser.parse_args()
+
+    stats, stacks = aggregate(args.directory)
+    if stats is None and not stacks:
+        raise SystemExit(f"No profiles in {args.directory}")
+    if stats is not None:
+        stats.sort_stats(args.sort).print_stats(args.top)
+    if stacks:
+        path = os.path.join(args.directory, SearchProfiler.COMBINED_NAME)
+        write_collapsed(path, stacks)
+        print(f"Wrote {sum(stacks.values())} samples in {len(stacks)} stacks to {path}")
+
+
+if __name__ == "__main__":
+    main()
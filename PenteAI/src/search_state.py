@@ -0,0 +1,263 @@
+from incremental_heuristics import IncrementalHeuristics
+from zobrist import get_zobrist_keys, transform_cell
+
+
+class SearchState:
+    """
+    Mutable board used by the search. Moves are applied in place with make_move()
+    and reverted with unmake_move(), so a whole tree is searched without copying
+    the board at every node.
+    """
+
+    DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+
+    # Neighbourhood radii the AI can ask candidate moves for.
+    CANDIDATE_RADII = (1, 2)
+    _NEIGHBOURS_CACHE = {}
+
+    def __init__(self, board_matrix, captures, turn, config, incremental_eval=True, track_symmetries=False):
+        self.board = [row[:] for row in board_matrix]
+        self.captures = captures.copy()
+        self.turn = turn
+        self.rows = config.ROWS
+        self.cols = config.COLS
+        self.win_capture_count = config.WIN_CAPTURE_COUNT
+        self.game_over = False
+        self.winner = None
+        self.zobrist = get_zobrist_keys(self.rows, self.cols)
+        self.hash = self.zobrist.hash_position(self.board, self.captures, self.turn)
+        # Hashes of the position under every board symmetry (zobrist.symmetries
+        # order), kept up to date on make/unmake when tracked; see canonical().
+        self.sym_hashes = None
+        if track_symmetries:
+            self.sym_hashes = self.zobrist.symmetric_hashes(self.board, self.captures, self.turn)
+        # Undo stack of (row, col, captured_cells, prev_game_over, prev_winner, prev_hash, prev_sym_hashes).
+        self.history = []
+
+        # For every tracked radius, near_counts[radius][r][c] is the number of
+        # stones within that (Chebyshev) distance of the cell, and candidates
+        # holds the empty cells whose count is non-zero. Both are maintained on
+        # make/unmake. A radius is only tracked from its first candidate_moves()
+        # call, so a search that never asks for radius 2 does not pay for it.
+        self.neighbours = self._get_neighbours(self.rows, self.cols)
+        self.stone_count = 0
+        self.near_counts = {}
+        self.candidates = {}
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if self.board[r][c] != 0:
+                    self._on_stone_added(r, c)
+
+        # Cached per-line shape scores, notified of every stone added or removed.
+        self.evaluator = None
+        if incremental_eval:
+            self.evaluator = IncrementalHeuristics(self.board, self.rows, self.cols)
+
+    def make_move(self, row, col):
+        if self.board[row][col] != 0:
+            return False
+        me = self.turn
+        evaluator = self.evaluator
+        if evaluator is not None:
+            # unmake_move() rolls the scores back instead of re-scoring the lines.
+            evaluator.checkpoint(self.board)
+        self.board[row][col] = me
+        prev_captures = self.captures[me]
+        captured = self._apply_captures(row, col, me)
+        self._on_stone_added(row, col)
+        for r, c in captured:
+            self._on_stone_removed(r, c, 3 - me)
+        if evaluator is not None:
+            evaluator.stone_added(row, col, me)
+            for r, c in captured:
+                evaluator.stone_removed(r, c, 3 - me)
+        self.history.append((row, col, captured, self.game_over, self.winner, self.hash, self.sym_hashes))
+
+        z = self.zobrist
+        h = self.hash ^ z.stones[me][row][col] ^ z.side
+        # Side and capture-count keys are the same in every orientation.
+        shared = z.side
+        if captured:
+            opp_stones = z.stones[3 - me]
+            for r, c in captured:
+                h ^= opp_stones[r][c]
+            capture_keys = z.captures[me][prev_captures] ^ z.captures[me][self.captures[me]]
+            h ^= capture_keys
+            shared ^= capture_keys
+        self.hash = h
+
+        if self.sym_hashes is not None:
+            sym_hashes = []
+            for x, table in zip(self.sym_hashes, z.sym_stones):
+                x ^= shared ^ table[me][row][col]
+                for r, c in captured:
+                    x ^= table[3 - me][r][c]
+                sym_hashes.append(x)
+            self.sym_hashes = sym_hashes
+
+        if self._check_win(row, col, me):
+            self.game_over = True
+            self.winner = me
+        self.turn = 3 - me
+        return True
+
+    def unmake_move(self):
+        row, col, captured, game_over, winner, prev_hash, prev_sym_hashes = self.history.pop()
+        me = 3 - self.turn
+        opp = self.turn
+        self.board[row][col] = 0
+        self._on_stone_removed(row, col, me)
+        for r, c in captured:
+            self.board[r][c] = opp
+            self._on_stone_added(r, c)
+        self.captures[me] -= len(captured)
+        if self.evaluator is not None:
+            self.evaluator.rollback()
+        self.game_over = game_over
+        self.winner = winner
+        self.hash = prev_hash
+        self.sym_hashes = prev_sym_hashes
+        self.turn = me
+
+    def canonical(self):
+        """
+        (hash, symmetry) of the canonical orientation: the smallest symmetric
+        hash and the symmetry producing it. Needs track_symmetries.
+        """
+        hashes = self.sym_hashes
+        best = min(hashes)
+        return best, self.zobrist.symmetries[hashes.index(best)]
+
+    def self_symmetries(self):
+        """Non-identity symmetries that map the current position onto itself. Needs track_symmetries."""
+        board = self.board
+        rows, cols = self.rows, self.cols
+        found = []
+        for symmetry, h in zip(self.zobrist.symmetries[1:], self.sym_hashes[1:]):
+            if h != self.sym_hashes[0]:
+                continue
+            # Confirm on the board itself rather than trusting the hash.
+            if all(
+                board[r][c] == board[tr][tc]
+                for r in range(rows)
+                for c in range(cols)
+                if board[r][c] != 0
+                for tr, tc in (transform_cell(symmetry, r, c, rows, cols),)
+            ):
+                found.append(symmetry)
+        return found
+
+    def board_occupied(self):
+        return self.stone_count > 0
+
+    def candidate_moves(self, radius):
+        """Empty cells within radius of any stone, read from the maintained set."""
+        candidates = self.candidates.get(radius)
+        if candidates is None:
+            candidates = self._track_radius(radius)
+        return list(candidates)
+
+    def _track_radius(self, radius):
+        """Builds the near counts and candidate set of radius from the board and keeps them up to date from now on."""
+        board = self.board
+        counts = [[0] * self.cols for _ in range(self.rows)]
+        neighbours = self.neighbours[radius]
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if board[r][c] != 0:
+                    for nr, nc in neighbours[r][c]:
+                        counts[nr][nc] += 1
+        candidates = {
+            (r, c) for r in range(self.rows) for c in range(self.cols) if counts[r][c] and board[r][c] == 0
+        }
+        self.near_counts[radius] = counts
+        self.candidates[radius] = candidates
+        return candidates
+
+    def _on_stone_added(self, r, c):
+        self.stone_count += 1
+        board = self.board
+        for radius, counts in self.near_counts.items():
+            cands = self.candidates[radius]
+            cands.discard((r, c))
+            for nr, nc in self.neighbours[radius][r][c]:
+                counts[nr][nc] += 1
+                if counts[nr][nc] == 1 and board[nr][nc] == 0:
+                    cands.add((nr, nc))
+
+    def _on_stone_removed(self, r, c, color):
+        self.stone_count -= 1
+        for radius, counts in self.near_counts.items():
+            cands = self.candidates[radius]
+            for nr, nc in self.neighbours[radius][r][c]:
+                counts[nr][nc] -= 1
+                if counts[nr][nc] == 0:
+                    cands.discard((nr, nc))
+            if counts[r][c] > 0:
+                cands.add((r, c))
+
+    @classmethod
+    def _get_neighbours(cls, rows, cols):
+        """Per-radius, per-cell lists of in-bounds neighbours (excluding the cell itself)."""
+        neighbours = cls._NEIGHBOURS_CACHE.get((rows, cols))
+        if neighbours is None:
+            neighbours = {}
+            for radius in cls.CANDIDATE_RADII:
+                neighbours[radius] = [
+                    [
+                        [
+                            (r + dr, c + dc)
+                            for dr in range(-radius, radius + 1)
+                            for dc in range(-radius, radius + 1)
+                            if (dr or dc) and 0 <= r + dr < rows and 0 <= c + dc < cols
+                        ]
+                        for c in range(cols)
+                    ]
+                    for r in range(rows)
+                ]
+            cls._NEIGHBOURS_CACHE[(rows, cols)] = neighbours
+        return neighbours
+
+    def _apply_captures(self, r, c, me):
+        board = self.board
+        opp = 3 - me
+        captured = []
+        for dr, dc in self.DIRECTIONS:
+            for sign in (1, -1):
+                r3, c3 = r + 3 * dr * sign, c + 3 * dc * sign
+                if 0 <= r3 < self.rows and 0 <= c3 < self.cols:
+                    r1, c1 = r + dr * sign, c + dc * sign
+                    r2, c2 = r + 2 * dr * sign, c + 2 * dc * sign
+                    if (
+                        board[r1][c1] == opp
+                        and board[r2][c2] == opp
+                        and board[r3][c3] == me
+                    ):
+                        board[r1][c1] = 0
+                        board[r2][c2] = 0
+                        captured.append((r1, c1))
+                        captured.append((r2, c2))
+        if captured:
+            self.captures[me] += len(captured)
+        return captured
+
+    def _check_win(self, r, c, me):
+        if self.captures[me] >= self.win_capture_count:
+            return True
+        board = self.board
+        rows, cols = self.rows, self.cols
+        for dr, dc in self.DIRECTIONS:
+            count = 1
+            tr, tc = r + dr, c + dc
+            while 0 <= tr < rows and 0 <= tc < cols and board[tr][tc] == me:
+                count += 1
+                tr += dr
+                tc += dc
+            tr, tc = r - dr, c - dc
+            while 0 <= tr < rows and 0 <= tc < cols and board[tr][tc] == me:
+                count += 1
+                tr -= dr
+                tc -= dc
+            if count >= 5:
+                return True
+        return False
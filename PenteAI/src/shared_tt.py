@@ -0,0 +1,147 @@
+import random
+import struct
+from multiprocessing import shared_memory
+
+from transposition_table import TranspositionTable
+
+
+class SharedTranspositionTable:
+    """
+    Transposition table stored in multiprocessing.shared_memory so several
+    search processes can read each other's results.
+
+    The table is a packed array of fixed-width records laid out as two-slot
+    buckets (depth-preferred + always-replace, like TranspositionTable). There
+    are no locks: each record stores its key XOR-ed with its data words, so a
+    record torn by two processes writing at once fails verification on probe
+    and is treated as a miss.
+
+    Records carry the low byte of the search generation they were stored in.
+    Unlike TranspositionTable, new_search() does not advance it: every
+    process must age the table alike, so the searching parent sets generation
+    on each process's table itself.
+    """
+
+    EXACT = TranspositionTable.EXACT
+    LOWER = TranspositionTable.LOWER
+    UPPER = TranspositionTable.UPPER
+
+    # checked key, score, depth, flag, move row, move col (-1 for no move), age, padding.
+    RECORD = struct.Struct("<QdhBbbB2x")
+    DATA = struct.Struct("<QQ")  # the 16 data bytes after the key, as two words
+    EMPTY_DEPTH = -1
+    KEY_MASK = (1 << 64) - 1
+
+    def __init__(self, size_mb=16, name=None):
+        size = self.RECORD.size
+        if name is None:
+            entries = max(2, int(size_mb * 1024 * 1024) // size)
+            self.num_buckets = entries // 2
+            self.shm = shared_memory.SharedMemory(create=True, size=self.num_buckets * 2 * size)
+            self.owner = True
+            self.clear()
+        else:
+            self.shm = _attach(name)
+            self.num_buckets = self.shm.size // (2 * size)
+            self.owner = False
+        self.name = self.shm.name
+        self.size = self.num_buckets * 2
+        self.buf = self.shm.buf
+        self.generation = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+        }
+
+    def new_search(self):
+        """Kept for interface parity with TranspositionTable; see the class docstring."""
+
+    def clear(self):
+        record = self._pack(0, self.EMPTY_DEPTH, 0, 0, None, 0)
+        self.shm.buf[: len(record) * self.num_buckets * 2] = record * (self.num_buckets * 2)
+
+    def close(self):
+        self.buf = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def probe(self, key):
+        """Returns (depth, flag, score, move) for key, or None on a miss."""
+        i = (key % self.num_buckets) * 2
+        occupied = False
+        for slot in (i, i + 1):
+            entry_key, depth, flag, score, move, _ = self._read(slot)
+            if depth == self.EMPTY_DEPTH:
+                continue
+            if entry_key == key:
+                self.hits += 1
+                return depth, flag, score, move
+            occupied = True
+        self.misses += 1
+        if occupied:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        i = (key % self.num_buckets) * 2
+        first = self._read(i)
+        first_used = first[1] != self.EMPTY_DEPTH
+        age = self.generation & 0xFF
+        if (first_used and first[0] == key) or depth >= first[1] or first[5] != age:
+            # Same replacement scheme as TranspositionTable.store.
+            if first_used and first[0] != key:
+                self._write(i + 1, *first)
+            else:
+                second = self._read(i + 1)
+                if second[1] != self.EMPTY_DEPTH and second[0] == key:
+                    self._write(i + 1, 0, self.EMPTY_DEPTH, 0, 0, None, 0)
+            self._write(i, key, depth, flag, score, move, age)
+        else:
+            self._write(i + 1, key, depth, flag, score, move, age)
+        self.stores += 1
+
+    def fill_ratio(self, samples=4096):
+        """Estimated share of occupied slots, from a fixed pseudo-random sample."""
+        rng = random.Random(0)
+        samples = min(samples, self.size)
+        used = 0
+        for _ in range(samples):
+            if self._read(rng.randrange(self.size))[1] != self.EMPTY_DEPTH:
+                used += 1
+        return used / samples
+
+    def _pack(self, key, depth, flag, score, move, age):
+        r, c = move if move is not None else (-1, -1)
+        raw = self.RECORD.pack(0, score, depth, flag, r, c, age)
+        w1, w2 = self.DATA.unpack_from(raw, 8)
+        return self.RECORD.pack((key ^ w1 ^ w2) & self.KEY_MASK, score, depth, flag, r, c, age)
+
+    def _write(self, slot, key, depth, flag, score, move, age):
+        self.buf[slot * self.RECORD.size : (slot + 1) * self.RECORD.size] = self._pack(
+            key, depth, flag, score, move, age
+        )
+
+    def _read(self, slot):
+        offset = slot * self.RECORD.size
+        checked, score, depth, flag, r, c, age = self.RECORD.unpack_from(self.buf, offset)
+        w1, w2 = self.DATA.unpack_from(self.buf, offset + 8)
+        move = (r, c) if r >= 0 else None
+        return checked ^ w1 ^ w2, depth, flag, score, move, age
+
+
+def _attach(name):
+    # Worker processes share the parent's resource tracker, so attaching does
+    # not schedule a second unlink; only the creating table unlinks on close().
+    return shared_memory.SharedMemory(name=name)
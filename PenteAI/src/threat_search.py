@@ -0,0 +1,431 @@
+class ThreatBudgetExceeded(Exception):
+    """Raised inside the threat search when its node budget or the caller's time is used up."""
+
+
+class ThreatSearch:
+    """
+    Threat-space search for forced wins (VCF, extended with open threes and
+    capture threats).
+
+    The attacker only tries forcing moves: fours, capture threats and
+    captures once a capture win is within reach, and open threes. After each
+    one the defender is only given the replies that could stop the threat:
+    the attacker's winning cells plus every capture (a capture can break up a
+    four), or for an open three the cells of the three's windows, captures
+    and counter-fours. A win is proven when the attacker wins against every
+    such reply. find_win() returns the first move of a proven win, or None
+    when there is none within max_depth attacker moves or the node budget,
+    or when its should_stop callback reports that the caller ran out of time.
+
+    Candidates are generated here rather than taken from the search state's
+    radius-2 set (which would then be kept up to date for the rest of the
+    main search). At the root they are the cells with two attacker stones
+    along one of their lines, where fours and threes are made, and the cells
+    next to a defender stone, where captures are. Deeper attacks only follow
+    up on the previous threat: the cells on its four lines and the cells
+    next to the defender's reply. The immediate wins and captures of both
+    sides are kept up to date from node to node rather than rescanned.
+    """
+
+    DIRECTIONS = [(0, 1), (1, 0), (1, 1), (1, -1)]
+    RAYS = [(dr * sign, dc * sign) for dr, dc in DIRECTIONS for sign in (1, -1)]
+
+    def __init__(self, rows, cols, node_budget, max_depth=5, allow_threes=True):
+        self.rows = rows
+        self.cols = cols
+        self.node_budget = node_budget
+        self.max_depth = max_depth
+        self.allow_threes = allow_threes
+        self.nodes = 0
+        self._no_win = {}
+        self._should_stop = None
+
+    def find_win(self, state, should_stop=None):
+        """First move of a forced win for the side to move, or None. should_stop() is polled once per node."""
+        self.nodes = 0
+        self._no_win = {}
+        self._should_stop = should_stop
+        if state.game_over or state.stone_count == 0:
+            return None
+        base = len(state.history)
+        try:
+            return self._attack(state, state.turn, self.max_depth, None)
+        except ThreatBudgetExceeded:
+            while len(state.history) > base:
+                state.unmake_move()
+            return None
+
+    def _count_node(self):
+        self.nodes += 1
+        if self.nodes > self.node_budget or (self._should_stop is not None and self._should_stop()):
+            raise ThreatBudgetExceeded()
+
+    def _attack(self, state, me, depth, parent):
+        self._count_node()
+        board = state.board
+        tactics = self._tactics(state, parent)
+        wins, _ = tactics
+        if wins[me]:
+            return next(iter(wins[me]))
+        opp_wins = list(wins[3 - me])
+        if depth == 0 or self._no_win.get(state.hash, -1) >= depth:
+            return None
+
+        if depth == self.max_depth:
+            candidates = self._threat_cells(board, me)
+        else:
+            threat, reply = state.history[-2][:2], state.history[-1][:2]
+            candidates = list(dict.fromkeys(self._follow_up_cells(board, threat, reply, me) + opp_wins))
+        threats = self._forcing_moves(state, candidates, me, depth)
+        if opp_wins:
+            # The defender threatens to win: only blocks or captures can keep the attack going.
+            allowed = set(opp_wins)
+            threats = [move for move in threats if move in allowed or self._capture_pairs(board, *move, me)]
+
+        for move in threats:
+            if not state.make_move(*move):
+                continue
+            try:
+                won = self._defend(state, me, depth - 1, tactics)
+            finally:
+                state.unmake_move()
+            if won:
+                return move
+        self._no_win[state.hash] = depth
+        return None
+
+    def _defend(self, state, attacker, depth, parent):
+        """True if the attacker still wins against every reply to the last threat."""
+        self._count_node()
+        if state.game_over:
+            return state.winner == attacker
+        board = state.board
+        defender = 3 - attacker
+        tactics = self._tactics(state, parent)
+        wins, captures = tactics
+        # The defender's wins end the attack, the attacker's wins must be blocked.
+        if wins[defender]:
+            return False
+
+        replies = list(wins[attacker])
+        if not replies:
+            if depth == 0:
+                return False
+            row, col = state.history[-1][:2]
+            replies = self._three_defences(board, row, col, attacker)
+            if not replies:
+                # The last move was not a threat after all.
+                return False
+            replies += [
+                move for move in self._threat_cells(board, defender, 3, False)
+                if self._makes_four(board, *move, defender)
+            ]
+        replies += captures[defender]
+
+        for move in dict.fromkeys(replies):
+            if not state.make_move(*move):
+                continue
+            try:
+                won = self._attack(state, attacker, depth, tactics) is not None
+            finally:
+                state.unmake_move()
+            if not won:
+                return False
+        return True
+
+    def _tactics(self, state, parent):
+        """
+        (wins, captures): per colour, the empty cells where it wins at once and
+        where it captures a pair. Whether a cell does depends only on the cells
+        up to four steps along its rays, so given the parent node's tactics just
+        the cells around the last move and the stones it captured are checked
+        again, plus the mover's capturing cells when its capture count went up.
+        """
+        board = state.board
+        rows, cols = self.rows, self.cols
+        if parent is None:
+            cells = state.candidate_moves(1)
+            wins = {1: set(), 2: set()}
+            captures = {1: set(), 2: set()}
+        else:
+            row, col, captured = state.history[-1][:3]
+            cells = dict.fromkeys(captured)
+            for r, c in [(row, col)] + list(captured):
+                for dr, dc in self.RAYS:
+                    for i in range(1, 5):
+                        tr, tc = r + i * dr, c + i * dc
+                        if not (0 <= tr < rows and 0 <= tc < cols):
+                            break
+                        if board[tr][tc] == 0:
+                            cells[(tr, tc)] = None
+            if captured:
+                mover = board[row][col]
+                cells.update((cell, None) for cell in parent[1][mover] if board[cell[0]][cell[1]] == 0)
+            stale = set(cells)
+            stale.add((row, col))
+            wins = {color: parent[0][color] - stale for color in (1, 2)}
+            captures = {color: parent[1][color] - stale for color in (1, 2)}
+
+        needed = {color: state.win_capture_count - state.captures[color] for color in (1, 2)}
+        for r, c in cells:
+            pairs = [0, 0, 0]
+            alone = True
+            for dr, dc in self.RAYS:
+                tr, tc = r + dr, c + dc
+                if not (0 <= tr < rows and 0 <= tc < cols) or board[tr][tc] == 0:
+                    continue
+                # Without a stone next to it a cell can neither win nor capture.
+                alone = False
+                pair = board[tr][tc]
+                r3, c3 = r + 3 * dr, c + 3 * dc
+                if 0 <= r3 < rows and 0 <= c3 < cols and board[r + 2 * dr][c + 2 * dc] == pair:
+                    end = board[r3][c3]
+                    if end and end != pair:
+                        pairs[end] += 1
+            if alone:
+                continue
+            for color in (1, 2):
+                if pairs[color]:
+                    captures[color].add((r, c))
+                    if 2 * pairs[color] >= needed[color]:
+                        wins[color].add((r, c))
+            for dr, dc in self.DIRECTIONS:
+                runs = [0, 1, 1]
+                for sr, sc in ((dr, dc), (-dr, -dc)):
+                    tr, tc = r + sr, c + sc
+                    if not (0 <= tr < rows and 0 <= tc < cols):
+                        continue
+                    color = board[tr][tc]
+                    while color and 0 <= tr < rows and 0 <= tc < cols and board[tr][tc] == color:
+                        runs[color] += 1
+                        tr += sr
+                        tc += sc
+                for color in (1, 2):
+                    if runs[color] >= 5:
+                        wins[color].add((r, c))
+        return wins, captures
+
+    def _forcing_moves(self, state, candidates, me, depth):
+        board = state.board
+        needed = state.win_capture_count - state.captures[me]
+        threes_allowed = self.allow_threes and depth >= 2
+        fours, capture_threats, captures, threes = [], [], [], []
+        for r, c in candidates:
+            pairs = self._capture_pairs(board, r, c, me)
+            lines = self._lines(board, r, c)
+            if self._four_in(lines, me):
+                fours.append((r, c))
+            elif needed - 2 * pairs <= 2 and self._threatens_capture(board, r, c, me):
+                capture_threats.append((r, c))
+            elif pairs and needed - 2 * pairs <= 2:
+                captures.append((r, c))
+            elif threes_allowed and any(self._three_offsets(lines, me)):
+                threes.append((r, c))
+        return fours + capture_threats + captures + threes
+
+    def _threat_cells(self, board, me, stones=2, captures=True):
+        """
+        Empty cells where me could make a four, an open three or (with captures)
+        a capture or capture threat: cells with at least stones stones of me up
+        to four steps along one line, no opponent stone in between, and cells
+        next to an opponent stone. stones=3 without captures leaves the fours.
+        """
+        rows, cols = self.rows, self.cols
+        opp = 3 - me
+        counts = {}
+        cells = {}
+        for r in range(rows):
+            row = board[r]
+            for c in range(cols):
+                color = row[c]
+                if color == me:
+                    for ray, (dr, dc) in enumerate(self.RAYS):
+                        tr, tc = r, c
+                        for _ in range(4):
+                            tr += dr
+                            tc += dc
+                            if not (0 <= tr < rows and 0 <= tc < cols) or board[tr][tc] == opp:
+                                break
+                            if board[tr][tc] == 0:
+                                # RAYS lists both signs of each direction in turn.
+                                key = (tr, tc, ray // 2)
+                                counts[key] = counts.get(key, 0) + 1
+                                if counts[key] == stones:
+                                    cells[(tr, tc)] = None
+                elif color and captures:
+                    for dr, dc in self.RAYS:
+                        tr, tc = r + dr, c + dc
+                        if 0 <= tr < rows and 0 <= tc < cols and board[tr][tc] == 0:
+                            cells[(tr, tc)] = None
+        return list(cells)
+
+    def _follow_up_cells(self, board, threat, reply, me):
+        """
+        Empty cells that build on the threat me played: up to four steps along its
+        lines, stopping at an opponent stone, plus the cells next to the reply.
+        """
+        rows, cols = self.rows, self.cols
+        opp = 3 - me
+        cells = {}
+        r, c = threat
+        for dr, dc in self.RAYS:
+            tr, tc = r, c
+            for _ in range(4):
+                tr += dr
+                tc += dc
+                if not (0 <= tr < rows and 0 <= tc < cols) or board[tr][tc] == opp:
+                    break
+                if board[tr][tc] == 0:
+                    cells[(tr, tc)] = None
+        r, c = reply
+        for dr, dc in self.RAYS:
+            tr, tc = r + dr, c + dc
+            if 0 <= tr < rows and 0 <= tc < cols and board[tr][tc] == 0:
+                cells[(tr, tc)] = None
+        return list(cells)
+
+    def _capture_pairs(self, board, r, c, me):
+        """Number of opponent pairs me would capture by playing (r, c)."""
+        rows, cols = self.rows, self.cols
+        opp = 3 - me
+        pairs = 0
+        for dr, dc in self.RAYS:
+            r3, c3 = r + 3 * dr, c + 3 * dc
+            if (
+                0 <= r3 < rows
+                and 0 <= c3 < cols
+                and board[r + dr][c + dc] == opp
+                and board[r + 2 * dr][c + 2 * dc] == opp
+                and board[r3][c3] == me
+            ):
+                pairs += 1
+        return pairs
+
+    def _threatens_capture(self, board, r, c, me):
+        """True if (r, c) flanks an opponent pair whose far end is empty."""
+        rows, cols = self.rows, self.cols
+        opp = 3 - me
+        for dr, dc in self.RAYS:
+            r3, c3 = r + 3 * dr, c + 3 * dc
+            if (
+                0 <= r3 < rows
+                and 0 <= c3 < cols
+                and board[r + dr][c + dc] == opp
+                and board[r + 2 * dr][c + 2 * dc] == opp
+                and board[r3][c3] == 0
+            ):
+                return True
+        return False
+
+    def _makes_four(self, board, r, c, me):
+        """True if me at (r, c) leaves a 5-cell window with four stones and one empty cell."""
+        return self._four_in(self._lines(board, r, c), me)
+
+    def _four_in(self, lines, me):
+        for line in lines:
+            if line.count(me) < 3:
+                continue
+            for start in range(5):
+                window = line[start:start + 5]
+                # The centre is one of the empty cells; an opponent or off-board cell rules the window out.
+                if window.count(me) == 3 and window.count(0) == 2:
+                    return True
+        return False
+
+    def _three_defences(self, board, r, c, me):
+        """Empty cells of the open threes through the stone me just played at (r, c)."""
+        cells = []
+        for (dr, dc), offsets in zip(self.DIRECTIONS, self._three_offsets(self._lines(board, r, c), me)):
+            for offset in offsets:
+                for i in range(offset, offset + 6):
+                    tr, tc = r + i * dr, c + i * dc
+                    if board[tr][tc] == 0:
+                        cells.append((tr, tc))
+        return list(dict.fromkeys(cells))
+
+    def _three_offsets(self, lines, me):
+        """
+        Per line, the start offsets (from the centre) of the 6-cell windows with both
+        end cells empty and three of me plus one empty cell inside, counting the centre as me.
+        """
+        found = []
+        for line in lines:
+            offsets = []
+            if line.count(me) + (line[4] != me) >= 3:
+                line = line[:4] + [me] + line[5:]
+                for start in range(4):
+                    if line[start] != 0 or line[start + 5] != 0:
+                        continue
+                    inner = line[start + 1:start + 5]
+                    if inner.count(me) == 3 and inner.count(0) == 1:
+                        offsets.append(start - 4)
+            found.append(offsets)
+        return found
+
+    def _lines(self, board, r, c):
+        return [self._line(board, r, c, dr, dc) for dr, dc in self.DIRECTIONS]
+
+    def _line(self, board, r, c, dr, dc):
+        """The cells from 4 before to 4 after (r, c) along (dr, dc), -1 where off the board."""
+        rows, cols = self.rows, self.cols
+        if 4 <= r < rows - 4 and 4 <= c < cols - 4:
+            return [board[r + i * dr][c + i * dc] for i in range(-4, 5)]
+        line = []
+        for i in range(-4, 5):
+            tr, tc = r + i * dr, c + i * dc
+            line.append(board[tr][tc] if 0 <= tr < rows and 0 <= tc < cols else -1)
+        return line
+
+
+def tactical_moves(state):
+    """
+    Forcing moves for the side to move among the cells next to a stone, in one
+    pass: (wins, blocks, captures) are the cells that win at once, the cells
+    where the opponent would win at once, and the cells that capture a pair.
+    """
+    board = state.board
+    rows, cols = state.rows, state.cols
+    me = state.turn
+    opp = 3 - me
+    my_needed = state.win_capture_count - state.captures[me]
+    opp_needed = state.win_capture_count - state.captures[opp]
+    wins, blocks, captures = [], [], []
+    for r, c in state.candidate_moves(1):
+        my_pairs = 0
+        opp_pairs = 0
+        for dr, dc in ThreatSearch.RAYS:
+            r3, c3 = r + 3 * dr, c + 3 * dc
+            if 0 <= r3 < rows and 0 <= c3 < cols:
+                pair = board[r + dr][c + dc]
+                if pair and board[r + 2 * dr][c + 2 * dc] == pair:
+                    end = board[r3][c3]
+                    if pair == opp and end == me:
+                        my_pairs += 1
+                    elif pair == me and end == opp:
+                        opp_pairs += 1
+
+        my_five = my_pairs > 0 and 2 * my_pairs >= my_needed
+        opp_five = opp_pairs > 0 and 2 * opp_pairs >= opp_needed
+        for dr, dc in ThreatSearch.DIRECTIONS:
+            if my_five and opp_five:
+                break
+            runs = {me: 1, opp: 1}
+            for sr, sc in ((dr, dc), (-dr, -dc)):
+                tr, tc = r + sr, c + sc
+                if not (0 <= tr < rows and 0 <= tc < cols):
+                    continue
+                color = board[tr][tc]
+                while color and 0 <= tr < rows and 0 <= tc < cols and board[tr][tc] == color:
+                    runs[color] += 1
+                    tr += sr
+                    tc += sc
+            my_five = my_five or runs[me] >= 5
+            opp_five = opp_five or runs[opp] >= 5
+
+        if my_five:
+            wins.append((r, c))
+        elif opp_five:
+            blocks.append((r, c))
+        if my_pairs:
+            captures.append((r, c))
+    return wins, blocks, captures
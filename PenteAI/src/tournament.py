@@ -0,0 +1,285 @@
+import argparse
+import hashlib
+import json
+import math
+import os
+import random
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from types import SimpleNamespace
+
+from ai_worker import ENGINES
+from config import Config
+from parallel_search import plain_config
+from pente_game import PenteGame
+from performance_tracker import PerformanceTracker
+from positions import random_opening
+
+# Keys every game record has; other lines in a results file are not games of this script.
+RESULT_KEYS = ("id", "white", "black", "winner", "reason", "plies", "latency_ms")
+
+
+def parse_engine(spec):
+    """
+    Parses "name:key=value,..." into (name, settings). engine= picks the
+    engine (alphabeta or mcts), UPPERCASE keys override Config settings for
+    that engine, and every other key is passed to the engine's constructor.
+    Values are read as JSON where possible (4, 0.5, true), else as strings.
+    """
+    name, _, options = spec.partition(":")
+    settings = {"engine": "alphabeta", "depth": 2}
+    for option in filter(None, options.split(",")):
+        key, _, value = option.partition("=")
+        try:
+            settings[key] = json.loads(value)
+        except ValueError:
+            settings[key] = value
+    if settings["engine"] not in ENGINES:
+        raise ValueError(f"Unknown engine in {spec!r}: {settings['engine']}")
+    return name, settings
+
+
+def load_openings(path):
+    """Opening move lists from a JSONL file of {"moves": [[row, col], ...]} records."""
+    openings = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                openings.append([tuple(move) for move in json.loads(line)["moves"]])
+    return openings
+
+
+def build_engine(settings, color, seed):
+    options = dict(settings)
+    engine = options.pop("engine")
+    config = plain_config(Config())
+    for key in [key for key in options if key.isupper()]:
+        config[key] = options.pop(key)
+    if engine == "mcts":
+        options.setdefault("seed", seed)
+    return ENGINES[engine](SimpleNamespace(**config), color, **options)
+
+
+def play_match(task):
+    """Pool task: plays one game and returns its result record."""
+    config = Config()
+    config.sound_enabled = False
+    players = {
+        1: build_engine(task["white"][1], 1, task["seed"]),
+        2: build_engine(task["black"][1], 2, task["seed"] + 1),
+    }
+    game = PenteGame(config)
+    for r, c in task["opening"]:
+        game.make_move(r, c)
+
+    latencies = {1: [], 2: []}
+    moves = [list(move) for move in task["opening"]]
+    reason = "max_plies"
+    try:
+        while len(moves) < task["max_plies"]:
+            if game.game_over:
+                break
+            mover = game.turn
+            start = time.perf_counter()
+            move = players[mover].get_best_move(game, PerformanceTracker(), time_limit_ms=task["time_ms"])
+            latencies[mover].append((time.perf_counter() - start) * 1000)
+            if move is None or not game.make_move(move[0], move[1]):
+                reason = "no_move"
+                break
+            moves.append(list(move))
+    finally:
+        for ai in players.values():
+            ai.close()
+
+    if game.game_over:
+        reason = "captures" if game.captures[game.winner] >= config.WIN_CAPTURE_COUNT else "five"
+    return {
+        "id": task["id"],
+        "white": task["white"][0],
+        "black": task["black"][0],
+        "winner": game.winner,
+        "reason": reason,
+        "plies": len(moves),
+        "moves": moves,
+        "latency_ms": {task["white"][0]: latencies[1], task["black"][0]: latencies[2]},
+    }
+
+
+def schedule(engines, games_per_pair, openings, opening_plies, time_ms, max_plies, seed):
+    """
+    Round-robin tasks. Each opening is played twice per pair with the colours
+    swapped, so neither engine profits from a lucky opening.
+    """
+    tasks = []
+    config = Config()
+    config.sound_enabled = False
+    for i, a in enumerate(engines):
+        for b in engines[i + 1:]:
+            for k in range(games_per_pair):
+                pair_index = k // 2
+                if openings:
+                    opening = openings[pair_index % len(openings)]
+                else:
+                    opening = random_opening(config, random.Random(seed * 100_003 + pair_index), opening_plies)
+                white, black = (a, b) if k % 2 == 0 else (b, a)
+                task = {
+                    "white": white,
+                    "black": black,
+                    "opening": opening,
+                    "time_ms": time_ms,
+                    "max_plies": max_plies,
+                    "seed": seed * 1_000_003 + k,
+                }
+                task["id"] = f"{a[0]}|{b[0]}|{k}|{_fingerprint(task)}"
+                tasks.append(task)
+    return tasks
+
+
+def _fingerprint(task):
+    """
+    Short hash of everything that decides a game (engine settings, opening,
+    time budget, ply limit and seed), so a rerun with other options does not
+    mistake earlier games for its own.
+    """
+    text = json.dumps(task, sort_keys=True)
+    return hashlib.sha1(text.encode()).hexdigest()[:12]
+
+
+def read_results(path):
+    """
+    Game records already in the results file. A line cut short by a killed run
+    is skipped, and so is any line that is not a game record.
+    """
+    records = []
+    if not os.path.exists(path):
+        return records
+    skipped = 0
+    with open(path) as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                skipped += 1
+                continue
+            if isinstance(record, dict) and all(key in record for key in RESULT_KEYS):
+                records.append(record)
+            else:
+                skipped += 1
+    if skipped:
+        print(f"Warning: Skipped {skipped} lines of {path} that are not game records")
+    return records
+
+
+def _ends_with_newline(path):
+    with open(path, "rb") as f:
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b"\n"
+
+
+def elo(wins, losses, draws, z=1.96):
+    """
+    Elo difference from a match score, with the bounds of the Wilson score
+    interval (z sigmas) converted to Elo, as (elo, low, high).
+    """
+    games = wins + losses + draws
+    if games == 0:
+        return 0.0, -math.inf, math.inf
+    score = (wins + 0.5 * draws) / games
+    z2 = z * z
+    center = (score + z2 / (2 * games)) / (1 + z2 / games)
+    margin = z * math.sqrt(score * (1 - score) / games + z2 / (4 * games * games)) / (1 + z2 / games)
+
+    def to_elo(s):
+        # Clamp so a clean sweep gives a large but finite number.
+        s = min(max(s, 0.5 / games), 1 - 0.5 / games)
+        return -400 * math.log10(1 / s - 1) + 0.0
+
+    return to_elo(score), to_elo(center - margin), to_elo(center + margin)
+
+
+def summarize(records):
+    pairs = defaultdict(lambda: [0, 0, 0])
+    latencies = defaultdict(list)
+    for record in records:
+        white, black = record["white"], record["black"]
+        a, b = sorted((white, black))
+        tally = pairs[(a, b)]
+        if record["winner"] is None:
+            tally[2] += 1
+        elif (white if record["winner"] == 1 else black) == a:
+            tally[0] += 1
+        else:
+            tally[1] += 1
+        for name, samples in record["latency_ms"].items():
+            latencies[name].extend(samples)
+
+    for (a, b), (wins, losses, draws) in sorted(pairs.items()):
+        diff, low, high = elo(wins, losses, draws)
+        print(
+            f"{a} vs {b}: {wins} wins, {losses} losses, {draws} draws"
+            f" | Elo {diff:+.0f} (95% CI {low:+.0f} .. {high:+.0f})"
+        )
+    for name, samples in sorted(latencies.items()):
+        pcts = PerformanceTracker.percentiles(samples)
+        mean = sum(samples) / len(samples) if samples else 0.0
+        print(
+            f"{name} move latency: {len(samples)} moves | mean {mean:.0f} ms"
+            f" | p50/p95/p99 {pcts.get(50, 0):.0f}/{pcts.get(95, 0):.0f}/{pcts.get(99, 0):.0f} ms"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless round-robin self-play between engine configurations.")
+    parser.add_argument("--engine", action="append", default=[], metavar="NAME:key=value,...",
+                        help="Engine configuration, e.g. ab3:depth=3 or mcts:engine=mcts,depth=10"
+                             " (give two or more; default: ab2:depth=2 and ab3:depth=3)")
+    parser.add_argument("--games", type=int, default=100, help="Games per pair of engines")
+    parser.add_argument("--time-ms", type=float, default=None, help="Per-move time budget")
+    parser.add_argument("--max-plies", type=int, default=200, help="Games longer than this are draws")
+    parser.add_argument("--openings", default=None, help="JSONL file of opening move lists (default: random)")
+    parser.add_argument("--opening-plies", type=int, default=2, help="Length of random openings")
+    parser.add_argument("--workers", type=int, default=None, help="Processes playing games (default: CPU count)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", default="tournament.jsonl",
+                        help="Results file; games already in it with the same settings are not played again")
+    parser.add_argument("--summary-only", action="store_true", help="Only summarize the whole results file")
+    args = parser.parse_args()
+
+    records = read_results(args.out)
+    if not args.summary_only:
+        engines = [parse_engine(spec) for spec in (args.engine or ["ab2:depth=2", "ab3:depth=3"])]
+        if len(engines) < 2:
+            parser.error("give at least two --engine configurations")
+        openings = load_openings(args.openings) if args.openings else None
+        tasks = schedule(engines, args.games, openings, args.opening_plies, args.time_ms, args.max_plies, args.seed)
+        # Only this schedule's games; records of other settings stay in the file for --summary-only.
+        task_ids = {task["id"] for task in tasks}
+        records = [record for record in records if record["id"] in task_ids]
+        done = {record["id"] for record in records}
+        tasks = [task for task in tasks if task["id"] not in done]
+        print(f"{len(done)} games already in {args.out}, {len(tasks)} to play")
+
+        with open(args.out, "a") as out, ProcessPoolExecutor(max_workers=args.workers) as pool:
+            if out.tell() > 0 and not _ends_with_newline(args.out):
+                # Close off a record cut short by a killed run.
+                out.write("\n")
+            futures = [pool.submit(play_match, task) for task in tasks]
+            for count, future in enumerate(as_completed(futures), 1):
+                record = future.result()
+                out.write(json.dumps(record) + "\n")
+                out.flush()
+                records.append(record)
+                print(
+                    f"[{count}/{len(tasks)}] {record['white']} (white) vs {record['black']} (black):"
+                    f" winner {record['winner']} by {record['reason']} in {record['plies']} plies"
+                )
+
+    summarize(records)
+
+
+if __name__ == "__main__":
+    main()
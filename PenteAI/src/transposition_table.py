@@ -0,0 +1,99 @@
+class TranspositionTable:
+    """
+    Fixed-size transposition table keyed by Zobrist hash.
+
+    Each bucket holds two entries: a depth-preferred slot that is only replaced
+    by an equal or deeper search, or by any search once its entry is from an
+    earlier search (new_search() ages the table), and an always-replace slot
+    that takes everything else. Entries are stored in parallel lists so the
+    whole table is allocated once up front.
+    """
+
+    EXACT = 0
+    LOWER = 1  # score is a lower bound (search failed high)
+    UPPER = 2  # score is an upper bound (search failed low)
+
+    # Approximate per-entry cost in CPython: six list slots (48 bytes) plus the
+    # boxed key, score and move tuple they point to. PerformanceTracker.retained_bytes
+    # measures about 166 bytes per entry on a full table. A part-filled table is
+    # smaller, so size_mb is an upper bound rather than the actual size.
+    ENTRY_BYTES = 168
+
+    def __init__(self, size_mb=16):
+        entries = max(2, int(size_mb * 1024 * 1024) // self.ENTRY_BYTES)
+        self.num_buckets = entries // 2
+        self.size = self.num_buckets * 2
+        self.keys = [None] * self.size
+        self.depths = [-1] * self.size
+        self.flags = [0] * self.size
+        self.scores = [0] * self.size
+        self.moves = [None] * self.size
+        # Search generation each entry was stored in; see new_search().
+        self.ages = [0] * self.size
+        self.generation = 0
+        self.reset_stats()
+
+    def new_search(self):
+        """Ages every stored entry, so entries of earlier searches give up their depth-preferred slot."""
+        self.generation += 1
+
+    def reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.collisions = 0
+        self.stores = 0
+
+    def stats(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "collisions": self.collisions,
+            "stores": self.stores,
+        }
+
+    def clear(self):
+        self.keys = [None] * self.size
+        self.depths = [-1] * self.size
+        self.moves = [None] * self.size
+        self.ages = [0] * self.size
+        self.reset_stats()
+
+    def probe(self, key):
+        """Returns (depth, flag, score, move) for key, or None on a miss."""
+        i = (key % self.num_buckets) * 2
+        keys = self.keys
+        if keys[i] == key:
+            self.hits += 1
+            return self.depths[i], self.flags[i], self.scores[i], self.moves[i]
+        if keys[i + 1] == key:
+            self.hits += 1
+            j = i + 1
+            return self.depths[j], self.flags[j], self.scores[j], self.moves[j]
+        self.misses += 1
+        if keys[i] is not None or keys[i + 1] is not None:
+            self.collisions += 1
+        return None
+
+    def store(self, key, depth, flag, score, move):
+        i = (key % self.num_buckets) * 2
+        if self.keys[i] == key or depth >= self.depths[i] or self.ages[i] != self.generation:
+            # A deeper (or same-position, or newer) result takes the depth-preferred
+            # slot; its previous occupant is demoted to the always-replace slot.
+            if self.keys[i] is not None and self.keys[i] != key:
+                self._write(i + 1, self.keys[i], self.depths[i], self.flags[i], self.scores[i], self.moves[i])
+                self.ages[i + 1] = self.ages[i]
+            elif self.keys[i + 1] == key:
+                self.keys[i + 1] = None
+                self.depths[i + 1] = -1
+            self._write(i, key, depth, flag, score, move)
+        else:
+            self._write(i + 1, key, depth, flag, score, move)
+        self.stores += 1
+
+    def _write(self, i, key, depth, flag, score, move):
+        self.keys[i] = key
+        self.depths[i] = depth
+        self.flags[i] = flag
+        self.scores[i] = score
+        self.moves[i] = move
+        self.ages[i] = self.generation
@@ -0,0 +1,118 @@
+import random
+
+# Inverse of each symmetry index used by transform_cell.
+SYMMETRY_INVERSE = (0, 3, 2, 1, 4, 5, 6, 7)
+
+
+class ZobristKeys:
+    """
+    Random 64-bit keys for every (colour, cell), the side to move and every
+    capture count, XOR-ed together into a position hash that can be updated
+    incrementally on every make/unmake.
+    """
+
+    SEED = 0x50E7E
+
+    def __init__(self, rows, cols):
+        rng = random.Random(self.SEED)
+        self.rows = rows
+        self.cols = cols
+        self.stones = {
+            color: [[rng.getrandbits(64) for _ in range(cols)] for _ in range(rows)]
+            for color in (1, 2)
+        }
+        self.side = rng.getrandbits(64)
+        # Capture counts can never exceed the number of cells on the board.
+        self.captures = {
+            color: [rng.getrandbits(64) for _ in range(rows * cols + 1)]
+            for color in (1, 2)
+        }
+        # Per board symmetry, the stone keys of each cell's image under it, so
+        # the hash of every rotated/reflected position can be kept incrementally.
+        self.symmetries = tuple(board_symmetries(rows, cols))
+        self.sym_stones = []
+        for symmetry in self.symmetries:
+            table = {1: [], 2: []}
+            for r in range(rows):
+                images = [transform_cell(symmetry, r, c, rows, cols) for c in range(cols)]
+                for color in (1, 2):
+                    table[color].append([self.stones[color][tr][tc] for tr, tc in images])
+            self.sym_stones.append(table)
+
+    def hash_position(self, board, captures, turn):
+        h = 0
+        for r in range(self.rows):
+            for c in range(self.cols):
+                if board[r][c] != 0:
+                    h ^= self.stones[board[r][c]][r][c]
+        h ^= self.captures[1][captures[1]]
+        h ^= self.captures[2][captures[2]]
+        if turn == 2:
+            h ^= self.side
+        return h
+
+    def symmetric_hashes(self, board, captures, turn):
+        """Hashes of the position under each of self.symmetries, in that order."""
+        base = self.captures[1][captures[1]] ^ self.captures[2][captures[2]]
+        if turn == 2:
+            base ^= self.side
+        hashes = []
+        for table in self.sym_stones:
+            h = base
+            for r in range(self.rows):
+                row = board[r]
+                for c in range(self.cols):
+                    if row[c] != 0:
+                        h ^= table[row[c]][r][c]
+            hashes.append(h)
+        return hashes
+
+    def canonical_hash(self, board, captures, turn):
+        """
+        Returns (hash, symmetry): the smallest hash over the rotations and
+        reflections of the position, and the symmetry that produces it. Maps a
+        cell into that canonical orientation with transform_cell(symmetry, ...).
+        """
+        hashes = self.symmetric_hashes(board, captures, turn)
+        best = min(hashes)
+        return best, self.symmetries[hashes.index(best)]
+
+
+def board_symmetries(rows, cols):
+    """Symmetry indices valid for the board: all eight on a square board, else the four that keep its shape."""
+    return range(8) if rows == cols else (0, 2, 4, 5)
+
+
+def transform_cell(symmetry, r, c, rows, cols):
+    """
+    Maps (r, c) through one of the eight board symmetries: 0 identity, 1-3
+    rotations by 90/180/270 degrees, 4-5 vertical/horizontal mirrors, 6-7 the
+    two diagonal reflections.
+    """
+    if symmetry == 0:
+        return r, c
+    if symmetry == 1:
+        return c, rows - 1 - r
+    if symmetry == 2:
+        return rows - 1 - r, cols - 1 - c
+    if symmetry == 3:
+        return cols - 1 - c, r
+    if symmetry == 4:
+        return rows - 1 - r, c
+    if symmetry == 5:
+        return r, cols - 1 - c
+    if symmetry == 6:
+        return c, r
+    return cols - 1 - c, rows - 1 - r
+
+
+_KEYS_CACHE = {}
+
+
+def get_zobrist_keys(rows, cols):
+    """Returns the shared key set for a board size, generating it on first use."""
+    keys = _KEYS_CACHE.get((rows, cols))
+    if keys is None:
+        keys = ZobristKeys(rows, cols)
+        _KEYS_CACHE[(rows, cols)] = keys
+    return keys
@@ -0,0 +1,16 @@
+import os
+import sys
+
+import pytest
+
+# The engine modules are flat in PenteAI/src, next to the scripts that import them.
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from config import Config  # noqa: E402
+
+
+@pytest.fixture
+def config():
+    config = Config()
+    config.sound_enabled = False
+    return config
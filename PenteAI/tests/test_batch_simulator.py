@@ -0,0 +1,27 @@
+import numpy as np
+import pytest
+
+from batch_simulator import BatchSimulator
+from pente_game import PenteGame
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_batch_simulator_matches_pente_game(config, seed):
+    games = 100
+    rng = np.random.default_rng(seed)
+    sim = BatchSimulator(config, games)
+    reference = [PenteGame(config) for _ in range(games)]
+    for ply in range(200):
+        if sim.game_over.all():
+            break
+        # Radius 2 now and then, so the random games also reach long lines and capture wins.
+        rows, cols = sim.random_moves(rng, radius=1 if ply % 4 else 2)
+        legal = sim.step(rows, cols)
+        for i, game in enumerate(reference):
+            assert game.make_move(int(rows[i]), int(cols[i])) == bool(legal[i])
+            assert np.array_equal(sim.boards[i], np.array(game.board, dtype=np.int8))
+            assert (sim.captures[i, 0], sim.captures[i, 1]) == (game.captures[1], game.captures[2])
+            assert sim.turn[i] == game.turn
+            assert bool(sim.game_over[i]) == game.game_over
+            assert sim.winner[i] == (game.winner or 0)
+    assert sim.game_over.all()
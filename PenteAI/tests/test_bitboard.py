@@ -0,0 +1,52 @@
+import random
+
+import pytest
+
+from benchmark_bitboard import random_game
+from bitboard import BitBoard
+from pente_ai import PenteAI
+from pente_game import PenteGame
+from search_state import SearchState
+
+
+def _position(state):
+    return [row[:] for row in state.board], dict(state.captures), state.game_over, state.winner or None
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_bitboard_matches_pente_game(config, seed):
+    moves = random_game(config, random.Random(seed))
+    game = PenteGame(config)
+    bits = BitBoard([[0] * config.COLS for _ in range(config.ROWS)], {1: 0, 2: 0}, 1, config,
+                    incremental_eval=False)
+    positions = []
+    for r, c in moves:
+        assert game.make_move(r, c)
+        assert bits.make_move(r, c)
+        assert _position(bits) == _position(game)
+        if not game.game_over:
+            # PenteGame leaves the turn with the winner; search states pass it on regardless.
+            assert bits.turn == game.turn
+        reference = SearchState(bits.board, bits.captures, bits.turn, config, incremental_eval=False)
+        for radius in SearchState.CANDIDATE_RADII:
+            assert set(bits.candidate_moves(radius)) == set(reference.candidate_moves(radius))
+        positions.append(_position(game))
+
+    for expected in reversed(positions[:-1]):
+        bits.unmake_move()
+        assert _position(bits) == expected
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_candidates_match_full_scan(config, seed):
+    rng = random.Random(seed)
+    # Depth 2 uses radius 1 from the fifth stone on; depth 4 always uses radius 2.
+    ais = [PenteAI(config, 1, depth=depth, tt_size_mb=0, use_book=False) for depth in (2, 4)]
+    state = SearchState([[0] * config.COLS for _ in range(config.ROWS)], {1: 0, 2: 0}, 1, config,
+                        incremental_eval=False)
+    for r, c in random_game(config, rng):
+        state.make_move(r, c)
+        if rng.random() < 0.2:
+            state.unmake_move()
+        for ai in ais:
+            assert set(ai._get_relevant_moves(state)) == set(ai._scan_relevant_moves(state))
@@ -0,0 +1,41 @@
+import numpy as np
+import pytest
+
+from benchmark_eval import random_positions
+from heuristics import PenteHeuristics
+from numpy_heuristics import NumpyHeuristics
+from search_state import SearchState
+
+
+@pytest.mark.parametrize("seed", [0, 1])
+def test_incremental_eval_matches_full_scan(config, seed):
+    for state in random_positions(config, 100, seed):
+        for color in (1, 2):
+            assert state.evaluator.evaluate(state, color) == PenteHeuristics.evaluate(state, color)
+
+
+def test_incremental_eval_matches_full_scan_after_unmake(config):
+    state = SearchState([[0] * config.COLS for _ in range(config.ROWS)], {1: 0, 2: 0}, 1, config)
+    moves = [(9, 9), (9, 10), (8, 8), (9, 11), (10, 10), (9, 12), (11, 11), (7, 7)]
+    expected = []
+    for r, c in moves:
+        expected.append({color: PenteHeuristics.evaluate(state, color) for color in (1, 2)})
+        state.make_move(r, c)
+    for scores in reversed(expected):
+        state.unmake_move()
+        for color in (1, 2):
+            assert state.evaluator.evaluate(state, color) == scores[color]
+
+
+def test_numpy_eval_matches_full_scan(config):
+    numpy_eval = NumpyHeuristics(config.ROWS, config.COLS)
+    states = list(random_positions(config, 100, 0))
+    boards = np.array([state.board for state in states], dtype=np.int8)
+    captures = np.array([[state.captures[1], state.captures[2]] for state in states])
+    winners = np.array([state.winner or 0 for state in states])
+    for color in (1, 2):
+        batch = numpy_eval.evaluate_batch(boards, color, captures, winners)
+        for state, batch_score in zip(states, batch):
+            expected = PenteHeuristics.evaluate(state, color)
+            assert numpy_eval.evaluate(state, color) == expected
+            assert batch_score == expected
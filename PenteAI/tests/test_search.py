@@ -0,0 +1,42 @@
+import pytest
+
+from benchmark_search import PLAIN_SEARCH, run_search
+from benchmark_symmetry import OPENINGS, equivalent_moves
+from pente_ai import PenteAI
+from performance_tracker import PerformanceTracker
+from positions import POSITIONS, build_game
+
+
+@pytest.mark.parametrize("name", list(POSITIONS))
+def test_pvs_finds_the_alpha_beta_move(config, name):
+    # Without LMR, PVS only narrows windows, so it must settle on the same move as plain alpha-beta.
+    game = build_game(config, POSITIONS[name])
+    plain, _, _ = run_search(config, game, 3, **PLAIN_SEARCH)
+    pvs, _, _ = run_search(config, game, 3, **dict(PLAIN_SEARCH, pvs=True))
+    assert pvs == plain
+
+
+@pytest.mark.parametrize("name", list(OPENINGS))
+def test_symmetry_pruning_finds_an_equivalent_move(config, name):
+    game = build_game(config, OPENINGS[name])
+    plain, _, _ = run_search(config, game, 2, **PLAIN_SEARCH)
+    pruned, _, tracker = run_search(config, game, 2, **dict(PLAIN_SEARCH, symmetry=True))
+    assert equivalent_moves(config, game, plain, pruned)
+    assert tracker.root_moves_searched <= tracker.root_moves
+
+
+def test_ply_counts_moves_from_the_root_under_lmr(config):
+    # Reduced subtrees are searched at a lower depth but still one ply below their parent.
+    game = build_game(config, POSITIONS["midgame"])
+    ai = PenteAI(config, game.turn, depth=4, use_book=False, threat_search_nodes=0, lmr=True)
+    plies = []
+    minimax = ai._minimax
+
+    def recording_minimax(state, depth, ply, *args):
+        plies.append((ply, len(state.history)))
+        return minimax(state, depth, ply, *args)
+
+    ai._minimax = recording_minimax
+    ai.get_best_move(game, PerformanceTracker())
+    assert ai._reductions > 0
+    assert all(ply == moves for ply, moves in plies)
@@ -0,0 +1,34 @@
+import random
+
+import pytest
+
+from benchmark_bitboard import random_game
+from search_state import SearchState
+from threat_search import ThreatSearch
+
+
+def _empty_state(config):
+    return SearchState([[0] * config.COLS for _ in range(config.ROWS)], {1: 0, 2: 0}, 1, config,
+                       incremental_eval=False)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_tactics_match_full_scan(config, seed):
+    search = ThreatSearch(config.ROWS, config.COLS, config.THREAT_SEARCH_NODES)
+    state = _empty_state(config)
+    state.make_move(*random_game(config, random.Random(seed))[0])
+    tactics = search._tactics(state, None)
+    for r, c in random_game(config, random.Random(seed))[1:]:
+        state.make_move(r, c)
+        if state.game_over:
+            break
+        tactics = search._tactics(state, tactics)
+        assert tactics == search._tactics(state, None)
+
+
+def test_finds_open_three_win_within_default_budget(config):
+    state = _empty_state(config)
+    for r, c in [(9, 9), (5, 5), (9, 10), (5, 13), (9, 11), (13, 5)]:
+        state.make_move(r, c)
+    search = ThreatSearch(config.ROWS, config.COLS, config.THREAT_SEARCH_NODES, config.THREAT_SEARCH_DEPTH)
+    assert search.find_win(state) in [(9, 8), (9, 12)]